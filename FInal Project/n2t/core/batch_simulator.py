@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+from n2t.core.decoder import (
+    A_BIT,
+    A_INSTRUCTION,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_EQ,
+    JUMP_GT,
+    JUMP_LT,
+    Instruction,
+    decode_program,
+)
+from n2t.core.memory import SIZE
+
+Vector = Any
+VectorComputation = Callable[[Vector, Vector, Vector], Vector]
+
+VECTOR_COMPUTATIONS: Dict[int, VectorComputation] = {
+    0b0101010: lambda a, d, m: np.zeros_like(d),
+    0b0111111: lambda a, d, m: np.ones_like(d),
+    0b0111010: lambda a, d, m: np.full_like(d, -1),
+    0b0001100: lambda a, d, m: d,
+    0b0110000: lambda a, d, m: a,
+    0b1110000: lambda a, d, m: m,
+    0b0001101: lambda a, d, m: ~d,
+    0b0110001: lambda a, d, m: ~a,
+    0b1110001: lambda a, d, m: ~m,
+    0b0001111: lambda a, d, m: -d,
+    0b0110011: lambda a, d, m: -a,
+    0b1110011: lambda a, d, m: -m,
+    0b0011111: lambda a, d, m: d + 1,
+    0b0110111: lambda a, d, m: a + 1,
+    0b1110111: lambda a, d, m: m + 1,
+    0b0001110: lambda a, d, m: d - 1,
+    0b0110010: lambda a, d, m: a - 1,
+    0b1110010: lambda a, d, m: m - 1,
+    0b0000010: lambda a, d, m: d + a,
+    0b1000010: lambda a, d, m: d + m,
+    0b0010011: lambda a, d, m: d - a,
+    0b1010011: lambda a, d, m: d - m,
+    0b0000111: lambda a, d, m: a - d,
+    0b1000111: lambda a, d, m: m - d,
+    0b0000000: lambda a, d, m: a & d,
+    0b1000000: lambda a, d, m: m & d,
+}
+
+
+def vector_computation(comp: int) -> VectorComputation:
+    if comp in VECTOR_COMPUTATIONS:
+        return VECTOR_COMPUTATIONS[comp]
+    if comp & A_BIT:
+        return lambda a, d, m: m | d
+    return lambda a, d, m: a | d
+
+
+def wrap(values: Vector) -> Vector:
+    return ((values + 0x8000) & 0xFFFF) - 0x8000
+
+
+@dataclass
+class BatchSimulator:
+    count: int
+    program: List[Instruction] = field(default_factory=list)
+    address_reg: Vector = field(init=False)
+    data_reg: Vector = field(init=False)
+    pc: Vector = field(init=False)
+    ram: Vector = field(init=False)
+    written: Vector = field(init=False)
+    cycle: int = 0
+
+    def __post_init__(self) -> None:
+        self.address_reg = np.zeros(self.count, dtype=np.int32)
+        self.data_reg = np.zeros(self.count, dtype=np.int32)
+        self.pc = np.zeros(self.count, dtype=np.int64)
+        self.ram = np.zeros((self.count, SIZE), dtype=np.int16)
+        self.written = np.zeros((self.count, SIZE), dtype=bool)
+
+    @classmethod
+    def from_states(cls, states: Sequence[Mapping[int, int]]) \
+            -> BatchSimulator:
+        simulator = cls(len(states))
+        for machine, state in enumerate(states):
+            for address, value in state.items():
+                simulator.ram[machine, address] = value
+        return simulator
+
+    def load(self, words: Iterable[int]) -> None:
+        self.program = decode_program(words)
+
+    def simulate(self, words: Iterable[int], cycles: int) \
+            -> List[Dict[int, int]]:
+        self.load(words)
+        self.run(cycles)
+        return self.ram_states()
+
+    def run(self, cycles: int) -> int:
+        size = len(self.program)
+        executed = 0
+        while executed < cycles:
+            running = np.flatnonzero((self.pc >= 0) & (self.pc < size))
+            if running.size == 0:
+                break
+            pcs = self.pc[running]
+            first = pcs[0]
+            if (pcs == first).all():
+                self.step(int(first), running)
+            else:
+                order = np.argsort(pcs, kind="stable")
+                grouped = running[order]
+                starts = np.flatnonzero(np.diff(pcs[order])) + 1
+                for group in np.split(grouped, starts):
+                    self.step(int(self.pc[group[0]]), group)
+            executed += 1
+
+        self.cycle += executed
+        return executed
+
+    def step(self, pc: int, machines: Vector) -> None:
+        kind, value, dest, jump = self.program[pc]
+        if kind == A_INSTRUCTION:
+            self.address_reg[machines] = value
+            self.pc[machines] = pc + 1
+            return
+
+        a = self.address_reg[machines]
+        d = self.data_reg[machines]
+        m = self.ram[machines, a].astype(np.int32) if value & A_BIT else None
+        result = wrap(vector_computation(value)(a, d, m).astype(np.int32))
+
+        if dest & DEST_M:
+            self.ram[machines, a] = result
+            self.written[machines, a] = True
+        if dest & DEST_D:
+            self.data_reg[machines] = result
+        if dest & DEST_A:
+            self.address_reg[machines] = result
+
+        if not jump:
+            self.pc[machines] = pc + 1
+            return
+
+        taken = np.zeros(len(machines), dtype=bool)
+        if jump & JUMP_LT:
+            taken |= result < 0
+        if jump & JUMP_EQ:
+            taken |= result == 0
+        if jump & JUMP_GT:
+            taken |= result > 0
+        self.pc[machines] = np.where(
+            taken, self.address_reg[machines], pc + 1
+        )
+
+    def ram_state_payroll(self, machine: int) -> Dict[int, int]:
+        addresses = np.flatnonzero(self.written[machine])
+        values = self.ram[machine, addresses]
+        return dict(zip(addresses.tolist(), values.tolist()))
+
+    def ram_states(self) -> List[Dict[int, int]]:
+        return [self.ram_state_payroll(i) for i in range(self.count)]
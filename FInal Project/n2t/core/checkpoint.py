@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+MAGIC = b"HCKP"
+VERSION = 1
+HEADER = struct.Struct("<4sHiiiQ32sI")
+
+
+def little_endian(words: array[int]) -> array[int]:
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+
+@dataclass
+class Checkpoint:
+    pc: int
+    address_reg: int
+    data_reg: int
+    cycle: int
+    program_hash: str
+    ram: array[int] = field(default_factory=lambda: array("h"))
+    written: List[int] = field(default_factory=list)
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.pc,
+            self.address_reg,
+            self.data_reg,
+            self.cycle,
+            bytes.fromhex(self.program_hash),
+            len(self.written),
+        )
+        ram = little_endian(array("h", self.ram)).tobytes()
+        written = little_endian(array("h", self.written)).tobytes()
+        return header + zlib.compress(ram + written)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Checkpoint:
+        header = HEADER.unpack_from(data)
+        magic, version, pc, a, d, cycle, digest, count = header
+        assert magic == MAGIC, "Not a Hack simulator checkpoint"
+        assert version == VERSION, f"Unsupported checkpoint version {version}"
+
+        body = zlib.decompress(data[HEADER.size:])
+        words = little_endian(array("h", body))
+        ram_size = len(words) - count
+        return cls(
+            pc=pc,
+            address_reg=a,
+            data_reg=d,
+            cycle=cycle,
+            program_hash=digest.hex(),
+            ram=words[:ram_size],
+            written=words[ram_size:].tolist(),
+        )
+
+    def save(self, path: str) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> Checkpoint:
+        return cls.from_bytes(Path(path).read_bytes())
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import (
+    Callable,
+    Container,
+    Dict,
+    Iterable,
+    List,
+    MutableSequence,
+    Sequence,
+    Tuple,
+)
+
+from n2t.core.screen import KBD
+
+Computation = Callable[[int, int, MutableSequence[int]], int]
+Instruction = Tuple[int, int, int, int]
+
+A_INSTRUCTION = 0
+C_INSTRUCTION = 1
+
+DEST_M = 0b001
+DEST_D = 0b010
+DEST_A = 0b100
+
+JUMP_GT = 0b001
+JUMP_EQ = 0b010
+JUMP_LT = 0b100
+
+A_BIT = 0b1000000
+
+WORD_MASK = 0xFFFF
+SIGN_BIT = 0x8000
+
+PROBE_LIMIT = 1024
+
+COMPUTATIONS = {
+    0b0101010: lambda a, d, ram: 0,
+    0b0111111: lambda a, d, ram: 1,
+    0b0111010: lambda a, d, ram: -1,
+    0b0001100: lambda a, d, ram: d,
+    0b0110000: lambda a, d, ram: a,
+    0b1110000: lambda a, d, ram: ram[a],
+    0b0001101: lambda a, d, ram: ~d,
+    0b0110001: lambda a, d, ram: ~a,
+    0b1110001: lambda a, d, ram: ~ram[a],
+    0b0001111: lambda a, d, ram: -d,
+    0b0110011: lambda a, d, ram: -a,
+    0b1110011: lambda a, d, ram: -ram[a],
+    0b0011111: lambda a, d, ram: d + 1,
+    0b0110111: lambda a, d, ram: a + 1,
+    0b1110111: lambda a, d, ram: ram[a] + 1,
+    0b0001110: lambda a, d, ram: d - 1,
+    0b0110010: lambda a, d, ram: a - 1,
+    0b1110010: lambda a, d, ram: ram[a] - 1,
+    0b0000010: lambda a, d, ram: d + a,
+    0b1000010: lambda a, d, ram: d + ram[a],
+    0b0010011: lambda a, d, ram: d - a,
+    0b1010011: lambda a, d, ram: d - ram[a],
+    0b0000111: lambda a, d, ram: a - d,
+    0b1000111: lambda a, d, ram: ram[a] - d,
+    0b0000000: lambda a, d, ram: a & d,
+    0b1000000: lambda a, d, ram: ram[a] & d,
+}
+
+
+def _default_computation(comp: int) -> Computation:
+    if comp & A_BIT:
+        return lambda a, d, ram: ram[a] | d
+    return lambda a, d, ram: a | d
+
+
+COMPUTE: Tuple[Computation, ...] = tuple(
+    COMPUTATIONS.get(comp, _default_computation(comp)) for comp in range(128)
+)
+
+
+def to_signed(value: int) -> int:
+    return ((value + SIGN_BIT) & WORD_MASK) - SIGN_BIT
+
+
+def parse_words(instructions: Iterable[str]) -> Iterable[int]:
+    return (int(instruction, 2) for instruction in instructions)
+
+
+def decode(word: int) -> Instruction:
+    if not word & SIGN_BIT:
+        return A_INSTRUCTION, word, 0, 0
+    comp = (word >> 6) & 0b1111111
+    return C_INSTRUCTION, comp, (word >> 3) & 0b111, word & 0b111
+
+
+def decode_program(words: Iterable[int]) -> List[Instruction]:
+    return [decode(word) for word in words]
+
+
+def find_halt_loops(program: List[Instruction]) -> Dict[int, int]:
+    loops: Dict[int, int] = {}
+    for pc, (kind, _, dest, jump) in enumerate(program):
+        if kind == A_INSTRUCTION or dest or not jump:
+            continue
+        start = pc
+        while start > 0 and program[start - 1][0] == A_INSTRUCTION:
+            start -= 1
+        loops[pc] = start
+    return loops
+
+
+def find_idle_loops(program: List[Instruction]) -> Dict[int, int]:
+    loops: Dict[int, int] = {}
+    for pc, (kind, _, dest, jump) in enumerate(program):
+        if kind == A_INSTRUCTION or dest or not jump or pc == 0:
+            continue
+        previous, head, _, _ = program[pc - 1]
+        if previous == A_INSTRUCTION and head < pc - 1:
+            loops[pc] = head
+    return loops
+
+
+def reaches_fixed_point(
+    program: List[Instruction],
+    head: int,
+    a: int,
+    d: int,
+    ram: Sequence[int],
+    written: Container[int],
+) -> bool:
+    overlay: Dict[int, int] = {}
+    start_a, start_d = a, d
+    pc = head
+    for _ in range(PROBE_LIMIT):
+        if not 0 <= pc < len(program):
+            return False
+        kind, value, dest, jump = program[pc]
+        if kind == A_INSTRUCTION:
+            a = value
+            pc += 1
+            continue
+
+        if value & A_BIT:
+            if a == KBD:
+                return False
+            cell = [overlay.get(a, ram[a])]
+            value = to_signed(COMPUTE[value](0, d, cell))
+        else:
+            value = to_signed(COMPUTE[value](a, d, []))
+        if dest & DEST_M:
+            overlay[a] = value
+        if dest & DEST_D:
+            d = value
+        if dest & DEST_A:
+            a = value
+
+        if jump and jump & (
+            JUMP_LT if value < 0 else JUMP_EQ if value == 0 else JUMP_GT
+        ):
+            pc = a
+        else:
+            pc += 1
+        if pc == head:
+            return (a, d) == (start_a, start_d) and all(
+                address in written and ram[address] == value
+                for address, value in overlay.items()
+            )
+    return False
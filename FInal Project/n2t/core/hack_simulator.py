@@ -1,146 +1,474 @@
-from __future__ import annotations
-
-from ctypes import c_short
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable
-
-SIZE = 32768
-
-
-@dataclass
-class HackSimulator:
-    address_reg: int = 0
-    data_reg: int = 0
-    ram = [0] * SIZE
-    used = [False] * SIZE
-
-    @classmethod
-    def create(cls) -> HackSimulator:
-        return cls()
-
-    def simulate(self, instructions: Iterable[str], cycles: int) \
-            -> dict[int, int]:
-        instr = list(iter(instructions))
-        index = 0
-        while cycles > 0:
-            cycles = cycles - 1
-            if index >= len(instr):
-                break
-            index = self.perform_instruction(instr[index], index)
-        return self.ram_state_payroll()
-
-    def perform_instruction(self, instruction: str, index: int) -> Any:
-        if instruction.startswith("0"):
-            self.perform_a_instruction(instruction[1:])
-            return index + 1
-        return self.perform_c_instruction(instruction[3:], index)
-
-    def perform_a_instruction(self, value: str) -> None:
-        self.address_reg = int(value, 2)
-        return
-
-    def perform_c_instruction(self, instruction: str, index: int) -> Any:
-        comp: int = c_short(self.get_computation(instruction[:7])).value
-        jump = instruction[10:]
-        destination = instruction[7:10]
-        if destination != "000":
-            self.save_value(destination, comp)
-        if jump == "000":
-            return index + 1
-        return self.perform_jump(jump, comp, index)
-
-    def get_computation(self, comp: str) -> Any:
-        a = comp[0]
-        comp = comp[1:]
-
-        cases = {
-            "101010": 0,
-            "111111": 1,
-            "111010": -1,
-            "001100": self.data_reg,
-            "110000":
-                self.address_reg if a == "0" else self.ram[self.address_reg],
-            "001101": ~self.data_reg,
-            "110001": ~self.address_reg if a == "0" else
-                ~(self.ram[self.address_reg]),
-            "001111": -self.data_reg,
-            "110011": -self.address_reg if a == "0" else
-                -self.ram[self.address_reg],
-            "011111": self.data_reg + 1,
-            "110111": self.address_reg + 1
-            if a == "0"
-            else self.ram[self.address_reg] + 1,
-            "001110": self.data_reg - 1,
-            "110010": self.address_reg - 1
-            if a == "0"
-            else self.ram[self.address_reg] - 1,
-            "000010": self.data_reg
-            + (self.address_reg if a == "0" else self.ram[self.address_reg]),
-            "010011": self.data_reg
-            - (self.address_reg if a == "0" else self.ram[self.address_reg]),
-            "000111": (self.address_reg - self.data_reg)
-            if a == "0"
-            else (self.ram[self.address_reg] - self.data_reg),
-            "000000": (self.address_reg & self.data_reg)
-            if a == "0"
-            else (self.ram[self.address_reg] & self.data_reg),
-        }
-
-        default_case = (
-            self.address_reg | self.data_reg
-            if a == "0"
-            else self.ram[self.address_reg] | self.data_reg
-        )
-        return cases.get(comp, default_case)
-
-    def save_value(self, destination: str, value: Any) -> None:
-        if destination == "001":
-            self.ram[self.address_reg] = value
-            self.used[self.address_reg] = True
-        elif destination == "010":
-            self.data_reg = value
-        elif destination == "011":
-            self.ram[self.address_reg] = value
-            self.used[self.address_reg] = True
-            self.data_reg = value
-        elif destination == "100":
-            self.address_reg = value
-        elif destination == "101":
-            self.ram[self.address_reg] = value
-            self.used[self.address_reg] = True
-            self.address_reg = value
-        elif destination == "110":
-            self.address_reg = value
-            self.data_reg = value
-        else:
-            self.data_reg = value
-            self.ram[self.address_reg] = value
-            self.used[self.address_reg] = True
-            self.address_reg = value
-
-    def perform_jump(self, jump_type: str, comp: Any, current_index: int) \
-            -> Any:
-        ans: Any = self.address_reg
-        jump_conditions = {
-            "001": comp > 0,
-            "010": comp == 0,
-            "011": comp >= 0,
-            "100": comp < 0,
-            "101": comp != 0,
-            "110": comp <= 0,
-        }
-
-        if jump_type in jump_conditions:
-            if jump_conditions[jump_type]:
-                return self.address_reg
-            else:
-                return current_index + 1
-
-        return ans
-
-    def ram_state_payroll(self) -> Dict[int, int]:
-        output: Dict[int, int] = {}
-        for i in range(SIZE):
-            if self.used[i]:
-                output[i] = self.ram[i]
-        return output
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field, replace
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from n2t.core.checkpoint import Checkpoint
+from n2t.core.decoder import (
+    A_INSTRUCTION,
+    COMPUTE,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    JUMP_EQ,
+    JUMP_GT,
+    JUMP_LT,
+    Instruction,
+    decode_program,
+    find_halt_loops,
+    find_idle_loops,
+    parse_words,
+    reaches_fixed_point,
+)
+from n2t.core.jit import BlockCompiler, CompiledProgram, program_hash
+from n2t.core.memory import SIZE, MemoryBackend, WriteTracker
+from n2t.core.natives import NativeCall, NativeTable
+from n2t.core.profiler import Profile
+from n2t.core.trace import TraceWriter
+
+BREAKPOINT = "breakpoint"
+WATCHPOINT = "watchpoint"
+
+
+class Stop(NamedTuple):
+    reason: str
+    pc: int
+    cycle: int
+    address: Optional[int] = None
+    value: Optional[int] = None
+
+
+@dataclass
+class HackSimulator:
+    address_reg: int = 0
+    data_reg: int = 0
+    pc: int = 0
+    cycle: int = 0
+    program: List[Instruction] = field(default_factory=list)
+    words: List[int] = field(default_factory=list)
+    compiler: Optional[BlockCompiler] = None
+    compiled: Optional[CompiledProgram] = None
+    ram: MutableSequence[int] = field(
+        default_factory=MemoryBackend.list.allocate
+    )
+    writes: WriteTracker = field(default_factory=WriteTracker)
+    detect_halt: bool = True
+    halt_loops: Dict[int, int] = field(default_factory=dict)
+    idle_loops: Dict[int, int] = field(default_factory=dict)
+    idle_visits: Dict[int, int] = field(default_factory=dict)
+    halted_at: Optional[int] = None
+    profile: Optional[Profile] = None
+    tracer: Optional[TraceWriter] = None
+    breakpoints: Set[int] = field(default_factory=set)
+    watchpoints: Set[int] = field(default_factory=set)
+    stopped: Optional[Stop] = None
+    natives: Optional[NativeTable] = None
+
+    @classmethod
+    def create(
+        cls,
+        memory: MemoryBackend = MemoryBackend.list,
+        ram_file: Optional[str] = None,
+    ) -> HackSimulator:
+        return cls(ram=memory.allocate(path=ram_file))
+
+    @classmethod
+    def with_profile(cls) -> HackSimulator:
+        return cls(profile=Profile())
+
+    @classmethod
+    def with_jit(
+        cls,
+        cache_dir: Optional[str] = None,
+        memory: MemoryBackend = MemoryBackend.list,
+        ram_file: Optional[str] = None,
+    ) -> HackSimulator:
+        compiler = BlockCompiler.create(cache_dir)
+        return cls(ram=memory.allocate(path=ram_file), compiler=compiler)
+
+    def simulate(self, instructions: Iterable[str], cycles: int) \
+            -> dict[int, int]:
+        self.load(parse_words(instructions))
+        self.run(cycles)
+        return self.ram_state_payroll()
+
+    def load(self, words: Iterable[int]) -> None:
+        words = list(words)
+        program = decode_program(words)
+        halt_loops = find_halt_loops(program) if self.detect_halt else {}
+        self.load_decoded(words, program, halt_loops)
+
+    def load_decoded(
+        self,
+        words: List[int],
+        program: List[Instruction],
+        halt_loops: Dict[int, int],
+    ) -> None:
+        self.words = words
+        self.program = program
+        self.halt_loops = halt_loops if self.detect_halt else {}
+        self.idle_loops = find_idle_loops(program) if self.detect_halt else {}
+        self.idle_visits = {}
+        self.compiled = None
+        self.pc = 0
+        self.cycle = 0
+        self.halted_at = None
+        if self.profile is not None:
+            self.profile = Profile.create(len(self.program))
+
+    def halting_blocks(self) -> Set[int]:
+        assert self.compiled is not None
+        loops = self.halt_loops
+        return {
+            start
+            for start, (_, length) in self.compiled.blocks.items()
+            if loops.get(start + length - 1, start + 1) <= start
+        }
+
+    def idle_blocks(self) -> Dict[int, int]:
+        assert self.compiled is not None
+        loops = self.idle_loops
+        return {
+            start: loops[start + length - 1]
+            for start, (_, length) in self.compiled.blocks.items()
+            if start + length - 1 in loops
+        }
+
+    def reaches_idle_loop(self, head: int, d: int) -> bool:
+        visits = self.idle_visits.get(head, 0) + 1
+        self.idle_visits[head] = visits
+        if visits & (visits - 1):
+            return False
+        return reaches_fixed_point(
+            self.program, head, head, d, self.ram, self.writes.written
+        )
+
+    def add_breakpoint(self, address: int) -> None:
+        assert 0 <= address < len(self.program), \
+            f"Breakpoint {address} is outside the program"
+        self.breakpoints.add(address)
+
+    def remove_breakpoint(self, address: int) -> None:
+        self.breakpoints.discard(address)
+
+    def add_watchpoint(self, address: int) -> None:
+        self.watchpoints.add(address)
+
+    def remove_watchpoint(self, address: int) -> None:
+        self.watchpoints.discard(address)
+
+    def step(self) -> Optional[Stop]:
+        return self.run_until(1)
+
+    def run_until(self, cycles: int) -> Optional[Stop]:
+        self.run(cycles)
+        return self.stopped
+
+    def run(self, cycles: int) -> int:
+        if self.halted_at is not None:
+            return 0
+        if self.natives is not None and self.natives.routines:
+            assert not (
+                self.breakpoints
+                or self.watchpoints
+                or self.profile is not None
+                or self.tracer is not None
+            ), "Native routines only run on the interpreter and the JIT"
+        if self.breakpoints or self.watchpoints:
+            return self.run_observed(cycles, debug=True)
+        if self.profile is not None:
+            return self.run_observed(cycles, profile=self.profile)
+        if self.tracer is not None:
+            return self.run_traced(cycles, self.tracer)
+        return self.run_untraced(cycles)
+
+    def run_untraced(self, cycles: int) -> int:
+        if cycles <= 0 or self.halted_at is not None:
+            return 0
+        if self.compiler is not None:
+            return self.run_compiled(cycles)
+        if self.natives is not None and self.natives.routines:
+            return self.run_observed(cycles, natives=self.natives)
+        return self.run_interpreted(cycles)
+
+    def run_traced(self, cycles: int, tracer: TraceWriter) -> int:
+        window = tracer.window(self.cycle, cycles)
+        executed = self.run_untraced(window.start - self.cycle)
+        if self.halted_at is None and self.cycle == window.start:
+            executed += self.run_observed(len(window), tracer=tracer)
+        return executed + self.run_untraced(cycles - executed)
+
+    def run_compiled(self, cycles: int) -> int:
+        assert self.compiler is not None
+        if self.compiled is None:
+            self.compiled = self.compiler.compile(self.words)
+
+        blocks = self.compiled.blocks
+        halting = self.halting_blocks()
+        idle = self.idle_blocks()
+        ram = self.ram
+        written = self.writes.written
+        natives = self.natives if self.natives is not None else NativeTable()
+        routines = natives.routines
+        call = NativeCall(ram, written, natives.symbols)
+        a = self.address_reg
+        d = self.data_reg
+        pc = self.pc
+        start = self.cycle
+        remaining = cycles
+
+        while remaining > 0:
+            if pc in routines:
+                result = routines[pc](call)
+                if result is not None:
+                    pc = call.finish(result)
+                    remaining -= 1
+                    continue
+
+            entry = blocks.get(pc)
+            if entry is None or entry[1] > remaining:
+                self.address_reg, self.data_reg, self.pc = a, d, pc
+                self.cycle = start + cycles - remaining
+                if not self.run_interpreted(1):
+                    break
+                a, d, pc = self.address_reg, self.data_reg, self.pc
+                remaining -= 1
+                if self.halted_at is not None:
+                    break
+                continue
+
+            block, length = entry
+            target, a, d = block(a, d, ram, written)
+            remaining -= length
+            if target == pc and pc in halting:
+                self.halted_at = start + cycles - remaining
+                break
+            if idle.get(pc) == target and self.reaches_idle_loop(target, d):
+                self.halted_at = start + cycles - remaining
+                pc = target
+                break
+            pc = target
+
+        self.address_reg = a
+        self.data_reg = d
+        self.pc = pc
+        self.cycle = start + cycles - remaining
+        return cycles - remaining
+
+    def halts(self, pc: int, a: int, d: int, cycle: int) -> bool:
+        if self.halt_loops.get(pc, pc + 1) <= a <= pc or (
+            pc in self.idle_loops and self.reaches_idle_loop(a, d)
+        ):
+            self.halted_at = cycle
+            return True
+        return False
+
+    def run_interpreted(self, cycles: int) -> int:
+        program = self.program
+        size = len(program)
+        compute = COMPUTE
+        ram = self.ram
+        written = self.writes.written
+        a = self.address_reg
+        d = self.data_reg
+        pc = self.pc
+        checks = self.halt_loops.keys() | self.idle_loops.keys()
+        executed = 0
+
+        while executed < cycles and pc < size:
+            executed += 1
+            kind, value, dest, jump = program[pc]
+            if kind == A_INSTRUCTION:
+                a = value
+                pc += 1
+                continue
+
+            value = ((compute[value](a, d, ram) + 0x8000) & 0xFFFF) - 0x8000
+            if dest:
+                if dest & DEST_M:
+                    ram[a] = value
+                    written[a] = True
+                if dest & DEST_D:
+                    d = value
+                if dest & DEST_A:
+                    a = value
+
+            if jump and jump & (
+                JUMP_LT if value < 0 else JUMP_EQ if value == 0 else JUMP_GT
+            ):
+                if pc in checks and self.halts(
+                    pc, a, d, self.cycle + executed
+                ):
+                    pc = a
+                    break
+                pc = a
+            else:
+                pc += 1
+
+        self.address_reg = a
+        self.data_reg = d
+        self.pc = pc
+        self.cycle += executed
+        return executed
+
+    def run_observed(
+        self,
+        cycles: int,
+        profile: Optional[Profile] = None,
+        tracer: Optional[TraceWriter] = None,
+        natives: Optional[NativeTable] = None,
+        debug: bool = False,
+    ) -> int:
+        program = self.program
+        size = len(program)
+        compute = COMPUTE
+        ram = self.ram
+        written = self.writes.written
+        natives = natives if natives is not None else NativeTable()
+        routines = natives.routines
+        call = NativeCall(ram, written, natives.symbols)
+        record = tracer.record if tracer is not None else None
+        counting = profile is not None
+        executions = profile.executions if profile is not None else []
+        taken = profile.taken if profile is not None else []
+        not_taken = profile.not_taken if profile is not None else []
+        breakpoints = self.breakpoints if debug else set()
+        watched = self.watchpoints if debug else set()
+        stop: Optional[Stop] = None
+        a = self.address_reg
+        d = self.data_reg
+        pc = self.pc
+        checks = self.halt_loops.keys() | self.idle_loops.keys()
+        hooks = breakpoints | routines.keys()
+        cycle = self.cycle
+        executed = 0
+
+        while executed < cycles and pc < size:
+            if pc in hooks:
+                if executed and pc in breakpoints:
+                    stop = Stop(BREAKPOINT, pc, cycle + executed)
+                    break
+                if pc in routines:
+                    result = routines[pc](call)
+                    if result is not None:
+                        executed += 1
+                        pc = call.finish(result)
+                        continue
+
+            executed += 1
+            if counting:
+                executions[pc] += 1
+            kind, value, dest, jump = program[pc]
+            if kind == A_INSTRUCTION:
+                a = value
+                if record is not None:
+                    record(cycle + executed - 1, pc, a, d)
+                pc += 1
+                continue
+
+            value = ((compute[value](a, d, ram) + 0x8000) & 0xFFFF) - 0x8000
+            address = None
+            if dest & DEST_M:
+                ram[a] = value
+                written[a] = True
+                address = a
+                if a in watched:
+                    stop = Stop(WATCHPOINT, pc, cycle + executed, a, value)
+            if dest & DEST_D:
+                d = value
+            if dest & DEST_A:
+                a = value
+            if record is not None:
+                record(cycle + executed - 1, pc, a, d, address, value)
+
+            if not jump:
+                pc += 1
+            elif jump & (
+                JUMP_LT if value < 0 else JUMP_EQ if value == 0 else JUMP_GT
+            ):
+                if counting:
+                    taken[pc] += 1
+                if pc in checks and self.halts(pc, a, d, cycle + executed):
+                    pc = a
+                    break
+                pc = a
+            else:
+                if counting:
+                    not_taken[pc] += 1
+                pc += 1
+
+            if stop is not None:
+                break
+
+        if debug:
+            self.stopped = stop
+        self.address_reg = a
+        self.data_reg = d
+        self.pc = pc
+        self.cycle += executed
+        return executed
+
+    def checkpoint(self) -> Checkpoint:
+        return Checkpoint(
+            pc=self.pc,
+            address_reg=self.address_reg,
+            data_reg=self.data_reg,
+            cycle=self.cycle,
+            program_hash=program_hash(self.words),
+            ram=array("h", self.ram),
+            written=list(self.writes.written),
+        )
+
+    def restore(self, checkpoint: Checkpoint) -> None:
+        assert checkpoint.program_hash == program_hash(self.words), \
+            "Checkpoint was taken from a different program"
+        for address, value in enumerate(checkpoint.ram):
+            self.ram[address] = value
+        self.writes = WriteTracker(dict.fromkeys(checkpoint.written, True))
+        self.pc = checkpoint.pc
+        self.address_reg = checkpoint.address_reg
+        self.data_reg = checkpoint.data_reg
+        self.cycle = checkpoint.cycle
+        self.halted_at = None
+        self.idle_visits = {}
+        self.stopped = None
+
+    def fork(self) -> HackSimulator:
+        ram = MemoryBackend.list.allocate()
+        ram[:] = self.ram
+        writes = WriteTracker(dict(self.writes.written))
+        profile = self.profile
+        if profile is not None:
+            profile = replace(
+                profile,
+                executions=list(profile.executions),
+                taken=list(profile.taken),
+                not_taken=list(profile.not_taken),
+            )
+        return replace(
+            self,
+            ram=ram,
+            writes=writes,
+            profile=profile,
+            tracer=None,
+            breakpoints=set(self.breakpoints),
+            watchpoints=set(self.watchpoints),
+            idle_visits=dict(self.idle_visits),
+        )
+
+    def ram_state_payroll(self, start: int = 0, stop: int = SIZE) \
+            -> Dict[int, int]:
+        ram = self.ram
+        return {
+            address: ram[address]
+            for address in self.writes.addresses(start, stop)
+        }
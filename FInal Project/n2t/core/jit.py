@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from n2t.core.decoder import (
+    A_BIT,
+    A_INSTRUCTION,
+    DEST_A,
+    DEST_D,
+    DEST_M,
+    Instruction,
+    decode_program,
+)
+
+Block = Callable[..., Tuple[int, int, int]]
+
+COMP_TO_SOURCE = {
+    0b0101010: ("0", False),
+    0b0111111: ("1", False),
+    0b0111010: ("-1", False),
+    0b0001100: ("d", False),
+    0b0110000: ("a", False),
+    0b1110000: ("ram[a]", False),
+    0b0001101: ("~d", False),
+    0b0110001: ("~a", False),
+    0b1110001: ("~ram[a]", False),
+    0b0001111: ("-d", True),
+    0b0110011: ("-a", True),
+    0b1110011: ("-ram[a]", True),
+    0b0011111: ("d + 1", True),
+    0b0110111: ("a + 1", True),
+    0b1110111: ("ram[a] + 1", True),
+    0b0001110: ("d - 1", True),
+    0b0110010: ("a - 1", True),
+    0b1110010: ("ram[a] - 1", True),
+    0b0000010: ("d + a", True),
+    0b1000010: ("d + ram[a]", True),
+    0b0010011: ("d - a", True),
+    0b1010011: ("d - ram[a]", True),
+    0b0000111: ("a - d", True),
+    0b1000111: ("ram[a] - d", True),
+    0b0000000: ("a & d", False),
+    0b1000000: ("ram[a] & d", False),
+}
+
+JUMP_TO_CONDITION = {
+    0b001: "v > 0",
+    0b010: "v == 0",
+    0b011: "v >= 0",
+    0b100: "v < 0",
+    0b101: "v != 0",
+    0b110: "v <= 0",
+}
+
+UNCONDITIONAL_JUMP = 0b111
+
+INDENT = "    "
+
+CODEGEN_VERSION = 2
+
+COMPILED: Dict[str, CompiledProgram] = {}
+
+
+def comp_to_source(comp: int) -> str:
+    default = ("ram[a] | d" if comp & A_BIT else "a | d", False)
+    source, wraps = COMP_TO_SOURCE.get(comp, default)
+    if wraps:
+        return f"(({source}) + 32768 & 65535) - 32768"
+    return source
+
+
+def find_leaders(program: Sequence[Instruction]) -> List[int]:
+    size = len(program)
+    leaders: Set[int] = {0}
+    for pc, (kind, value, _, jump) in enumerate(program):
+        if kind == A_INSTRUCTION:
+            if value < size:
+                leaders.add(value)
+        elif jump:
+            leaders.add(pc + 1)
+    return sorted(leader for leader in leaders if leader < size)
+
+
+def instruction_to_source(instruction: Instruction) -> List[str]:
+    kind, value, dest, jump = instruction
+    if kind == A_INSTRUCTION:
+        return [f"a = {value}"]
+
+    lines = [f"v = {comp_to_source(value)}"]
+    if dest & DEST_M:
+        lines += ["ram[a] = v", "written[a] = True"]
+    if dest & DEST_D:
+        lines.append("d = v")
+    if dest & DEST_A:
+        lines.append("a = v")
+    return lines
+
+
+def block_to_source(program: Sequence[Instruction], start: int, end: int) \
+        -> str:
+    lines = [f"def block_{start}(a, d, ram, written):"]
+    for pc in range(start, end):
+        lines += [INDENT + line for line in instruction_to_source(program[pc])]
+
+    kind, _, _, jump = program[end - 1]
+    if kind == A_INSTRUCTION or not jump:
+        lines.append(f"{INDENT}return {end}, a, d")
+    elif jump == UNCONDITIONAL_JUMP:
+        lines.append(f"{INDENT}return a, a, d")
+    else:
+        condition = JUMP_TO_CONDITION[jump]
+        lines.append(f"{INDENT}return (a if {condition} else {end}), a, d")
+    return "\n".join(lines)
+
+
+def split_blocks(program: Sequence[Instruction]) -> List[Tuple[int, int]]:
+    leaders = find_leaders(program)
+    bounds = []
+    for start, following in zip(leaders, leaders[1:] + [len(program)]):
+        end = start
+        while end < following:
+            kind, _, _, jump = program[end]
+            end += 1
+            if kind != A_INSTRUCTION and jump:
+                break
+        bounds.append((start, end))
+    return bounds
+
+
+def program_to_source(program: Sequence[Instruction]) -> str:
+    bounds = split_blocks(program)
+    sources = [block_to_source(program, start, end) for start, end in bounds]
+    table = ", ".join(
+        f"{start}: (block_{start}, {end - start})" for start, end in bounds
+    )
+    sources.append(f"BLOCKS = {{{table}}}")
+    return "\n\n\n".join(sources) + "\n"
+
+
+def program_hash(words: Sequence[int]) -> str:
+    return hashlib.sha256(array("H", words).tobytes()).hexdigest()
+
+
+@dataclass
+class CompiledProgram:
+    blocks: Dict[int, Tuple[Block, int]]
+
+    @classmethod
+    def from_code(cls, code: CodeType) -> CompiledProgram:
+        namespace: Dict[str, Any] = {}
+        exec(code, namespace)
+        return cls(namespace["BLOCKS"])
+
+
+@dataclass
+class BlockCompiler:
+    cache_dir: Optional[Path] = None
+
+    @classmethod
+    def create(cls, cache_dir: Optional[str] = None) -> BlockCompiler:
+        return cls(Path(cache_dir) if cache_dir else None)
+
+    def compile(self, words: Sequence[int]) -> CompiledProgram:
+        key = program_hash(words)
+        if key not in COMPILED:
+            code = self.load_code(key, words)
+            COMPILED[key] = CompiledProgram.from_code(code)
+        return COMPILED[key]
+
+    def load_code(self, key: str, words: Sequence[int]) -> CodeType:
+        cache_file = self.cache_file(key)
+        if cache_file is not None and cache_file.exists():
+            code: CodeType = marshal.loads(cache_file.read_bytes())
+            return code
+
+        source = program_to_source(decode_program(words))
+        code = compile(source, f"<hack-jit {key[:12]}>", "exec")
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_bytes(marshal.dumps(code))
+        return code
+
+    def cache_file(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        tag = sys.implementation.cache_tag
+        name = f"{key}.{tag}.v{CODEGEN_VERSION}.jit"
+        return self.cache_dir.joinpath(name)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import mmap
+import sys
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, MutableSequence, Optional
+
+SIZE = 32768
+WORD_BYTES = 2
+
+
+class MemoryBackend(Enum):
+    list = "list"
+    array = "array"
+    numpy = "numpy"
+    mmap = "mmap"
+
+    def allocate(self, size: int = SIZE, path: Optional[str] = None) \
+            -> MutableSequence[int]:
+        if self is MemoryBackend.array:
+            return array("h", bytes(WORD_BYTES * size))
+        if self is MemoryBackend.numpy:
+            import numpy
+
+            return memoryview(numpy.zeros(size, dtype="<i2"))  # type: ignore
+        if self is MemoryBackend.mmap:
+            assert path is not None, "mmap memory requires a RAM file path"
+            return map_file(Path(path), size)
+        return [0] * size
+
+
+def map_file(path: Path, size: int = SIZE) -> MutableSequence[int]:
+    assert sys.byteorder == "little", "RAM files hold little-endian words"
+    with path.open("w+b") as file:
+        file.truncate(WORD_BYTES * size)
+        mapping = mmap.mmap(file.fileno(), WORD_BYTES * size)
+    return memoryview(mapping).cast("h")  # type: ignore
+
+
+def flush(ram: MutableSequence[int]) -> None:
+    if isinstance(ram, memoryview) and isinstance(ram.obj, mmap.mmap):
+        ram.obj.flush()
+
+
+@dataclass
+class WriteTracker:
+    written: Dict[int, bool] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.written)
+
+    def addresses(self, start: int = 0, stop: int = SIZE) -> List[int]:
+        written = self.written
+        if stop - start < len(written):
+            return [
+                address
+                for address in range(start, stop)
+                if address in written or address - SIZE in written
+            ]
+        normalized = {address % SIZE for address in written}
+        return sorted(a for a in normalized if start <= a < stop)
+
+    def clear(self) -> None:
+        self.written.clear()
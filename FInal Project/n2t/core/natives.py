@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableSequence,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from n2t.core.assembler import clean_assembly
+from n2t.core.decoder import to_signed
+from n2t.core.memory import SIZE
+
+SP = 0
+LCL = 1
+ARG = 2
+THIS = 3
+THAT = 4
+R13 = 13
+R14 = 14
+
+MATH_BLOCK_LENGTH = "Math.0"
+MATH_POWERS = "Math.1"
+MEMORY_FREE = "Memory.0"
+MEMORY_BASE = "Memory.1"
+
+STRING_CHARS = 0
+STRING_MAX_LENGTH = 1
+STRING_LENGTH = 2
+
+
+@dataclass
+class NativeCall:
+    ram: MutableSequence[int]
+    written: Dict[int, bool]
+    symbols: Dict[str, int]
+
+    def argument(self, index: int) -> int:
+        return self.ram[self.ram[ARG] + index]
+
+    def static(self, name: str) -> int:
+        assert name in self.symbols, f"Unknown static {name}"
+        return self.ram[self.symbols[name]]
+
+    def store(self, address: int, value: int) -> None:
+        self.ram[address] = to_signed(value)
+        self.written[address] = True
+
+    def finish(self, value: int) -> int:
+        ram = self.ram
+        frame = ram[LCL]
+        address = ram[frame - 5]
+        argument = ram[ARG]
+        self.store(R13, frame - 4)
+        self.store(R14, address)
+        self.store(argument, value)
+        self.store(SP, argument + 1)
+        self.store(THAT, ram[frame - 1])
+        self.store(THIS, ram[frame - 2])
+        self.store(ARG, ram[frame - 3])
+        self.store(LCL, ram[frame - 4])
+        return address
+
+
+Native = Callable[[NativeCall], Optional[int]]
+
+
+def multiply(call: NativeCall, x: int, y: int) -> int:
+    powers = call.static(MATH_POWERS)
+    result = 0
+    for index in range(call.static(MATH_BLOCK_LENGTH)):
+        if y & call.ram[powers + index]:
+            result = to_signed(result + x)
+        x = to_signed(x + x)
+    return result
+
+
+def recursive_divide(call: NativeCall, x: int, y: int) -> int:
+    if y < 0 or y > x:
+        return 0
+    quotient = recursive_divide(call, x, to_signed(y + y))
+    product = multiply(call, 2, multiply(call, quotient, y))
+    if to_signed(x - product) < y:
+        return to_signed(quotient + quotient)
+    return to_signed(quotient + quotient + 1)
+
+
+def math_multiply(call: NativeCall) -> Optional[int]:
+    return multiply(call, call.argument(0), call.argument(1))
+
+
+def math_divide(call: NativeCall) -> Optional[int]:
+    x = call.argument(0)
+    y = call.argument(1)
+    if y == 0:
+        return None
+    division = recursive_divide(call, to_signed(abs(x)), to_signed(abs(y)))
+    sign = 1 if (x > 0 and y > 0) or (x < 0 and y < 0) else -1
+    return multiply(call, sign, division)
+
+
+def memory_alloc(call: NativeCall) -> Optional[int]:
+    size = call.argument(0)
+    if size < 1:
+        return None
+    ram = call.ram
+    base = call.static(MEMORY_BASE)
+    current = call.static(MEMORY_FREE)
+    for _ in range(SIZE):
+        if current == 0:
+            return None
+        block = to_signed(base + current)
+        if ram[block] > size:
+            call.store(block, ram[block] - size - 1)
+            result = to_signed(current + ram[block])
+            call.store(to_signed(base + result), size + 1)
+            return to_signed(result + 1)
+        current = ram[to_signed(block + 1)]
+    return None
+
+
+def string_append_char(call: NativeCall) -> Optional[int]:
+    this = call.argument(0)
+    ram = call.ram
+    length = ram[this + STRING_LENGTH]
+    if length == ram[this + STRING_MAX_LENGTH]:
+        return None
+    call.store(to_signed(ram[this + STRING_CHARS] + length), call.argument(1))
+    call.store(this + STRING_LENGTH, length + 1)
+    return this
+
+
+NATIVE_ROUTINES: Dict[str, Native] = {
+    "Math.multiply": math_multiply,
+    "Math.divide": math_divide,
+    "Memory.alloc": memory_alloc,
+    "String.appendChar": string_append_char,
+}
+
+NATIVE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "Math.multiply": ("Math.init", "Math.multiply"),
+    "Math.divide": (
+        "Math.init",
+        "Math.abs",
+        "Math.multiply",
+        "Math.divide",
+        "Math.recursiveDivide",
+        "Math.multSign",
+    ),
+    "Memory.alloc": ("Memory.init", "Memory.alloc", "Memory.deAlloc"),
+    "String.appendChar": ("String.new", "String.appendChar"),
+}
+
+OS_FINGERPRINTS: Dict[str, str] = {
+    "Math.init":
+        "13294027b26f59a7c50286ef0ae90affc0efb58b768f60db2156e456efca1525",
+    "Math.multiply":
+        "9fda21f711ef323b2d8bdf452ab4b295e246c47469df93e0d87cab3434300a45",
+    "Math.abs":
+        "8adb0393dc24add643b453928d75e851ea94fcb08923678059dcaca4c1281646",
+    "Math.divide":
+        "f821b8da39795e0724c495266ea4d6469ac85bff48ad06677df24085afd919a9",
+    "Math.recursiveDivide":
+        "cf0ba49920b4752573fe1ff025bfe28a819e22f3211fff599e60ad395b63181d",
+    "Math.multSign":
+        "29a434d077f47df85a0275c3235b02b337bba19334530323f2a9dd2e77d037a1",
+    "Memory.init":
+        "cae9f060c18db273ae2c2ccf2358880e9873c8f2cf90f3ba0c3a0af8feaeffa0",
+    "Memory.alloc":
+        "ca35a18e171b12883123b9c9d3a8e3995e80989d37a25a24afb129804b7cbcea",
+    "Memory.deAlloc":
+        "7cc46b4c227ae39d77b8ae0a0979e7fbd330bbc33b1f616107c8f23d7c43d39e",
+    "String.new":
+        "cad7352eb95b1cc2cb0cea2f84b3c85e433a1b02c1e6af61e158eac5941c5fb0",
+    "String.appendChar":
+        "4df3b07f24ee8d4ee06f6fa16bb81e68cae484c65a056cf68a71f5f970d00abf",
+}
+
+FUNCTION_LABEL = re.compile(r"\((\w+\.\w+)\)")
+STATIC_SYMBOL = re.compile(r"@\w+\.\d+")
+COUNTER = re.compile(r"\d+")
+
+
+def normalize_command(command: str) -> str:
+    if command[0] not in "@(" or command[1:].isdigit():
+        return command
+    if STATIC_SYMBOL.fullmatch(command):
+        return command
+    return COUNTER.sub("", command)
+
+
+def function_fingerprints(
+    assembly: Iterable[str], names: Set[str]
+) -> Dict[str, str]:
+    digests: Dict[str, "hashlib._Hash"] = {}
+    current: Optional[str] = None
+    for command in clean_assembly(assembly):
+        label = FUNCTION_LABEL.fullmatch(command)
+        if label is not None:
+            current = label.group(1)
+            if current in names:
+                digests[current] = hashlib.sha256()
+        if current in digests:
+            digests[current].update(normalize_command(command).encode())
+            digests[current].update(b"\n")
+    return {name: digest.hexdigest() for name, digest in digests.items()}
+
+
+@dataclass
+class NativeTable:
+    routines: Dict[int, Native] = field(default_factory=dict)
+    symbols: Dict[str, int] = field(default_factory=dict)
+    names: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_symbols(
+        cls,
+        symbols: Dict[str, int],
+        assembly: Iterable[str],
+        routines: Optional[Dict[str, Native]] = None,
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> NativeTable:
+        routines = NATIVE_ROUTINES if routines is None else routines
+        if fingerprints is None:
+            fingerprints = OS_FINGERPRINTS
+        dependencies = {
+            name: NATIVE_DEPENDENCIES.get(name, (name,)) for name in routines
+        }
+        needed = {name for group in dependencies.values() for name in group}
+        actual = function_fingerprints(assembly, needed)
+        names = [
+            name
+            for name in routines
+            if name in symbols
+            and all(
+                function in fingerprints
+                and actual.get(function) == fingerprints[function]
+                for function in dependencies[name]
+            )
+        ]
+        return cls(
+            {symbols[name]: routines[name] for name in names}, symbols, names
+        )
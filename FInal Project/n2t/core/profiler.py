@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from n2t.core.decoder import Instruction
+from n2t.core.jit import split_blocks
+from n2t.core.source_map import SourceLocation, SourceMap
+
+UNLABELED = "<rom>"
+LOCAL_LABEL_SEPARATOR = "$"
+
+
+@dataclass
+class Profile:
+    executions: List[int] = field(default_factory=list)
+    taken: List[int] = field(default_factory=list)
+    not_taken: List[int] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, size: int) -> Profile:
+        return cls([0] * size, [0] * size, [0] * size)
+
+    def block_counts(self, program: Sequence[Instruction]) \
+            -> List[Tuple[int, int, int]]:
+        return [
+            (start, end, self.executions[start])
+            for start, end in split_blocks(program)
+            if self.executions[start]
+        ]
+
+
+@dataclass
+class LabelMap:
+    addresses: List[int] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_labels(cls, labels: Dict[str, int]) -> LabelMap:
+        ordered = sorted(labels.items(), key=lambda item: (item[1], item[0]))
+        return cls([address for _, address in ordered],
+                   [name for name, _ in ordered])
+
+    def label_of(self, address: int) -> str:
+        index = bisect_right(self.addresses, address) - 1
+        return self.names[index] if index >= 0 else UNLABELED
+
+
+def function_of(label: str) -> str:
+    return label.split(LOCAL_LABEL_SEPARATOR)[0]
+
+
+def cycles_per_label(profile: Profile, labels: LabelMap) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for address, count in enumerate(profile.executions):
+        if count:
+            label = labels.label_of(address)
+            totals[label] = totals.get(label, 0) + count
+    return totals
+
+
+def hot_spot_report(
+    profile: Profile,
+    program: Sequence[Instruction],
+    labels: LabelMap,
+    limit: int = 20,
+) -> Iterable[str]:
+    total = sum(profile.executions) or 1
+
+    yield "Cycles per label"
+    per_label = cycles_per_label(profile, labels)
+    for label, count in sorted(per_label.items(), key=lambda i: -i[1])[:limit]:
+        yield f"{count:>12} {100 * count / total:6.2f}%  {label}"
+
+    yield ""
+    yield "Hottest basic blocks"
+    blocks = sorted(profile.block_counts(program), key=lambda b: -b[2])
+    for start, end, count in blocks[:limit]:
+        label = labels.label_of(start)
+        yield f"{count:>12}  [{start}, {end})  {label}"
+
+    yield ""
+    yield "Branches (taken / not taken)"
+    branches = [
+        (address, profile.taken[address], profile.not_taken[address])
+        for address in range(len(profile.executions))
+        if profile.taken[address] or profile.not_taken[address]
+    ]
+    branches.sort(key=lambda b: -(b[1] + b[2]))
+    for address, taken, not_taken in branches[:limit]:
+        label = labels.label_of(address)
+        yield f"{taken:>12} / {not_taken:<12} {address:>6}  {label}"
+
+
+def collapsed_stacks(profile: Profile, labels: LabelMap) -> Iterable[str]:
+    for label, count in sorted(cycles_per_label(profile, labels).items()):
+        yield f"{function_of(label)};{label} {count}"
+
+
+def cycles_per_source_line(
+    profile: Profile, source_map: SourceMap
+) -> Dict[Optional[SourceLocation], int]:
+    totals: Dict[Optional[SourceLocation], int] = {}
+    for address, count in enumerate(profile.executions):
+        if count:
+            location = source_map.resolve(address)
+            totals[location] = totals.get(location, 0) + count
+    return totals
+
+
+def source_line_report(
+    profile: Profile, source_map: SourceMap, limit: int = 20
+) -> Iterable[str]:
+    total = sum(profile.executions) or 1
+
+    yield "Cycles per source line"
+    per_line = cycles_per_source_line(profile, source_map)
+    for location, count in sorted(
+        per_line.items(), key=lambda i: -i[1]
+    )[:limit]:
+        where = UNLABELED if location is None else location.describe()
+        yield f"{count:>12} {100 * count / total:6.2f}%  {where}"
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Sequence
+
+MAGIC = b"HROM"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+EXTENSION = ".rom"
+
+
+def load_rom(path: str) -> Sequence[int]:
+    assert sys.byteorder == "little", "ROM files hold little-endian words"
+    with Path(path).open("rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count = HEADER.unpack_from(mapping)
+    assert magic == MAGIC, "Not a packed Hack ROM"
+    assert version == VERSION, f"Unsupported ROM version {version}"
+    words = memoryview(mapping)[HEADER.size:HEADER.size + 2 * count]
+    return words.cast("H")
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import count
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from n2t.core.hack_simulator import HackSimulator
+
+DEFAULT_QUANTUM = 10000
+
+
+class MachineState(Enum):
+    ready = "ready"
+    paused = "paused"
+    halted = "halted"
+    finished = "finished"
+    cancelled = "cancelled"
+
+    @property
+    def done(self) -> bool:
+        return self in (
+            MachineState.halted,
+            MachineState.finished,
+            MachineState.cancelled,
+        )
+
+
+class SchedulingPolicy(Enum):
+    round_robin = "round_robin"
+    priority = "priority"
+
+
+@dataclass
+class Machine:
+    name: str
+    simulator: HackSimulator
+    cycles: int
+    priority: int = 0
+    state: MachineState = MachineState.ready
+    quanta: int = 0
+    ticket: int = -1
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.cycles - self.simulator.cycle)
+
+    def run(self, quantum: int) -> int:
+        executed = self.simulator.run(min(quantum, self.remaining))
+        self.quanta += 1
+        if self.simulator.halted_at is not None:
+            self.state = MachineState.halted
+        elif not self.remaining or not executed:
+            self.state = MachineState.finished
+        return executed
+
+
+@dataclass
+class Scheduler:
+    quantum: int = DEFAULT_QUANTUM
+    policy: SchedulingPolicy = SchedulingPolicy.round_robin
+    machines: Dict[str, Machine] = field(default_factory=dict)
+    queue: List[Tuple[int, int, str]] = field(default_factory=list)
+    tickets: Iterator[int] = field(default_factory=count)
+
+    def __post_init__(self) -> None:
+        assert self.quantum >= 1, "Scheduler quantum must be positive"
+
+    def enqueue(self, machine: Machine) -> None:
+        machine.ticket = next(self.tickets)
+        rank = -machine.priority
+        if self.policy is SchedulingPolicy.round_robin:
+            rank = 0
+        heapq.heappush(self.queue, (rank, machine.ticket, machine.name))
+
+    def add(
+        self,
+        name: str,
+        simulator: HackSimulator,
+        cycles: int,
+        priority: int = 0,
+    ) -> Machine:
+        assert name not in self.machines, f"Machine {name} already exists"
+        machine = Machine(name, simulator, cycles, priority)
+        self.machines[name] = machine
+        self.enqueue(machine)
+        return machine
+
+    def pause(self, name: str) -> None:
+        machine = self.machines[name]
+        if machine.state is MachineState.ready:
+            machine.state = MachineState.paused
+
+    def resume(self, name: str) -> None:
+        machine = self.machines[name]
+        if machine.state is MachineState.paused:
+            machine.state = MachineState.ready
+            self.enqueue(machine)
+
+    def cancel(self, name: str) -> None:
+        machine = self.machines[name]
+        if not machine.state.done:
+            machine.state = MachineState.cancelled
+
+    def next_machine(self) -> Optional[Machine]:
+        while self.queue:
+            _, ticket, name = heapq.heappop(self.queue)
+            machine = self.machines[name]
+            if machine.ticket != ticket:
+                continue
+            if machine.state is MachineState.ready:
+                return machine
+        return None
+
+    def step(self) -> Optional[Machine]:
+        machine = self.next_machine()
+        if machine is None:
+            return None
+        machine.run(self.quantum)
+        if machine.state is MachineState.ready:
+            self.enqueue(machine)
+        return machine
+
+    def run(self) -> Iterator[Machine]:
+        while (machine := self.step()) is not None:
+            yield machine
+
+    def pending(self) -> List[Machine]:
+        return [
+            machine
+            for machine in self.machines.values()
+            if not machine.state.done
+        ]
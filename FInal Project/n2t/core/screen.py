@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import List, MutableSequence, Optional, Sequence, Tuple, Union
+
+from n2t.core.checkpoint import little_endian
+
+SCREEN = 16384
+KBD = 24576
+WIDTH = 512
+HEIGHT = 256
+ROW_BYTES = WIDTH // 8
+
+REVERSED_BITS = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+INVERTED_BITS = bytes(255 - byte for byte in REVERSED_BITS)
+
+KEY_CODES = {
+    "newline": 128,
+    "backspace": 129,
+    "left": 130,
+    "up": 131,
+    "right": 132,
+    "down": 133,
+    "home": 134,
+    "end": 135,
+    "pageup": 136,
+    "pagedown": 137,
+    "insert": 138,
+    "delete": 139,
+    "esc": 140,
+    **{f"f{number}": 140 + number for number in range(1, 13)},
+}
+
+
+def screen_bytes(ram: Sequence[int]) -> bytes:
+    return little_endian(array("h", ram[SCREEN:KBD])).tobytes()
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    body = kind + data
+    return struct.pack(">I", len(data)) + body + struct.pack(
+        ">I", zlib.crc32(body)
+    )
+
+
+class FrameFormat(Enum):
+    pbm = "pbm"
+    png = "png"
+
+    def encode(self, frame: bytes) -> bytes:
+        if self is FrameFormat.pbm:
+            header = f"P4\n{WIDTH} {HEIGHT}\n".encode()
+            return header + frame.translate(REVERSED_BITS)
+
+        pixels = frame.translate(INVERTED_BITS)
+        rows = b"".join(
+            b"\x00" + pixels[row:row + ROW_BYTES]
+            for row in range(0, len(pixels), ROW_BYTES)
+        )
+        header = struct.pack(">IIBBBBB", WIDTH, HEIGHT, 1, 0, 0, 0, 0)
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + png_chunk(b"IHDR", header)
+            + png_chunk(b"IDAT", zlib.compress(rows))
+            + png_chunk(b"IEND", b"")
+        )
+
+
+@dataclass
+class FrameCapture:
+    directory: Path
+    frame_format: FrameFormat = FrameFormat.pbm
+    previous: bytes = bytes(2 * (KBD - SCREEN))
+    frames: int = 0
+
+    @classmethod
+    def create(
+        cls, directory: str, frame_format: FrameFormat = FrameFormat.pbm
+    ) -> FrameCapture:
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        return cls(path, frame_format)
+
+    def capture(self, ram: Sequence[int], cycle: int) -> Optional[Path]:
+        frame = screen_bytes(ram)
+        if frame == self.previous:
+            return None
+        self.previous = frame
+        self.frames += 1
+        extension = self.frame_format.value
+        path = self.directory / f"frame_{cycle:012d}.{extension}"
+        path.write_bytes(self.frame_format.encode(frame))
+        return path
+
+
+def key_code(key: Union[int, str]) -> int:
+    if isinstance(key, int):
+        return key
+    if key.lower() in KEY_CODES:
+        return KEY_CODES[key.lower()]
+    assert len(key) == 1, f"Unknown key {key}"
+    return ord(key)
+
+
+@dataclass
+class KeyboardScript:
+    cycles: List[int] = field(default_factory=list)
+    keys: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_events(
+        cls, events: Sequence[Tuple[int, Union[int, str]]]
+    ) -> KeyboardScript:
+        ordered = sorted(events, key=lambda event: event[0])
+        return cls(
+            [cycle for cycle, _ in ordered],
+            [key_code(key) for _, key in ordered],
+        )
+
+    @classmethod
+    def load(cls, path: str) -> KeyboardScript:
+        with open(path, "r") as file:
+            return cls.from_events([tuple(event) for event in json.load(file)])
+
+    def key_at(self, cycle: int) -> int:
+        index = bisect_right(self.cycles, cycle) - 1
+        return self.keys[index] if index >= 0 else 0
+
+    def next_event(self, cycle: int) -> Optional[int]:
+        index = bisect_right(self.cycles, cycle)
+        return self.cycles[index] if index < len(self.cycles) else None
+
+    def apply(self, ram: MutableSequence[int], cycle: int) -> None:
+        ram[KBD] = self.key_at(cycle)
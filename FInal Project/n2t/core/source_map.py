@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional
+
+SOURCE_MAP_VERSION = 1
+
+
+class SourceLocation(NamedTuple):
+    file: str
+    line: int
+    symbol: str = ""
+
+    def describe(self) -> str:
+        location = f"{self.file}:{self.line + 1}"
+        return f"{location} ({self.symbol})" if self.symbol else location
+
+
+@dataclass
+class SourceMap:
+    files: List[str] = field(default_factory=list)
+    symbols: List[str] = field(default_factory=list)
+    starts: List[int] = field(default_factory=list)
+    entries: List[List[int]] = field(default_factory=list)
+    file_indexes: Dict[str, int] = field(default_factory=dict, repr=False)
+    symbol_indexes: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self.file_indexes = {
+            name: index for index, name in enumerate(self.files)
+        }
+        self.symbol_indexes = {
+            name: index for index, name in enumerate(self.symbols)
+        }
+
+    def intern(
+        self, name: str, names: List[str], indexes: Dict[str, int]
+    ) -> int:
+        if name not in indexes:
+            indexes[name] = len(names)
+            names.append(name)
+        return indexes[name]
+
+    def mark(self, start: int, location: Optional[SourceLocation]) -> None:
+        if location is None:
+            entry = [-1, 0, -1]
+        else:
+            entry = [
+                self.intern(location.file, self.files, self.file_indexes),
+                location.line,
+                self.intern(
+                    location.symbol, self.symbols, self.symbol_indexes
+                ),
+            ]
+        if self.entries and self.entries[-1] == entry:
+            return
+        if self.starts and self.starts[-1] == start:
+            self.entries[-1] = entry
+            return
+        self.starts.append(start)
+        self.entries.append(entry)
+
+    def resolve(self, index: int) -> Optional[SourceLocation]:
+        position = bisect_right(self.starts, index) - 1
+        if position < 0:
+            return None
+        file, line, symbol = self.entries[position]
+        if file < 0:
+            return None
+        return SourceLocation(self.files[file], line, self.symbols[symbol])
+
+    def compose(self, inner: Dict[str, SourceMap]) -> SourceMap:
+        composed = SourceMap()
+        for start in self.starts:
+            location = self.resolve(start)
+            while location is not None and location.file in inner:
+                next_location = inner[location.file].resolve(location.line)
+                if next_location is None:
+                    break
+                if not next_location.symbol:
+                    next_location = next_location._replace(
+                        symbol=location.symbol
+                    )
+                location = next_location
+            composed.mark(start, location)
+        return composed
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": SOURCE_MAP_VERSION,
+            "files": self.files,
+            "symbols": self.symbols,
+            "mappings": [
+                [start, *entry]
+                for start, entry in zip(self.starts, self.entries)
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, Any]) -> SourceMap:
+        assert (
+            payload["version"] == SOURCE_MAP_VERSION
+        ), "Unsupported source map"
+        return cls(
+            payload["files"],
+            payload["symbols"],
+            [mapping[0] for mapping in payload["mappings"]],
+            [mapping[1:] for mapping in payload["mappings"]],
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as map_file:
+            json.dump(self.to_json(), map_file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> SourceMap:
+        with open(path) as map_file:
+            return cls.from_json(json.load(map_file))
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+MAGIC = b"HTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<Qihh?hh")
+BUFFER_RECORDS = 1 << 16
+READ_RECORDS = 1 << 14
+
+
+class TraceRecord(NamedTuple):
+    cycle: int
+    pc: int
+    address_reg: int
+    data_reg: int
+    wrote: bool
+    write_address: int
+    write_value: int
+
+
+@dataclass
+class TraceWriter:
+    file: BinaryIO
+    sample: int = 1
+    start: int = 0
+    stop: Optional[int] = None
+    capacity: int = BUFFER_RECORDS
+    buffer: bytearray = field(init=False)
+    offset: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        assert self.sample >= 1, "Trace sampling interval must be positive"
+        self.buffer = bytearray(RECORD.size * self.capacity)
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        sample: int = 1,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> TraceWriter:
+        return cls(open(path, "wb"), sample, start, stop)
+
+    def window(self, cycle: int, cycles: int) -> range:
+        end = cycle + max(cycles, 0)
+        start = min(max(cycle, self.start), end)
+        stop = end if self.stop is None else min(end, self.stop)
+        return range(start, max(stop, start))
+
+    def record(
+        self,
+        cycle: int,
+        pc: int,
+        address_reg: int,
+        data_reg: int,
+        write_address: Optional[int] = None,
+        write_value: int = 0,
+    ) -> None:
+        if (cycle - self.start) % self.sample:
+            return
+        RECORD.pack_into(
+            self.buffer,
+            self.offset,
+            cycle,
+            pc,
+            address_reg,
+            data_reg,
+            write_address is not None,
+            write_address or 0,
+            write_value,
+        )
+        self.offset += RECORD.size
+        if self.offset == len(self.buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        self.file.write(memoryview(self.buffer)[: self.offset])
+        self.offset = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.file.close()
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    with open(path, "rb") as file:
+        magic, version, size = HEADER.unpack(file.read(HEADER.size))
+        assert magic == MAGIC, "Not a Hack simulator trace"
+        assert version == VERSION, f"Unsupported trace version {version}"
+        assert size == RECORD.size, "Trace record size mismatch"
+
+        while chunk := file.read(RECORD.size * READ_RECORDS):
+            for fields in RECORD.iter_unpack(chunk):
+                yield TraceRecord(*fields)
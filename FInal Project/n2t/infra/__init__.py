@@ -1,5 +1,7 @@
 from n2t.infra.hack_program import HackProgram
+from n2t.infra.pipeline import JackPipeline
 
 __all__ = [
     "HackProgram",
+    "JackPipeline",
 ]
@@ -0,0 +1,29 @@
+LOCAL_REG = "LCL"
+ARGUMENT_REG = "ARG"
+THIS_REG = "THIS"
+THAT_REG = "THAT"
+STATIC_REG = "16"
+POINTER_REG = "3"
+TEMP_REG = "5"
+
+A_REG = "A"
+M_REG = "M"
+
+ADD = "+"
+SUB = "-"
+AND = "&"
+OR = "|"
+NOT = "!"
+NEG = "-"
+
+EQ = "JEQ"
+LT = "JLT"
+GT = "JGT"
+
+VM_EXTENSION = ".vm"
+ASM_EXTENSION = ".asm"
+
+INSTRUCTION_KEY = "instruction"
+FILENAME_KEY = "filename"
+FUNCTION_NAME_KEY = "function_name"
+INSTRUCTION_INDEX_KEY = "instr_idx"
@@ -0,0 +1,149 @@
+from typing import Dict
+
+from n2t.infra.asm_formatter.constants import (
+    ARGUMENT_REG,
+    FILENAME_KEY,
+    FUNCTION_NAME_KEY,
+    INSTRUCTION_INDEX_KEY,
+    INSTRUCTION_KEY,
+    LOCAL_REG,
+    THAT_REG,
+    THIS_REG,
+)
+
+
+class FunctionFormatter:
+    def __init__(self, args: Dict[str, str]) -> None:
+        self.command_args = args[INSTRUCTION_KEY].split(" ")
+        self.filename = args[FILENAME_KEY]
+        self.command_index = args[INSTRUCTION_INDEX_KEY]
+
+        if len(self.command_args) > 1:
+            args[FUNCTION_NAME_KEY] = self.command_args[1]
+
+    def translate_to_asm(self) -> str:
+        branch_type_to_asm_handler = {
+            "function": self.__format_function,
+            "call": self.__format_call,
+            "return": self.__format_return,
+        }
+
+        return branch_type_to_asm_handler[self.command_args[0]]()
+
+    def __format_function(self) -> str:
+        return self.LABEL_TO_ASM.format(
+            function=self.command_args[1]
+        ) + self.PUSH_SPACE_FOR_VARIABLE * int(self.command_args[2])
+
+    def __format_call(self) -> str:
+        return self.CALL_TO_ASM.format(
+            function=self.command_args[1],
+            args_count=self.command_args[2],
+            label=self.command_index,
+        )
+
+    def __format_return(self) -> str:
+        return self.RETURN_TO_ASM
+
+    @classmethod
+    def shared_routines(cls) -> str:
+        return (
+            cls.CALL_ROUTINE_LABEL
+            + cls.PUSH_RETURN_ADDRESS
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=LOCAL_REG)
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=ARGUMENT_REG)
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=THIS_REG)
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=THAT_REG)
+            + cls.MOVE_SP_TO_LCL
+            + cls.GO_TO_CALLEE
+            + cls.RETURN_ROUTINE_LABEL
+            + cls.RESOLVE_RETURN_ADDRESS
+            + cls.POP_SPACE_FOR_ARGUMENT
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=THAT_REG)
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=THIS_REG)
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=ARGUMENT_REG)
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=LOCAL_REG)
+            + cls.GO_TO_RETURN_ADDRESS
+        )
+
+    LABEL_TO_ASM = "({function})\n"
+
+    PUSH_SPACE_FOR_VARIABLE = "@SP\n" "M=M+1\n" "A=M-1\n" "M=0\n"
+
+    CALL_ROUTINE_LABEL = "($CALL)\n"
+
+    RETURN_ROUTINE_LABEL = "($RETURN)\n"
+
+    CALL_TO_ASM = (
+        "@{args_count}\n"
+        "D=A\n"
+        "@R13\n"
+        "M=D\n"
+        "@{function}\n"
+        "D=A\n"
+        "@R14\n"
+        "M=D\n"
+        "@{function}$ret.{label}\n"
+        "D=A\n"
+        "@$CALL\n"
+        "0;JMP\n"
+        "({function}$ret.{label})\n"
+    )
+
+    RETURN_TO_ASM = "@$RETURN\n" "0;JMP\n"
+
+    PUSH_RETURN_ADDRESS = "@SP\n" "AM=M+1\n" "A=A-1\n" "M=D\n"
+
+    PUSH_SPACE_FOR_SEGMENT = (
+        "@{arg}\n" "D=M\n" "@SP\n" "AM=M+1\n" "A=A-1\n" "M=D\n"
+    )
+
+    MOVE_SP_TO_LCL = (
+        "@R13\n"
+        "D=M\n"
+        "@5\n"
+        "D=D+A\n"
+        "@SP\n"
+        "D=M-D\n"
+        "@ARG\n"
+        "M=D\n"
+        "@SP\n"
+        "D=M\n"
+        "@LCL\n"
+        "M=D\n"
+    )
+
+    GO_TO_CALLEE = "@R14\n" "A=M\n" "0;JMP\n"
+
+    RESOLVE_RETURN_ADDRESS = (
+        "@LCL\n"
+        "D=M\n"
+        "@R13\n"
+        "M=D\n"
+        "@5\n"
+        "D=A\n"
+        "@R13\n"
+        "A=M-D\n"
+        "D=M\n"
+        "@R14\n"
+        "M=D\n"
+    )
+
+    RESOLVE_SPACE_FOR_SEGMENT = (
+        "@R13\n" "AM=M-1\n" "D=M\n" "@{register}\n" "M=D\n"
+    )
+
+    POP_SPACE_FOR_ARGUMENT = (
+        "@SP\n"
+        "A=M-1\n"
+        "D=M\n"
+        "@ARG\n"
+        "A=M\n"
+        "M=D\n"
+        "@ARG\n"
+        "D=M+1\n"
+        "@SP\n"
+        "M=D\n"
+    )
+
+    GO_TO_RETURN_ADDRESS = "@R14\n" "A=M\n" "0;JMP\n"
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import Assembler
+from n2t.core.decoder import parse_words
+from n2t.core.memory import SIZE
+from n2t.core.rom import EXTENSION as ROM_EXTENSION
+from n2t.core.rom import load_rom
+from n2t.core.scheduler import Scheduler
+
+PROGRAM_SUFFIXES = (".asm", ".hack", ROM_EXTENSION)
+MANIFEST_SUFFIX = ".json"
+
+
+@dataclass(frozen=True)
+class Job:
+    program: str
+    cycles: int
+    ram: Dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_manifest_entry(cls, entry: Dict[str, Any], cycles: int) -> Job:
+        return cls(
+            program=entry["program"],
+            cycles=entry.get("cycles", cycles),
+            ram={int(k): v for k, v in entry.get("ram", {}).items()},
+        )
+
+
+def is_batch_target(target: str) -> bool:
+    return (
+        os.path.isdir(target)
+        or target.endswith(MANIFEST_SUFFIX)
+        or glob.has_magic(target)
+    )
+
+
+def collect_jobs(target: str, cycles: int) -> List[Job]:
+    if target.endswith(MANIFEST_SUFFIX):
+        with open(target, "r") as file:
+            entries = json.load(file)
+        return [Job.from_manifest_entry(entry, cycles) for entry in entries]
+
+    pattern = os.path.join(target, "*") if os.path.isdir(target) else target
+    return [
+        Job(program, cycles)
+        for program in sorted(glob.glob(pattern))
+        if program.endswith(PROGRAM_SUFFIXES)
+    ]
+
+
+@lru_cache(maxsize=256)
+def load_words(program: str, modified: int) -> Tuple[int, ...]:
+    if program.endswith(ROM_EXTENSION):
+        return tuple(load_rom(program))
+    if program.endswith(".hack"):
+        with Path(program).open("r", newline="") as file:
+            lines = [line.strip() for line in file if line]
+        return tuple(parse_words(lines))
+    return tuple(Assembler.load_from(program).assemble_words())
+
+
+def prepare_job(job: Job, jit: bool = False) -> HackSimulator:
+    words = load_words(job.program, os.stat(job.program).st_mtime_ns)
+    simulator = HackSimulator.with_jit() if jit else HackSimulator.create()
+    for address, value in job.ram.items():
+        simulator.ram[address] = value
+    simulator.load(words)
+    return simulator
+
+
+def job_result(
+    job: Job,
+    simulator: HackSimulator,
+    ram_start: int = 0,
+    ram_stop: int = SIZE,
+    include_ram: bool = True,
+) -> Dict[str, Any]:
+    result = {
+        "program": job.program,
+        "cycles": simulator.cycle,
+        "halted": simulator.halted_at,
+    }
+    if include_ram:
+        result["RAM"] = simulator.ram_state_payroll(ram_start, ram_stop)
+    return result
+
+
+def write_result(output: TextIO, result: Dict[str, Any]) -> None:
+    output.write(json.dumps(result, separators=(",", ":")) + "\n")
+    output.flush()
+
+
+def run_job(
+    job: Job,
+    jit: bool = False,
+    ram_start: int = 0,
+    ram_stop: int = SIZE,
+    include_ram: bool = True,
+) -> Dict[str, Any]:
+    simulator = prepare_job(job, jit)
+    simulator.run(job.cycles)
+    return job_result(job, simulator, ram_start, ram_stop, include_ram)
+
+
+def run_jobs(
+    jobs: List[Job],
+    output: TextIO,
+    workers: Optional[int] = None,
+    jit: bool = False,
+    ram_start: int = 0,
+    ram_stop: int = SIZE,
+    include_ram: bool = True,
+) -> int:
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                run_job, job, jit, ram_start, ram_stop, include_ram
+            ): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                failures += 1
+                program = futures[future].program
+                result = {"program": program, "error": repr(error)}
+            write_result(output, result)
+    return failures
+
+
+def schedule_jobs(
+    jobs: List[Job],
+    output: TextIO,
+    quantum: int,
+    jit: bool = False,
+    ram_start: int = 0,
+    ram_stop: int = SIZE,
+    include_ram: bool = True,
+) -> int:
+    failures = 0
+    scheduler = Scheduler(quantum)
+    for index, job in enumerate(jobs):
+        try:
+            simulator = prepare_job(job, jit)
+        except Exception as error:
+            failures += 1
+            result = {"program": job.program, "error": repr(error)}
+            write_result(output, result)
+            continue
+        scheduler.add(str(index), simulator, job.cycles)
+
+    for machine in scheduler.run():
+        if machine.state.done:
+            job = jobs[int(machine.name)]
+            write_result(
+                output,
+                job_result(
+                    job, machine.simulator, ram_start, ram_stop, include_ram
+                ),
+            )
+    return failures
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import (
+    COMP_TO_BINARY,
+    DEST_TO_BINARY,
+    JUMP_TO_BINARY,
+    Assembler,
+)
+from n2t.core.jit import BlockCompiler
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_REPEAT = 3
+DEFAULT_CYCLES = 1_000_000
+SYNTHETIC_SEED = 2023
+SYNTHETIC_LINES = 20000
+
+SYNTHETIC_COMPS = [
+    comp for comp, bits in COMP_TO_BINARY.items() if len(bits) == 6
+]
+
+COUNTING_LOOP = [
+    "(START)",
+    "@1000",
+    "D=A",
+    "@i",
+    "M=D",
+    "(LOOP)",
+    "@i",
+    "D=M",
+    "@SCREEN",
+    "A=D+A",
+    "M=!M",
+    "@sum",
+    "M=D+M",
+    "@i",
+    "M=M-1",
+    "D=M",
+    "@LOOP",
+    "D;JGT",
+    "@START",
+    "0;JMP",
+]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    stage: str
+    workload: str
+    unit: str
+    units: int
+    seconds: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.workload}"
+
+    @property
+    def rate(self) -> float:
+        return self.units / self.seconds if self.seconds else float("inf")
+
+    def to_json(self) -> Dict[str, Any]:
+        return {**asdict(self), "rate": self.rate}
+
+    @classmethod
+    def from_json(cls, entry: Dict[str, Any]) -> Measurement:
+        return cls(
+            entry["stage"],
+            entry["workload"],
+            entry["unit"],
+            entry["units"],
+            entry["seconds"],
+        )
+
+
+def measure(
+    stage: str,
+    workload: str,
+    unit: str,
+    action: Callable[[], int],
+    repeat: int = DEFAULT_REPEAT,
+) -> Measurement:
+    units = 0
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = action()
+        best = min(best, time.perf_counter() - start)
+    return Measurement(stage, workload, unit, units, best)
+
+
+def synthetic_assembly(lines: int, seed: int = SYNTHETIC_SEED) -> List[str]:
+    generator = random.Random(seed)
+    labels = [f"LABEL_{index}" for index in range(max(1, lines // 50))]
+    dests = list(DEST_TO_BINARY)
+    jumps = list(JUMP_TO_BINARY)
+
+    assembly = []
+    for index in range(lines):
+        if index % 50 == 0:
+            assembly.append(f"({labels[index // 50]})")
+        choice = generator.random()
+        if choice < 0.2:
+            assembly.append(f"@{generator.choice(labels)}")
+        elif choice < 0.3:
+            assembly.append(f"@var_{generator.randrange(64)}")
+        elif choice < 0.5:
+            assembly.append(f"@{generator.randrange(32768)}")
+        elif choice < 0.9:
+            comp = generator.choice(SYNTHETIC_COMPS)
+            assembly.append(f"{generator.choice(dests)}={comp}")
+        else:
+            comp = generator.choice(SYNTHETIC_COMPS)
+            assembly.append(f"{comp};{generator.choice(jumps)}")
+    return assembly
+
+
+def assemble_benchmark(
+    workload: str, path: str, repeat: int = DEFAULT_REPEAT
+) -> Tuple[Measurement, List[int]]:
+    def run_assembler() -> int:
+        return len(Assembler.load_from(path).assemble_words())
+
+    result = measure("assemble", workload, "lines", run_assembler, repeat)
+    words = list(Assembler.load_from(path).assemble_words())
+    return result, words
+
+
+def simulate_benchmarks(
+    workload: str,
+    words: List[int],
+    cycles: int = DEFAULT_CYCLES,
+    repeat: int = DEFAULT_REPEAT,
+) -> List[Measurement]:
+    def simulate(simulator: HackSimulator) -> int:
+        simulator.load(words)
+        simulator.run(cycles)
+        return simulator.cycle
+
+    return [
+        measure(
+            "simulate",
+            workload,
+            "cycles",
+            lambda: simulate(HackSimulator(detect_halt=False)),
+            repeat,
+        ),
+        measure(
+            "simulate_jit",
+            workload,
+            "cycles",
+            lambda: simulate(
+                HackSimulator(
+                    compiler=BlockCompiler.create(), detect_halt=False
+                )
+            ),
+            repeat,
+        ),
+    ]
+
+
+def run_benchmarks(
+    asm_files: Iterable[str] = (),
+    lines: int = SYNTHETIC_LINES,
+    cycles: int = DEFAULT_CYCLES,
+    repeat: int = DEFAULT_REPEAT,
+) -> List[Measurement]:
+    results = []
+    for path in asm_files:
+        result, words = assemble_benchmark(Path(path).stem, path, repeat)
+        results.append(result)
+        results += simulate_benchmarks(result.workload, words, cycles, repeat)
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic = Path(directory, "synthetic.asm")
+        synthetic.write_text("\n".join(synthetic_assembly(lines)))
+        result, _ = assemble_benchmark(
+            f"synthetic_{lines}", str(synthetic), repeat
+        )
+        results.append(result)
+
+        counting = Path(directory, "counting.asm")
+        counting.write_text("\n".join(COUNTING_LOOP))
+        _, words = assemble_benchmark("counting", str(counting), 1)
+        results += simulate_benchmarks("counting", words, cycles, repeat)
+    return results
+
+
+def save_baseline(results: List[Measurement], path: str) -> None:
+    baseline = {
+        "version": BASELINE_VERSION,
+        "results": {result.key: result.to_json() for result in results},
+    }
+    Path(path).write_text(json.dumps(baseline, indent=2))
+
+
+def load_baseline(path: str) -> Dict[str, Measurement]:
+    baseline = json.loads(Path(path).read_text())
+    assert baseline["version"] == BASELINE_VERSION, \
+        "Unsupported baseline version"
+    return {
+        key: Measurement.from_json(entry)
+        for key, entry in baseline["results"].items()
+    }
+
+
+def compare(
+    baseline: Dict[str, Measurement],
+    current: Dict[str, Measurement],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[List[str], List[str]]:
+    report = []
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key].rate
+        after = current[key].rate
+        change = after / before - 1 if before else 0.0
+        line = f"{key:<40} {before:>14.0f} -> {after:>14.0f}"
+        line += f" {current[key].unit}/s ({change:+.1%})"
+        if change < -threshold:
+            regressions.append(line)
+            line += "  REGRESSION"
+        report.append(line)
+    return report, regressions
@@ -1,42 +1,299 @@
-from __future__ import annotations
-
-import json
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Iterable
-
-from n2t.core import HackSimulator
-from n2t.core.assembler import Assembler
-
-
-@dataclass
-class HackProgram:
-    file_path: str
-    cycles: int
-
-    @classmethod
-    def load_from(cls, file_or_directory_name: str, num_cycles: int) \
-            -> HackProgram:
-        return cls(file_or_directory_name, num_cycles)
-
-    def load(self) -> Iterable[str]:
-        with Path(self.file_path).open("r", newline="") as file:
-            yield from (line.strip() for line in file if line)
-
-    def simulate(self) -> None:
-        instructions = (
-            self.load()
-            if self.file_path.endswith(".hack")
-            else Assembler.load_from(self.file_path).assemble()
-        )
-
-        output = HackSimulator().simulate(instructions, self.cycles)
-
-        json_path = (
-            self.file_path[:-4]
-            if self.file_path.endswith(".hack")
-            else self.file_path[:-3]
-        ) + "json"
-        json_output = {"RAM": output}
-        with open(json_path, "w") as json_file:
-            json.dump(json_output, json_file, indent=2)
+from __future__ import annotations
+
+import json
+import signal
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import Assembler, file_to_iterable
+from n2t.core.checkpoint import Checkpoint
+from n2t.core.decoder import parse_words
+from n2t.core.memory import SIZE, MemoryBackend, flush
+from n2t.core.natives import NativeTable
+from n2t.core.profiler import (
+    LabelMap,
+    Profile,
+    collapsed_stacks,
+    hot_spot_report,
+)
+from n2t.core.rom import EXTENSION as ROM_EXTENSION
+from n2t.core.rom import load_rom
+from n2t.core.screen import FrameCapture, FrameFormat, KeyboardScript
+from n2t.core.trace import TraceWriter
+from n2t.infra.output import OutputFormat
+
+CHECKPOINT_POLL_CYCLES = 1_000_000
+
+
+@dataclass
+class HackProgram:
+    file_path: str
+    cycles: int
+    jit: bool = False
+    jit_cache: Optional[str] = None
+    memory: MemoryBackend = MemoryBackend.list
+    ram_file: Optional[str] = None
+    checkpoint: Optional[str] = None
+    checkpoint_every: int = 0
+    resume: Optional[str] = None
+    profile: bool = False
+    trace: Optional[str] = None
+    trace_sample: int = 1
+    trace_start: int = 0
+    trace_stop: Optional[int] = None
+    breakpoints: List[str] = field(default_factory=list)
+    watchpoints: List[int] = field(default_factory=list)
+    screen: Optional[str] = None
+    frame_every: int = 0
+    frame_format: FrameFormat = FrameFormat.pbm
+    keyboard: Optional[str] = None
+    output_format: OutputFormat = OutputFormat.pretty
+    ram_start: int = 0
+    ram_stop: int = SIZE
+    native: bool = False
+    frames: int = 0
+
+    @classmethod
+    def load_from(
+        cls,
+        file_or_directory_name: str,
+        num_cycles: int,
+        jit: bool = False,
+        jit_cache: Optional[str] = None,
+        memory: MemoryBackend = MemoryBackend.list,
+        ram_file: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: int = 0,
+        resume: Optional[str] = None,
+        profile: bool = False,
+        trace: Optional[str] = None,
+        trace_sample: int = 1,
+        trace_start: int = 0,
+        trace_stop: Optional[int] = None,
+        breakpoints: Optional[List[str]] = None,
+        watchpoints: Optional[List[int]] = None,
+        screen: Optional[str] = None,
+        frame_every: int = 0,
+        frame_format: FrameFormat = FrameFormat.pbm,
+        keyboard: Optional[str] = None,
+        output_format: OutputFormat = OutputFormat.pretty,
+        ram_start: int = 0,
+        ram_stop: int = SIZE,
+        native: bool = False,
+    ) -> HackProgram:
+        return cls(
+            file_path=file_or_directory_name,
+            cycles=num_cycles,
+            jit=jit,
+            jit_cache=jit_cache,
+            memory=memory,
+            ram_file=ram_file,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+            resume=resume,
+            profile=profile,
+            trace=trace,
+            trace_sample=trace_sample,
+            trace_start=trace_start,
+            trace_stop=trace_stop,
+            breakpoints=breakpoints or [],
+            watchpoints=watchpoints or [],
+            screen=screen,
+            frame_every=frame_every,
+            frame_format=frame_format,
+            keyboard=keyboard,
+            output_format=output_format,
+            ram_start=ram_start,
+            ram_stop=ram_stop,
+            native=native,
+        )
+
+    def load(self) -> Iterable[str]:
+        with Path(self.file_path).open("r", newline="") as file:
+            yield from (line.strip() for line in file if line)
+
+    def output_path(self, extension: str) -> str:
+        return (
+            self.file_path[:-4]
+            if self.file_path.endswith(".hack")
+            else self.file_path[:-3]
+        ) + extension
+
+    def checkpoint_path(self) -> Optional[str]:
+        if self.checkpoint is None and self.checkpoint_every:
+            return self.output_path("ckpt")
+        return self.checkpoint
+
+    def run(self, simulator: HackSimulator) -> None:
+        checkpoint_path = self.checkpoint_path()
+        remaining = self.cycles - simulator.cycle
+        frames = self.frame_capture()
+        keyboard = self.keyboard_script()
+        if checkpoint_path is None and frames is None and keyboard is None:
+            simulator.run(remaining)
+            return
+
+        requested = False
+
+        def request_checkpoint(*_: Any) -> None:
+            nonlocal requested
+            requested = True
+
+        if checkpoint_path is not None and hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, request_checkpoint)
+
+        next_checkpoint = simulator.cycle + self.checkpoint_every
+        next_frame = simulator.cycle + self.frame_every
+        while remaining > 0:
+            deadlines = [remaining, CHECKPOINT_POLL_CYCLES]
+            if self.checkpoint_every:
+                deadlines.append(next_checkpoint - simulator.cycle)
+            if frames is not None and self.frame_every:
+                deadlines.append(next_frame - simulator.cycle)
+            if keyboard is not None:
+                keyboard.apply(simulator.ram, simulator.cycle)
+                event = keyboard.next_event(simulator.cycle)
+                if event is not None:
+                    deadlines.append(event - simulator.cycle)
+
+            budget = min(deadlines)
+            executed = simulator.run(budget)
+            remaining -= executed
+            if frames is not None and simulator.cycle >= next_frame:
+                frames.capture(simulator.ram, simulator.cycle)
+                next_frame = simulator.cycle + self.frame_every
+            if checkpoint_path is not None and (
+                requested
+                or self.checkpoint_every
+                and simulator.cycle >= next_checkpoint
+            ):
+                simulator.checkpoint().save(checkpoint_path)
+                next_checkpoint = simulator.cycle + self.checkpoint_every
+                requested = False
+            if executed < budget:
+                break
+
+        if frames is not None:
+            frames.capture(simulator.ram, simulator.cycle)
+            self.frames = frames.frames
+        if checkpoint_path is not None:
+            simulator.checkpoint().save(checkpoint_path)
+
+    def frame_capture(self) -> Optional[FrameCapture]:
+        if self.screen is None:
+            return None
+        return FrameCapture.create(self.screen, self.frame_format)
+
+    def keyboard_script(self) -> Optional[KeyboardScript]:
+        if self.keyboard is None:
+            return None
+        return KeyboardScript.load(self.keyboard)
+
+    def words(self) -> Iterable[int]:
+        if self.file_path.endswith(ROM_EXTENSION):
+            return load_rom(self.file_path)
+        if self.file_path.endswith(".hack"):
+            return parse_words(self.load())
+        return Assembler.load_from(self.file_path).assemble_words()
+
+    def sweep(self, states_file: str) -> None:
+        from n2t.core.batch_simulator import BatchSimulator
+
+        with open(states_file, "r") as file:
+            states = [
+                {int(address): value for address, value in state.items()}
+                for state in json.load(file)
+            ]
+
+        simulator = BatchSimulator.from_states(states)
+        words = self.words()
+        outputs = simulator.simulate(words, self.cycles)
+
+        with open(self.output_path("sweep.json"), "w") as json_file:
+            json.dump({"RAM": outputs}, json_file)
+
+    def labels(self) -> LabelMap:
+        if not self.file_path.endswith(".asm"):
+            return LabelMap()
+        return LabelMap.from_labels(
+            Assembler.load_from(self.file_path).labels()
+        )
+
+    def breakpoint_addresses(self) -> List[int]:
+        labels = {}
+        if self.file_path.endswith(".asm"):
+            labels = Assembler.load_from(self.file_path).labels()
+        addresses = []
+        for breakpoint in self.breakpoints:
+            if breakpoint.isdigit():
+                addresses.append(int(breakpoint))
+            else:
+                assert breakpoint in labels, f"Unknown label {breakpoint}"
+                addresses.append(labels[breakpoint])
+        return addresses
+
+    def save_profile(self, simulator: HackSimulator) -> None:
+        assert simulator.profile is not None
+        labels = self.labels()
+        report = hot_spot_report(simulator.profile, simulator.program, labels)
+        with open(self.output_path("profile.txt"), "w") as file:
+            file.writelines(f"{line}\n" for line in report)
+        with open(self.output_path("folded"), "w") as file:
+            stacks = collapsed_stacks(simulator.profile, labels)
+            file.writelines(f"{line}\n" for line in stacks)
+
+    def simulate(self) -> HackSimulator:
+        words = self.words()
+
+        ram_file = self.ram_file
+        if self.memory is MemoryBackend.mmap and ram_file is None:
+            ram_file = self.output_path("ram")
+
+        simulator = (
+            HackSimulator.with_jit(self.jit_cache, self.memory, ram_file)
+            if self.jit or self.jit_cache
+            else HackSimulator.create(self.memory, ram_file)
+        )
+        if self.profile:
+            simulator.profile = Profile()
+        if self.native and self.file_path.endswith(".asm"):
+            symbols = Assembler.load_from(self.file_path).symbols()
+            simulator.natives = NativeTable.from_symbols(
+                symbols, file_to_iterable(self.file_path)
+            )
+        simulator.load(words)
+        if self.resume is not None:
+            simulator.restore(Checkpoint.load(self.resume))
+        if self.trace is not None:
+            simulator.tracer = TraceWriter.open(
+                self.trace,
+                self.trace_sample,
+                self.trace_start,
+                self.trace_stop,
+            )
+        for address in self.breakpoint_addresses():
+            simulator.add_breakpoint(address)
+        for address in self.watchpoints:
+            simulator.add_watchpoint(address)
+        self.run(simulator)
+        if simulator.tracer is not None:
+            simulator.tracer.close()
+        if simulator.profile is not None:
+            self.save_profile(simulator)
+
+        if self.memory is MemoryBackend.mmap:
+            flush(simulator.ram)
+            return simulator
+        if self.output_format is OutputFormat.none:
+            return simulator
+
+        self.output_format.save(
+            self.output_path(self.output_format.extension),
+            simulator.ram_state_payroll(self.ram_start, self.ram_stop),
+            simulator.ram,
+            self.ram_start,
+            self.ram_stop,
+        )
+        return simulator
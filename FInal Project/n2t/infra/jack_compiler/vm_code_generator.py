@@ -0,0 +1,96 @@
+from typing import Callable, List, Optional
+
+from n2t.core.source_map import SourceLocation, SourceMap
+
+var_types_to_segments = {"field": "this"}
+
+symbol_to_alu_command = {
+    "+": "add",
+    "-": "sub",
+    "~": "not",
+    "|": "or",
+    "&": "and",
+    "&gt": "gt",
+    "@lt": "lt",
+    ">": "gt",
+    "<": "lt",
+    "=": "eq",
+    "*": "call Math.multiply 2",
+    "/": "call Math.divide 2",
+    "@amp": "amp",
+}
+
+
+class VMCodeGenerator:
+    def __init__(
+        self,
+        source_map: Optional[SourceMap] = None,
+        locate: Optional[Callable[[], SourceLocation]] = None,
+    ) -> None:
+        self.lines: List[str] = []
+        self.source_map = source_map
+        self.locate = locate
+
+    def write(self, command: str) -> None:
+        if self.source_map is not None and self.locate is not None:
+            self.source_map.mark(len(self.lines), self.locate())
+        self.lines.append(command)
+
+    def generate_push(self, segment: str, index: int) -> None:
+        self.write(
+            f"push {var_types_to_segments.get(segment, segment)} {index}"
+        )
+
+    def generate_pop(self, segment: str, index: int) -> None:
+        self.write(
+            f"pop {var_types_to_segments.get(segment, segment)} {index}"
+        )
+
+    def generate_label(self, label: str, index: int) -> None:
+        self.write(f"label {label}{index}")
+
+    def generate_goto(self, label: str, index: int) -> None:
+        self.write(f"goto {label}{index}")
+
+    def generate_if_goto(self, label: str, index: int) -> None:
+        self.write(f"if-goto {label}{index}")
+
+    def generate_string(self, value: str) -> None:
+        self.generate_push("constant", len(value))
+        self.generate_call("String.new", 1)
+
+        for ch in value:
+            self.generate_push("constant", ord(ch))
+            self.generate_call("String.appendChar", 2)
+
+    def generate_keyword(self, keyword: str) -> None:
+        if keyword == "true":
+            self.generate_push("constant", 0)
+            self.generate_alu("not")
+        elif keyword in ("false", "null"):
+            self.generate_push("constant", 0)
+        elif keyword == "this":
+            self.generate_push("pointer", 0)
+
+    def generate_alu(self, symbol: str) -> None:
+        self.write(f"{symbol_to_alu_command.get(symbol, symbol)}")
+
+    def generate_function(
+        self, class_name: str, function_name: str, nargs: int
+    ) -> None:
+        self.write(f"function {class_name}.{function_name} {nargs}")
+
+    def generate_call(self, name: str, nargs: int) -> None:
+        self.write(f"call {name} {nargs}")
+
+    def generate_return(self) -> None:
+        self.write("return")
+
+    def generate_method_header(self) -> None:
+        self.generate_push("argument", 0)
+        self.generate_pop("pointer", 0)
+
+    def generate_constructor_header(self, size: int) -> None:
+        self.generate_push("constant", size)
+        self.generate_call("Memory.alloc", 1)
+        self.generate_pop("pointer", 0)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from enum import Enum
+from typing import Dict, MutableSequence
+
+from n2t.core.memory import SIZE
+
+
+class OutputFormat(Enum):
+    pretty = "pretty"
+    compact = "compact"
+    ndjson = "ndjson"
+    binary = "binary"
+    none = "none"
+
+    @property
+    def extension(self) -> str:
+        return {
+            OutputFormat.ndjson: "ndjson",
+            OutputFormat.binary: "bin",
+        }.get(self, "json")
+
+    def save(
+        self,
+        path: str,
+        written: Dict[int, int],
+        ram: MutableSequence[int],
+        start: int = 0,
+        stop: int = SIZE,
+    ) -> None:
+        if self is OutputFormat.binary:
+            words = array("h", ram[start:stop])
+            if sys.byteorder == "big":
+                words.byteswap()
+            with open(path, "wb") as binary_file:
+                binary_file.write(words.tobytes())
+            return
+
+        with open(path, "w") as file:
+            if self is OutputFormat.ndjson:
+                file.writelines(
+                    f'{{"address": {address}, "value": {value}}}\n'
+                    for address, value in written.items()
+                )
+            elif self is OutputFormat.compact:
+                json.dump({"RAM": written}, file, separators=(",", ":"))
+            else:
+                json.dump({"RAM": written}, file, indent=2)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_with_symbols
+from n2t.core.natives import NativeTable
+from n2t.core.profiler import Profile, source_line_report
+from n2t.core.source_map import SourceMap
+from n2t.infra.asm_formatter.constants import ASM_EXTENSION, VM_EXTENSION
+from n2t.infra.jack_compiler.compilation_engine import CompilationEngine
+from n2t.infra.jack_compiler.constants import JACK_FILE_EXT
+from n2t.infra.jack_compiler.tokenizer import Tokenizer
+from n2t.infra.vm_translator import translate_vm
+
+SYS_CLASS = "Sys"
+
+
+@dataclass(frozen=True)
+class StageReport:
+    name: str
+    seconds: float
+    units: int
+    unit: str
+    size: int
+
+    def describe(self) -> str:
+        return (
+            f"{self.name:<10} {1000 * self.seconds:>10.1f} ms "
+            f"{self.units:>10} {self.unit:<7} {self.size:>10} bytes"
+        )
+
+
+def text_size(lines: Iterable[str]) -> int:
+    return sum(len(line) + 1 for line in lines)
+
+
+def compile_jack(
+    source: str, source_map: Optional[SourceMap] = None, name: str = ""
+) -> List[str]:
+    return CompilationEngine(
+        Tokenizer(source), source_map=source_map, source=name
+    ).compile()
+
+
+@dataclass
+class JackPipeline:
+    directory: str
+    cycles: int
+    os_directory: Optional[str] = None
+    jit: bool = False
+    native: bool = False
+    profile: bool = False
+    mapped: bool = False
+    reports: List[StageReport] = field(default_factory=list)
+    source_map: Optional[SourceMap] = None
+
+    @classmethod
+    def load_from(
+        cls,
+        directory: str,
+        cycles: int,
+        os_directory: Optional[str] = None,
+        jit: bool = False,
+        native: bool = False,
+        profile: bool = False,
+        mapped: bool = False,
+    ) -> JackPipeline:
+        return cls(
+            directory, cycles, os_directory, jit, native, profile, mapped
+        )
+
+    def sources(self) -> Iterator[Tuple[str, str]]:
+        classes = {}
+        for directory in (self.os_directory, self.directory):
+            if directory is None:
+                continue
+            for path in sorted(Path(directory).glob(f"*{JACK_FILE_EXT}")):
+                classes[path.stem] = path.read_text()
+        yield from classes.items()
+
+    def record(
+        self, name: str, start: float, lines: List[str], unit: str = "lines"
+    ) -> None:
+        seconds = perf_counter() - start
+        self.reports.append(
+            StageReport(name, seconds, len(lines), unit, text_size(lines))
+        )
+
+    def run(self) -> HackSimulator:
+        self.reports = []
+        mapped = self.mapped or self.profile
+        maps: Dict[str, SourceMap] = {}
+        assembly_name = Path(self.directory).resolve().name + ASM_EXTENSION
+
+        start = perf_counter()
+        programs = []
+        for name, source in self.sources():
+            vm_map = SourceMap() if mapped else None
+            programs.append(
+                (name, compile_jack(source, vm_map, name + JACK_FILE_EXT))
+            )
+            if vm_map is not None:
+                maps[name + VM_EXTENSION] = vm_map
+        vm = [line for _, lines in programs for line in lines]
+        self.record("compile", start, vm)
+
+        start = perf_counter()
+        bootstrap = any(name == SYS_CLASS for name, _ in programs)
+        asm_map = SourceMap() if mapped else None
+        assembly = list(translate_vm(programs, bootstrap, asm_map))
+        self.record("translate", start, assembly)
+        if asm_map is not None:
+            maps[assembly_name] = asm_map
+
+        start = perf_counter()
+        rom_map = SourceMap() if mapped else None
+        words, symbols = assemble_with_symbols(
+            assembly, rom_map, assembly_name
+        )
+        seconds = perf_counter() - start
+        size = words.itemsize * len(words)
+        self.reports.append(
+            StageReport("assemble", seconds, len(words), "words", size)
+        )
+
+        if rom_map is not None:
+            self.source_map = rom_map.compose(maps)
+
+        start = perf_counter()
+        simulator = HackSimulator.with_jit() if self.jit else HackSimulator()
+        if self.profile:
+            simulator.profile = Profile()
+        if self.native:
+            simulator.natives = NativeTable.from_symbols(symbols, assembly)
+        simulator.load(words)
+        simulator.run(self.cycles)
+        self.reports.append(
+            StageReport(
+                "simulate",
+                perf_counter() - start,
+                simulator.cycle,
+                "cycles",
+                2 * len(simulator.writes),
+            )
+        )
+        return simulator
+
+    def profile_report(self, simulator: HackSimulator) -> Iterable[str]:
+        assert simulator.profile is not None, "Pipeline was not profiled"
+        assert self.source_map is not None
+        return source_line_report(simulator.profile, self.source_map)
+
+    def save(self, simulator: HackSimulator, path: str) -> None:
+        with open(path, "w") as json_file:
+            json.dump({"RAM": simulator.ram_state_payroll()}, json_file)
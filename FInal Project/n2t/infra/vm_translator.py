@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from n2t.core.source_map import SourceLocation, SourceMap
+from n2t.infra.asm_formatter.alu_formatter import AluFormatter
+from n2t.infra.asm_formatter.branch_formatter import BranchFormatter
+from n2t.infra.asm_formatter.constants import (
+    FILENAME_KEY,
+    FUNCTION_NAME_KEY,
+    INSTRUCTION_INDEX_KEY,
+    INSTRUCTION_KEY,
+    VM_EXTENSION,
+)
+from n2t.infra.asm_formatter.function_formatter import FunctionFormatter
+from n2t.infra.asm_formatter.pop_formatter import PopFormatter
+from n2t.infra.asm_formatter.push_formatter import PushFormatter
+
+BOOTSTRAP_SP = ["@256", "D=A", "@SP", "M=D"]
+
+BOOTSTRAP_SYS_INIT = "call Sys.init 0"
+
+
+def number_vm_code(instructions: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    for index, line in enumerate(instructions):
+        cleaned_line = line.split("//", 1)[0].strip()
+        if cleaned_line:
+            yield index, cleaned_line
+
+
+def clean_vm_code(instructions: Iterable[str]) -> Iterator[str]:
+    return (line for _, line in number_vm_code(instructions))
+
+
+def vm_instr_to_asm(args: Dict[str, Any]) -> str:
+    command_type: str = args[INSTRUCTION_KEY].split(" ")[0]
+    if command_type == "push":
+        return PushFormatter(args).translate_to_asm()
+    elif command_type == "pop":
+        return PopFormatter(args).translate_to_asm()
+    elif command_type in ("label", "goto", "if-goto"):
+        return BranchFormatter(args).translate_to_asm()
+    elif command_type in ("function", "call", "return"):
+        return FunctionFormatter(args).translate_to_asm()
+    else:
+        return AluFormatter(args).translate_to_asm()
+
+
+def translate_vm_file(
+    vm_instructions: Iterable[str],
+    filename: str,
+    indexes: Iterator[int],
+    source_map: Optional[SourceMap] = None,
+    start: int = 0,
+) -> Iterator[str]:
+    current_function = ""
+    position = start
+    for line, vm_instruction in number_vm_code(vm_instructions):
+        if vm_instruction.startswith("function "):
+            current_function = vm_instruction.split(" ")[1]
+        args = {
+            INSTRUCTION_KEY: vm_instruction,
+            FILENAME_KEY: filename,
+            FUNCTION_NAME_KEY: current_function,
+            INSTRUCTION_INDEX_KEY: next(indexes),
+        }
+        assembly = vm_instr_to_asm(args).splitlines()
+        if source_map is not None:
+            location = SourceLocation(
+                filename + VM_EXTENSION, line, current_function
+            )
+            source_map.mark(position, location)
+            position += len(assembly)
+        yield from assembly
+
+
+def translate_vm(
+    programs: Iterable[Tuple[str, Iterable[str]]],
+    bootstrap: bool = True,
+    source_map: Optional[SourceMap] = None,
+) -> Iterator[str]:
+    indexes = count()
+    position = 0
+    if source_map is not None:
+        source_map.mark(position, None)
+    if bootstrap:
+        assembly = BOOTSTRAP_SP + list(
+            translate_vm_file([BOOTSTRAP_SYS_INIT], "", indexes)
+        )
+        position += len(assembly)
+        yield from assembly
+
+    for filename, instructions in programs:
+        assembly = list(
+            translate_vm_file(
+                instructions, filename, indexes, source_map, position
+            )
+        )
+        position += len(assembly)
+        yield from assembly
+
+    if source_map is not None:
+        source_map.mark(position, None)
+    yield from FunctionFormatter.shared_routines().splitlines()
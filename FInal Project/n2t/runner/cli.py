@@ -1,16 +1,269 @@
-from typer import Typer, echo
+import asyncio
+import sys
+from contextlib import nullcontext
+from typing import List, Optional
 
-from n2t.infra import HackProgram
+from typer import Exit, Option, Typer, echo
+
+from n2t.core import HackSimulator
+from n2t.core.memory import SIZE, MemoryBackend
+from n2t.core.screen import FrameFormat
+from n2t.core.source_map import SourceMap
+from n2t.core.trace import read_trace
+from n2t.infra import HackProgram, JackPipeline
+from n2t.infra.batch import (
+    collect_jobs,
+    is_batch_target,
+    run_jobs,
+    schedule_jobs,
+)
+from n2t.infra.benchmark import (
+    DEFAULT_CYCLES,
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    SYNTHETIC_LINES,
+    compare,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+from n2t.infra.output import OutputFormat
+from n2t.runner.service import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_HOST,
+    DEFAULT_PENDING,
+    DEFAULT_PORT,
+    DEFAULT_WORKERS,
+    MAX_CYCLES,
+    MAX_SECONDS,
+    SimulationService,
+    serve,
+)
 
 cli = Typer(name="Nand 2 Tetris Software", no_args_is_help=True, add_completion=False)
 
 
 @cli.command("execute", no_args_is_help=True)
-def run_simulator(hack_file: str, cycles: int = 10000) -> None:
-    HackProgram.load_from(hack_file, cycles).simulate()
+def run_simulator(
+    hack_file: str,
+    cycles: int = 10000,
+    jit: bool = False,
+    jit_cache: Optional[str] = None,
+    memory: MemoryBackend = MemoryBackend.list,
+    ram_file: Optional[str] = None,
+    checkpoint: Optional[str] = None,
+    checkpoint_every: int = 0,
+    resume: Optional[str] = None,
+    workers: Optional[int] = None,
+    output: Optional[str] = None,
+    profile: bool = False,
+    trace: Optional[str] = None,
+    trace_sample: int = 1,
+    trace_start: int = 0,
+    trace_stop: Optional[int] = None,
+    breakpoint: List[str] = Option([], "--break"),
+    watch: List[int] = Option([]),
+    screen: Optional[str] = None,
+    frame_every: int = 0,
+    frame_format: FrameFormat = FrameFormat.pbm,
+    keyboard: Optional[str] = None,
+    output_format: OutputFormat = OutputFormat.pretty,
+    ram_start: int = 0,
+    ram_stop: int = SIZE,
+    quantum: int = 0,
+    native: bool = False,
+) -> None:
+    if native and (
+        not hack_file.endswith(".asm")
+        or profile
+        or trace is not None
+        or breakpoint
+        or watch
+    ):
+        echo(
+            "--native needs a single .asm program and cannot be combined "
+            "with --profile, --trace, --break or --watch."
+        )
+        raise Exit(code=1)
+    if is_batch_target(hack_file):
+        jobs = collect_jobs(hack_file, cycles)
+        include_ram = output_format is not OutputFormat.none
+        sink = nullcontext(sys.stdout) if output is None else open(output, "w")
+        with sink as file:
+            if quantum > 0:
+                failures = schedule_jobs(
+                    jobs, file, quantum, jit, ram_start, ram_stop, include_ram
+                )
+            else:
+                failures = run_jobs(
+                    jobs, file, workers, jit, ram_start, ram_stop, include_ram
+                )
+        echo(f"Done! {len(jobs) - failures}/{len(jobs)} jobs succeeded.")
+        return
+
+    program = HackProgram.load_from(
+        hack_file,
+        cycles,
+        jit=jit,
+        jit_cache=jit_cache,
+        memory=memory,
+        ram_file=ram_file,
+        checkpoint=checkpoint,
+        checkpoint_every=checkpoint_every,
+        resume=resume,
+        profile=profile,
+        trace=trace,
+        trace_sample=trace_sample,
+        trace_start=trace_start,
+        trace_stop=trace_stop,
+        breakpoints=breakpoint,
+        watchpoints=watch,
+        screen=screen,
+        frame_every=frame_every,
+        frame_format=frame_format,
+        keyboard=keyboard,
+        output_format=output_format,
+        ram_start=ram_start,
+        ram_stop=ram_stop,
+        native=native,
+    )
+    simulator = program.simulate()
+    report_natives(simulator)
+    stop = simulator.stopped
+    if stop is not None and stop.address is not None:
+        echo(
+            f"Stopped at {stop.reason} RAM[{stop.address}]={stop.value} "
+            f"(pc {stop.pc}, cycle {stop.cycle})."
+        )
+    elif stop is not None:
+        echo(f"Stopped at {stop.reason} pc {stop.pc} (cycle {stop.cycle}).")
+    if simulator.halted_at is not None:
+        echo(f"Program halted at cycle {simulator.halted_at}.")
+    if screen is not None:
+        echo(f"Captured {program.frames} frames in {simulator.cycle} cycles.")
+    echo("Done!")
+
+
+def report_natives(simulator: HackSimulator) -> None:
+    if simulator.natives is not None:
+        names = ", ".join(simulator.natives.names) or "none"
+        echo(f"Native routines: {names}")
+        if simulator.natives.names:
+            echo("Stack memory above SP is not reproduced by native calls.")
+
+
+@cli.command("sweep", no_args_is_help=True)
+def run_sweep(hack_file: str, states_file: str, cycles: int = 10000) -> None:
+    HackProgram.load_from(hack_file, cycles).sweep(states_file)
     echo("Done!")
 
 
+@cli.command("trace", no_args_is_help=True)
+def show_trace(
+    trace_file: str,
+    limit: Optional[int] = None,
+    source_map: Optional[str] = None,
+) -> None:
+    mapping = None if source_map is None else SourceMap.load(source_map)
+    for index, record in enumerate(read_trace(trace_file)):
+        if limit is not None and index >= limit:
+            break
+        line = f"{record.cycle} pc={record.pc} A={record.address_reg} "
+        line += f"D={record.data_reg}"
+        if record.wrote:
+            line += f" RAM[{record.write_address}]={record.write_value}"
+        location = None if mapping is None else mapping.resolve(record.pc)
+        if location is not None:
+            line += f"  {location.describe()}"
+        echo(line)
+
+
+@cli.command("benchmark")
+def run_benchmark(
+    asm: List[str] = Option([]),
+    lines: int = SYNTHETIC_LINES,
+    cycles: int = DEFAULT_CYCLES,
+    repeat: int = DEFAULT_REPEAT,
+    output: Optional[str] = None,
+) -> None:
+    results = run_benchmarks(asm, lines, cycles, repeat)
+    for result in results:
+        echo(f"{result.key:<32} {result.rate:>12.0f} {result.unit}/s")
+    if output is not None:
+        save_baseline(results, output)
+
+
+@cli.command("compare", no_args_is_help=True)
+def run_compare(
+    baseline: str, current: str, threshold: float = DEFAULT_THRESHOLD
+) -> None:
+    report, regressions = compare(
+        load_baseline(baseline), load_baseline(current), threshold
+    )
+    for line in report:
+        echo(line)
+    if regressions:
+        echo(f"{len(regressions)} stage(s) regressed past {threshold:.0%}.")
+        raise Exit(code=1)
+    echo("No regressions.")
+
+
 @cli.command("run", no_args_is_help=True)
-def run() -> None:
-    pass
+def run(
+    jack_directory: str,
+    cycles: int = 10000,
+    os_directory: Optional[str] = None,
+    jit: bool = False,
+    output: Optional[str] = None,
+    native: bool = False,
+    profile: bool = False,
+    source_map: Optional[str] = None,
+) -> None:
+    if native and profile:
+        echo("--native cannot be combined with --profile.")
+        raise Exit(code=1)
+    pipeline = JackPipeline.load_from(
+        jack_directory,
+        cycles,
+        os_directory,
+        jit,
+        native,
+        profile,
+        source_map is not None,
+    )
+    simulator = pipeline.run()
+    report_natives(simulator)
+    for report in pipeline.reports:
+        echo(report.describe())
+    if simulator.halted_at is not None:
+        echo(f"Program halted at cycle {simulator.halted_at}.")
+    if profile:
+        for line in pipeline.profile_report(simulator):
+            echo(line)
+    if output is not None:
+        pipeline.save(simulator, output)
+    if source_map is not None and pipeline.source_map is not None:
+        pipeline.source_map.save(source_map)
+    echo("Done!")
+
+
+@cli.command("serve")
+def run_service(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+    pending: int = DEFAULT_PENDING,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    max_cycles: int = MAX_CYCLES,
+    max_seconds: float = MAX_SECONDS,
+) -> None:
+    service = SimulationService.create(
+        workers, pending, cache_size, max_cycles, max_seconds
+    )
+    where = socket if socket is not None else f"{host}:{port}"
+    echo(f"Serving simulation jobs on {where}")
+    try:
+        asyncio.run(serve(service, host, port, socket))
+    except KeyboardInterrupt:
+        echo("Stopped.")
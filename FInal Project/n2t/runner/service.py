@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import Manager
+from multiprocessing.managers import SyncManager
+from typing import Any, Dict, List, Optional
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_words, format_words
+from n2t.core.decoder import (
+    Instruction,
+    decode_program,
+    find_halt_loops,
+    parse_words,
+)
+from n2t.core.memory import SIZE
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+DEFAULT_PENDING = 64
+DEFAULT_CACHE_SIZE = 128
+DEFAULT_CYCLES = 10000
+MAX_CYCLES = 100_000_000
+MAX_SECONDS = 60.0
+SLICE_CYCLES = 100_000
+STREAM_LIMIT = 1 << 24
+WORD_MIN = -(1 << 15)
+WORD_MAX = (1 << 15) - 1
+
+DONE = "done"
+HALTED = "halted"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+
+
+class ServiceError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class CachedProgram:
+    key: str
+    words: List[int]
+    program: List[Instruction]
+    halt_loops: Dict[int, int]
+
+    @classmethod
+    def build(cls, key: str, source: str, kind: str) -> CachedProgram:
+        lines = source.splitlines()
+        if kind == "asm":
+            words = list(assemble_words(lines))
+        else:
+            hack = (line.strip() for line in lines if line.strip())
+            words = list(parse_words(hack))
+        program = decode_program(words)
+        return cls(key, words, program, find_halt_loops(program))
+
+
+def program_key(source: str, kind: str) -> str:
+    return hashlib.sha256(f"{kind}\0{source}".encode()).hexdigest()
+
+
+def is_integer(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def integer_field(
+    request: Dict[str, Any], name: str, default: int, low: int, high: int
+) -> int:
+    value = request.get(name, default)
+    if not is_integer(value) or not low <= value <= high:
+        raise ServiceError(f"{name} must be an integer in [{low}, {high}]")
+    return int(value)
+
+
+def seconds_field(request: Dict[str, Any], default: float) -> float:
+    value = request.get("seconds", default)
+    if not (is_integer(value) or isinstance(value, float)) or value <= 0:
+        raise ServiceError("seconds must be a positive number")
+    return float(value)
+
+
+def ram_field(request: Dict[str, Any]) -> Dict[int, int]:
+    ram = request.get("ram", {})
+    if not isinstance(ram, dict):
+        raise ServiceError("ram must be an object of address: value")
+    values = {}
+    for key, value in ram.items():
+        if not key.isdigit() or int(key) >= SIZE:
+            raise ServiceError(f"RAM address {key} is outside [0, {SIZE})")
+        if not is_integer(value) or not WORD_MIN <= value <= WORD_MAX:
+            raise ServiceError(f"RAM[{key}] must be a 16-bit signed integer")
+        values[int(key)] = value
+    return values
+
+
+@dataclass
+class ProgramCache:
+    capacity: int = DEFAULT_CACHE_SIZE
+    entries: OrderedDict[str, CachedProgram] = field(
+        default_factory=OrderedDict
+    )
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, key: str) -> Optional[CachedProgram]:
+        program = self.entries.get(key)
+        if program is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return program
+
+    def put(self, program: CachedProgram) -> None:
+        self.entries[program.key] = program
+        self.entries.move_to_end(program.key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@dataclass
+class SimulationJob:
+    program: CachedProgram
+    cycles: int
+    seconds: float
+    ram: Dict[int, int] = field(default_factory=dict)
+    jit: bool = False
+    ram_start: int = 0
+    ram_stop: int = SIZE
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    def run(self) -> Dict[str, Any]:
+        simulator = HackSimulator.with_jit() if self.jit else HackSimulator()
+        for address, value in self.ram.items():
+            simulator.ram[address] = value
+        simulator.load_decoded(
+            self.program.words, self.program.program, self.program.halt_loops
+        )
+
+        deadline = time.monotonic() + self.seconds
+        status = DONE
+        while simulator.cycle < self.cycles:
+            if simulator.halted_at is not None:
+                status = HALTED
+                break
+            if self.cancelled.is_set():
+                status = CANCELLED
+                break
+            if time.monotonic() >= deadline:
+                status = TIMEOUT
+                break
+            slice_cycles = min(SLICE_CYCLES, self.cycles - simulator.cycle)
+            if not simulator.run(slice_cycles):
+                break
+        if simulator.halted_at is not None:
+            status = HALTED
+
+        return {
+            "status": status,
+            "program": self.program.key,
+            "cycles": simulator.cycle,
+            "halted": simulator.halted_at,
+            "RAM": simulator.ram_state_payroll(self.ram_start, self.ram_stop),
+        }
+
+
+@dataclass
+class SimulationService:
+    workers: int = DEFAULT_WORKERS
+    pending: int = DEFAULT_PENDING
+    max_cycles: int = MAX_CYCLES
+    max_seconds: float = MAX_SECONDS
+    cache: ProgramCache = field(default_factory=ProgramCache)
+    executor: ProcessPoolExecutor = field(init=False)
+    manager: SyncManager = field(init=False)
+    slots: asyncio.Semaphore = field(init=False)
+    jobs: Dict[str, SimulationJob] = field(default_factory=dict)
+    next_id: int = 0
+
+    def __post_init__(self) -> None:
+        assert self.workers >= 1, "Service needs at least one worker"
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.manager = Manager()
+        self.slots = asyncio.Semaphore(self.workers + self.pending)
+
+    @classmethod
+    def create(
+        cls,
+        workers: int = DEFAULT_WORKERS,
+        pending: int = DEFAULT_PENDING,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_cycles: int = MAX_CYCLES,
+        max_seconds: float = MAX_SECONDS,
+    ) -> SimulationService:
+        return cls(
+            workers,
+            pending,
+            max_cycles,
+            max_seconds,
+            ProgramCache(cache_size),
+        )
+
+    async def program(self, request: Dict[str, Any]) -> CachedProgram:
+        kind = request.get("format", "asm")
+        if kind not in ("asm", "hack"):
+            raise ServiceError(f"Unknown program format {kind}")
+        if "source" not in request:
+            key = request.get("key")
+            program = self.cache.get(key) if isinstance(key, str) else None
+            if program is None:
+                raise ServiceError("Program is not cached; send its source")
+            return program
+        if not isinstance(request["source"], str):
+            raise ServiceError("source must be a string")
+
+        key = program_key(request["source"], kind)
+        program = self.cache.get(key)
+        if program is None:
+            loop = asyncio.get_running_loop()
+            program = await loop.run_in_executor(
+                self.executor,
+                CachedProgram.build,
+                key,
+                request["source"],
+                kind,
+            )
+            self.cache.put(program)
+        return program
+
+    async def assemble(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        program = await self.program(request)
+        return {"key": program.key, "hack": list(format_words(program.words))}
+
+    async def simulate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if self.slots.locked():
+            raise ServiceError("Service is busy; retry later")
+        async with self.slots:
+            cycles = integer_field(
+                request, "cycles", DEFAULT_CYCLES, 0, self.max_cycles
+            )
+            seconds = seconds_field(request, self.max_seconds)
+            ram = ram_field(request)
+            ram_start = integer_field(request, "ram_start", 0, 0, SIZE)
+            ram_stop = integer_field(
+                request, "ram_stop", SIZE, ram_start, SIZE
+            )
+            program = await self.program(request)
+            job = SimulationJob(
+                program,
+                cycles,
+                min(seconds, self.max_seconds),
+                ram,
+                bool(request.get("jit", False)),
+                ram_start,
+                ram_stop,
+                self.manager.Event(),
+            )
+            job_id = str(request.get("job", self.next_id))
+            self.next_id += 1
+            assert job_id not in self.jobs, f"Job {job_id} is already running"
+            self.jobs[job_id] = job
+            try:
+                loop = asyncio.get_running_loop()
+                result = await asyncio.shield(
+                    loop.run_in_executor(self.executor, job.run)
+                )
+            except asyncio.CancelledError:
+                job.cancelled.set()
+                raise
+            finally:
+                del self.jobs[job_id]
+            return {"job": job_id, **result}
+
+    def cancel(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        job = self.jobs.get(str(request.get("job")))
+        if job is not None:
+            job.cancelled.set()
+        return {"cancelled": job is not None}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache": self.cache.stats(),
+            "running": sorted(self.jobs),
+            "workers": self.workers,
+        }
+
+    async def handle(self, request: Any) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            raise ServiceError("Request must be a JSON object")
+        operation = request.get("op")
+        if operation == "assemble":
+            return await self.assemble(request)
+        if operation == "simulate":
+            return await self.simulate(request)
+        if operation == "cancel":
+            return self.cancel(request)
+        if operation == "stats":
+            return self.stats()
+        raise ServiceError(f"Unknown operation {operation}")
+
+    async def respond(
+        self,
+        line: bytes,
+        writer: asyncio.StreamWriter,
+        lock: asyncio.Lock,
+    ) -> None:
+        request: Any = None
+        try:
+            request = json.loads(line)
+            response = {"ok": True, **await self.handle(request)}
+        except (ServiceError, AssertionError, ValueError) as error:
+            response = {"ok": False, "error": str(error)}
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            response = {"ok": False, "error": f"Internal error: {error!r}"}
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        async with lock:
+            writer.write(json.dumps(response, separators=(",", ":")).encode())
+            writer.write(b"\n")
+            await writer.drain()
+
+    async def serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        lock = asyncio.Lock()
+        tasks: List[asyncio.Task[None]] = []
+        try:
+            while line := await reader.readline():
+                tasks.append(
+                    asyncio.create_task(self.respond(line, writer, lock))
+                )
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    def close(self) -> None:
+        for job in self.jobs.values():
+            job.cancelled.set()
+        self.executor.shutdown(wait=True)
+        self.manager.shutdown()
+
+
+async def serve(
+    service: SimulationService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+) -> None:
+    if socket_path is not None:
+        server = await asyncio.start_unix_server(
+            service.serve_connection, socket_path, limit=STREAM_LIMIT
+        )
+    else:
+        server = await asyncio.start_server(
+            service.serve_connection, host, port, limit=STREAM_LIMIT
+        )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -0,0 +1,18 @@
+from pathlib import Path
+
+import pytest
+
+HW_DIRECTORY = "HW 06:07:08:10:11"
+OS_DIRECTORY = "HW 12: The Operating System"
+
+
+@pytest.fixture(scope="module")
+def asm_directory(pytestconfig: pytest.Config) -> Path:
+    return pytestconfig.rootpath.parent.joinpath(
+        HW_DIRECTORY, "tests", "e2e", "asm"
+    )
+
+
+@pytest.fixture(scope="module")
+def os_directory(pytestconfig: pytest.Config) -> Path:
+    return pytestconfig.rootpath.parent.joinpath(OS_DIRECTORY)
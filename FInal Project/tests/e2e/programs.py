@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_words, file_to_iterable
+
+TEST_PROGRAMS = ["empty", "addL", "maxL", "rectL", "max", "rect", "pong"]
+
+CYCLES = 20_000
+
+
+def load_words(asm_directory: Path, program: str) -> List[int]:
+    path = asm_directory.joinpath(f"{program}.asm")
+    return list(assemble_words(file_to_iterable(str(path))))
+
+
+def run(
+    simulator: HackSimulator, words: List[int], cycles: int = CYCLES
+) -> HackSimulator:
+    simulator.load(words)
+    simulator.run(cycles)
+    if simulator.tracer is not None:
+        simulator.tracer.close()
+    return simulator
+
+
+def machine_state(simulator: HackSimulator) -> Tuple[Any, ...]:
+    return (
+        simulator.pc,
+        simulator.address_reg,
+        simulator.data_reg,
+        simulator.cycle,
+        simulator.halted_at,
+        simulator.ram_state_payroll(),
+    )
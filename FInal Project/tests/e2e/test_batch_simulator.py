@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.batch_simulator import BatchSimulator
+from tests.e2e.programs import CYCLES, TEST_PROGRAMS, load_words, run
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_match_interpreter_on_every_machine(
+    program: str, asm_directory: Path
+) -> None:
+    words = load_words(asm_directory, program)
+
+    expected = run(HackSimulator(detect_halt=False), words)
+    states = BatchSimulator.from_states([{}, {}]).simulate(words, CYCLES)
+
+    assert states == [expected.ram_state_payroll()] * 2
+
+
+def test_should_run_diverging_states_in_lockstep(asm_directory: Path) -> None:
+    words = load_words(asm_directory, "max")
+    states = [{0: 3, 1: 9}, {0: 12, 1: -4}, {0: 7, 1: 7}]
+
+    results = BatchSimulator.from_states(states).simulate(words, 100)
+
+    for state, result in zip(states, results):
+        simulator = HackSimulator()
+        simulator.load(words)
+        for address, value in state.items():
+            simulator.ram[address] = value
+        simulator.run(100)
+        assert result[2] == simulator.ram[2] == max(state.values())
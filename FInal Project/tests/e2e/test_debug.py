@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.hack_simulator import BREAKPOINT, WATCHPOINT, Stop
+from n2t.core.memory import SIZE
+from tests.e2e.programs import TEST_PROGRAMS, load_words, machine_state, run
+
+
+def load_max(asm_directory: Path) -> HackSimulator:
+    simulator = HackSimulator()
+    simulator.load(load_words(asm_directory, "max"))
+    simulator.ram[0], simulator.ram[1] = 3, 8
+    return simulator
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_match_interpreter_while_debugging(
+    program: str, asm_directory: Path
+) -> None:
+    words = load_words(asm_directory, program)
+
+    expected = run(HackSimulator(), words)
+    actual = run(HackSimulator(watchpoints={SIZE}), words)
+
+    assert machine_state(actual) == machine_state(expected)
+
+
+def test_should_stop_before_breakpoint(asm_directory: Path) -> None:
+    simulator = load_max(asm_directory)
+    simulator.add_breakpoint(12)
+
+    stop = simulator.run_until(100)
+
+    assert stop == Stop(BREAKPOINT, 12, 10)
+    assert simulator.pc == 12
+    assert simulator.ram_state_payroll() == {}
+
+
+def test_should_stop_after_watched_write(asm_directory: Path) -> None:
+    simulator = load_max(asm_directory)
+    simulator.add_watchpoint(2)
+
+    stop = simulator.run_until(100)
+
+    assert stop == Stop(WATCHPOINT, 13, 12, 2, 8)
+    assert simulator.pc == 14
+    assert simulator.run_until(100) is None
+    assert simulator.halted_at is not None
+
+
+def test_should_step_one_instruction(asm_directory: Path) -> None:
+    simulator = load_max(asm_directory)
+    simulator.add_breakpoint(0)
+
+    assert simulator.step() is None
+    assert (simulator.pc, simulator.address_reg, simulator.cycle) == (1, 0, 1)
+
+
+@pytest.mark.parametrize("address", [-1, 16, SIZE])
+def test_should_reject_breakpoint_outside_program(
+    address: int, asm_directory: Path
+) -> None:
+    simulator = load_max(asm_directory)
+
+    with pytest.raises(AssertionError):
+        simulator.add_breakpoint(address)
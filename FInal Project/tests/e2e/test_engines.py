@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import pytest
+
+from n2t.core import HackSimulator
+from tests.e2e.programs import (
+    CYCLES,
+    TEST_PROGRAMS,
+    load_words,
+    machine_state,
+    run,
+)
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_match_interpreter_with_jit(
+    program: str, asm_directory: Path
+) -> None:
+    words = load_words(asm_directory, program)
+
+    expected = run(HackSimulator(), words)
+    actual = run(HackSimulator.with_jit(), words)
+
+    assert machine_state(actual) == machine_state(expected)
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_match_interpreter_with_jit_in_slices(
+    program: str, asm_directory: Path
+) -> None:
+    words = load_words(asm_directory, program)
+    expected = run(HackSimulator(), words)
+
+    actual = HackSimulator.with_jit()
+    actual.load(words)
+    for start in range(0, CYCLES, 777):
+        actual.run(min(777, CYCLES - start))
+
+    assert machine_state(actual) == machine_state(expected)
@@ -0,0 +1,136 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.natives import SP
+from n2t.infra import JackPipeline
+
+_MAIN = """class Main {
+    function void main() {
+        var Array a;
+        var String s;
+        let a = 8000;
+        let a[0] = 123 * 45;
+        let a[1] = -77 * 311;
+        let a[2] = 30000 / 7;
+        let a[3] = -1000 / 33;
+        let s = String.new(3);
+        do s.appendChar(72);
+        do s.appendChar(105);
+        let a[4] = s.charAt(1) + s.length();
+        let a[5] = Memory.alloc(3);
+        return;
+    }
+}
+"""
+
+_CYCLES = 5_000_000
+
+_STACK_END = 2048
+
+
+def run_main(
+    directory: Path, os_directory: Path, jit: bool, native: bool
+) -> HackSimulator:
+    pipeline = JackPipeline.load_from(
+        str(directory), _CYCLES, str(os_directory), jit=jit, native=native
+    )
+    return pipeline.run()
+
+
+def outside_stack_scratch(simulator: HackSimulator) -> Dict[int, int]:
+    stack_pointer = simulator.ram[SP]
+    return {
+        address: value
+        for address, value in simulator.ram_state_payroll().items()
+        if not stack_pointer <= address < _STACK_END
+    }
+
+
+def copy_os(os_directory: Path, destination: Path) -> Path:
+    destination.mkdir()
+    for source in os_directory.glob("*.jack"):
+        destination.joinpath(source.name).write_bytes(source.read_bytes())
+    return destination
+
+
+def patch(path: Path, old: bytes, new: bytes) -> None:
+    source = path.read_bytes()
+    assert old in source
+    path.write_bytes(source.replace(old, new))
+
+
+@pytest.mark.parametrize("jit", [False, True])
+def test_should_match_simulated_os(
+    jit: bool, os_directory: Path, tmp_path: Path
+) -> None:
+    tmp_path.joinpath("Main.jack").write_text(_MAIN)
+
+    simulated = run_main(tmp_path, os_directory, jit, native=False)
+    native = run_main(tmp_path, os_directory, jit, native=True)
+
+    assert native.natives is not None
+    assert native.natives.names == [
+        "Math.multiply",
+        "Math.divide",
+        "Memory.alloc",
+        "String.appendChar",
+    ]
+    assert simulated.halted_at is not None and native.halted_at is not None
+    assert native.halted_at < simulated.halted_at
+    assert native.ram_state_payroll(8000, 8005) == {
+        8000: 5535,
+        8001: -23947,
+        8002: 4285,
+        8003: -30,
+        8004: 107,
+    }
+    assert native.ram[SP] == simulated.ram[SP]
+    assert outside_stack_scratch(native) == outside_stack_scratch(simulated)
+
+
+@pytest.mark.parametrize(
+    "source, old, new, enabled",
+    [
+        (
+            "Math.jack",
+            b"let res = res + x;",
+            b"let res = x + res;",
+            ["Memory.alloc", "String.appendChar"],
+        ),
+        (
+            "Math.jack",
+            b"return q + q + 1;",
+            b"return q + q + 2;",
+            ["Math.multiply", "Memory.alloc", "String.appendChar"],
+        ),
+        (
+            "Memory.jack",
+            b"function void deAlloc(Array o) {",
+            b"function void deAlloc(Array o) {\r\n        var int unused;",
+            ["Math.multiply", "Math.divide", "String.appendChar"],
+        ),
+    ],
+)
+def test_should_disable_natives_for_changed_os(
+    source: str,
+    old: bytes,
+    new: bytes,
+    enabled: List[str],
+    os_directory: Path,
+    tmp_path: Path,
+) -> None:
+    os_copy = copy_os(os_directory, tmp_path.joinpath("os"))
+    patch(os_copy.joinpath(source), old, new)
+    program = tmp_path.joinpath("program")
+    program.mkdir()
+    program.joinpath("Main.jack").write_text(_MAIN)
+
+    simulated = run_main(program, os_copy, jit=False, native=False)
+    native = run_main(program, os_copy, jit=False, native=True)
+
+    assert native.natives is not None
+    assert native.natives.names == enabled
+    assert outside_stack_scratch(native) == outside_stack_scratch(simulated)
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_with_symbols, file_to_iterable
+from n2t.core.decoder import A_INSTRUCTION, decode_program
+from n2t.core.profiler import LabelMap, collapsed_stacks, cycles_per_label
+from tests.e2e.programs import TEST_PROGRAMS, load_words, machine_state, run
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_match_interpreter_while_profiling(
+    program: str, asm_directory: Path
+) -> None:
+    words = load_words(asm_directory, program)
+
+    expected = run(HackSimulator(), words)
+    actual = run(HackSimulator.with_profile(), words)
+
+    assert machine_state(actual) == machine_state(expected)
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_count_every_cycle_and_branch(
+    program: str, asm_directory: Path
+) -> None:
+    words = load_words(asm_directory, program)
+
+    simulator = run(HackSimulator.with_profile(), words)
+    profile = simulator.profile
+
+    assert profile is not None
+    assert sum(profile.executions) == simulator.cycle
+    for address, (kind, _, _, jump) in enumerate(decode_program(words)):
+        branches = profile.taken[address] + profile.not_taken[address]
+        if kind == A_INSTRUCTION or not jump:
+            assert branches == 0
+        else:
+            assert branches == profile.executions[address]
+
+
+def test_should_attribute_cycles_to_labels(asm_directory: Path) -> None:
+    assembly = file_to_iterable(str(asm_directory.joinpath("max.asm")))
+    words, symbols = assemble_with_symbols(assembly)
+    simulator = HackSimulator.with_profile()
+    simulator.load(words)
+    simulator.ram[0], simulator.ram[1] = 9, 4
+    simulator.run(100)
+    assert simulator.profile is not None
+
+    labels = LabelMap.from_labels(symbols)
+    totals = cycles_per_label(simulator.profile, labels)
+
+    assert totals == {
+        "<rom>": 6,
+        "OUTPUT_FIRST": 2,
+        "OUTPUT_D": 2,
+        "INFINITE_LOOP": 2,
+    }
+    assert simulator.halted_at == sum(totals.values())
+    assert list(collapsed_stacks(simulator.profile, labels)) == [
+        "<rom>;<rom> 6",
+        "INFINITE_LOOP;INFINITE_LOOP 2",
+        "OUTPUT_D;OUTPUT_D 2",
+        "OUTPUT_FIRST;OUTPUT_FIRST 2",
+    ]
@@ -0,0 +1,79 @@
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.trace import TraceWriter, read_trace
+from tests.e2e.programs import TEST_PROGRAMS, load_words, machine_state, run
+
+
+def traced(
+    path: Path, sample: int = 1, start: int = 0, stop: Optional[int] = None
+) -> HackSimulator:
+    return HackSimulator(
+        tracer=TraceWriter.open(str(path), sample, start, stop)
+    )
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_match_interpreter_while_tracing(
+    program: str, asm_directory: Path, tmp_path: Path
+) -> None:
+    words = load_words(asm_directory, program)
+
+    expected = run(HackSimulator(), words)
+    actual = run(traced(tmp_path.joinpath("run.trace")), words)
+
+    assert machine_state(actual) == machine_state(expected)
+
+
+@pytest.mark.parametrize("program", TEST_PROGRAMS)
+def test_should_trace_every_cycle(
+    program: str, asm_directory: Path, tmp_path: Path
+) -> None:
+    trace_file = tmp_path.joinpath("run.trace")
+    words = load_words(asm_directory, program)
+
+    simulator = run(traced(trace_file), words)
+    records = list(read_trace(str(trace_file)))
+
+    assert len(records) == simulator.cycle
+    assert [record.cycle for record in records] == list(range(len(records)))
+
+
+@pytest.mark.parametrize("start, stop", [(0, None), (5, 40), (1000, None)])
+def test_should_not_exceed_cycle_budget(
+    start: int, stop: Optional[int], asm_directory: Path, tmp_path: Path
+) -> None:
+    trace_file = tmp_path.joinpath("run.trace")
+    simulator = traced(trace_file, start=start, stop=stop)
+    simulator.load(load_words(asm_directory, "rect"))
+    simulator.ram[0] = 50
+
+    for _ in range(30):
+        assert simulator.run(10) <= 10
+    assert simulator.tracer is not None
+    simulator.tracer.close()
+
+    assert simulator.cycle == 300
+    assert [record.cycle for record in read_trace(str(trace_file))] == list(
+        range(start, min(stop or 300, 300))
+    )
+
+
+def test_should_sample_within_window(
+    asm_directory: Path, tmp_path: Path
+) -> None:
+    trace_file = tmp_path.joinpath("run.trace")
+    simulator = traced(trace_file, 4, 10, 50)
+    simulator.load(load_words(asm_directory, "rect"))
+    simulator.ram[0] = 50
+
+    simulator.run(300)
+    assert simulator.tracer is not None
+    simulator.tracer.close()
+
+    assert [record.cycle for record in read_trace(str(trace_file))] == list(
+        range(10, 50, 4)
+    )
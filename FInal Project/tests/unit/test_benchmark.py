@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from n2t.core.assembler import assemble_words
+from n2t.infra.benchmark import Measurement, compare, simulate_benchmarks
+
+_HALTING = "@7\nD=A\n@0\nM=D\n(END)\n@END\n0;JMP"
+
+
+def test_should_simulate_full_budget_of_halting_program() -> None:
+    words = list(assemble_words(_HALTING.splitlines()))
+
+    results = simulate_benchmarks("halting", words, cycles=5000, repeat=1)
+
+    assert [result.key for result in results] == [
+        "simulate/halting",
+        "simulate_jit/halting",
+    ]
+    assert [result.units for result in results] == [5000, 5000]
+
+
+def test_should_flag_regressions_past_threshold() -> None:
+    baseline = {
+        "simulate/a": Measurement("simulate", "a", "cycles", 1000, 1.0),
+        "simulate_jit/a": Measurement(
+            "simulate_jit", "a", "cycles", 1000, 1.0
+        ),
+    }
+    current = {
+        "simulate/a": Measurement("simulate", "a", "cycles", 1000, 1.05),
+        "simulate_jit/a": Measurement(
+            "simulate_jit", "a", "cycles", 1000, 2.0
+        ),
+    }
+
+    report, regressions = compare(baseline, current, threshold=0.1)
+
+    assert len(report) == 2
+    assert len(regressions) == 1
+    assert regressions[0].startswith("simulate_jit/a")
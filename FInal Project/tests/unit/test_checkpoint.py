@@ -0,0 +1,125 @@
+import struct
+from array import array
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_words
+from n2t.core.checkpoint import HEADER, MAGIC, VERSION, Checkpoint
+from n2t.core.profiler import Profile
+
+_COUNTER = (
+    "@10\nD=A\n@0\nM=D\n"
+    "(LOOP)\n@1\nM=M+1\n@0\nM=M-1\nD=M\n@LOOP\nD;JGT\n"
+)
+_HALTING = _COUNTER + "(END)\n@END\n0;JMP"
+
+
+def assemble(assembly: str) -> List[int]:
+    return list(assemble_words(assembly.splitlines()))
+
+
+def loaded(assembly: str) -> HackSimulator:
+    simulator = HackSimulator()
+    simulator.load(assemble(assembly))
+    return simulator
+
+
+def test_should_round_trip_bytes() -> None:
+    checkpoint = Checkpoint(
+        pc=7,
+        address_reg=-3,
+        data_reg=32767,
+        cycle=2**40,
+        program_hash="ab" * 32,
+        ram=array("h", [0, -1, 5, -32768]),
+        written=[1, 3],
+    )
+
+    data = checkpoint.to_bytes()
+
+    assert data[:4] == MAGIC
+    assert struct.unpack_from("<H", data, 4) == (VERSION,)
+    assert HEADER.unpack_from(data)[-1] == 2
+    assert Checkpoint.from_bytes(data) == checkpoint
+
+
+def test_should_save_and_load(tmp_path: Path) -> None:
+    simulator = loaded(_COUNTER)
+    simulator.run(25)
+    path = str(tmp_path.joinpath("run.ckpt"))
+
+    simulator.checkpoint().save(path)
+
+    assert Checkpoint.load(path) == simulator.checkpoint()
+
+
+@pytest.mark.parametrize("offset, value", [(0, b"XXXX"), (4, b"\x02\x00")])
+def test_should_reject_foreign_data(offset: int, value: bytes) -> None:
+    data = bytearray(loaded(_COUNTER).checkpoint().to_bytes())
+    data[offset: offset + len(value)] = value
+
+    with pytest.raises(AssertionError):
+        Checkpoint.from_bytes(bytes(data))
+
+
+def test_should_resume_where_checkpoint_was_taken() -> None:
+    expected = loaded(_COUNTER)
+    expected.run(60)
+    simulator = loaded(_COUNTER)
+    simulator.run(25)
+    checkpoint = Checkpoint.from_bytes(simulator.checkpoint().to_bytes())
+
+    resumed = loaded(_COUNTER)
+    resumed.restore(checkpoint)
+    resumed.run(35)
+
+    assert resumed.checkpoint() == expected.checkpoint()
+
+
+def test_should_clear_halt_state_on_restore() -> None:
+    simulator = loaded(_HALTING)
+    checkpoint = simulator.checkpoint()
+    simulator.run(1000)
+    assert simulator.halted_at is not None
+
+    simulator.restore(checkpoint)
+
+    assert simulator.halted_at is None
+    assert simulator.idle_visits == {}
+    assert simulator.run(10) == 10
+    assert simulator.ram[1] == 1
+
+
+def test_should_reject_checkpoint_of_other_program() -> None:
+    checkpoint = loaded(_COUNTER).checkpoint()
+
+    with pytest.raises(AssertionError):
+        loaded("@1\nD=A").restore(checkpoint)
+
+
+def test_should_fork_independent_state() -> None:
+    parent = loaded(_COUNTER)
+    parent.profile = Profile.create(len(parent.program))
+    parent.run(10)
+    parent.add_breakpoint(4)
+    parent.add_watchpoint(0)
+
+    child = parent.fork()
+    child.add_breakpoint(5)
+    child.add_watchpoint(1)
+    child.ram[1] = 99
+    assert child.profile is not None
+    child.profile.executions[0] += 1
+    child.idle_visits[4] = 1
+    child.run(3)
+
+    assert parent.breakpoints == {4}
+    assert parent.watchpoints == {0}
+    assert parent.ram[1] == 1
+    assert parent.profile is not None
+    assert sum(parent.profile.executions) == parent.cycle == 10
+    assert parent.idle_visits == {}
+    assert child.tracer is None
@@ -0,0 +1,90 @@
+from typing import List
+
+import pytest
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_words
+from n2t.core.decoder import (
+    decode_program,
+    find_halt_loops,
+    find_idle_loops,
+    reaches_fixed_point,
+)
+
+
+def assemble(assembly: str) -> List[int]:
+    return list(assemble_words(assembly.splitlines()))
+
+
+def test_should_find_jumps_to_themselves() -> None:
+    program = decode_program(assemble("@1\nD=A\n(END)\n@END\n0;JMP"))
+
+    assert find_halt_loops(program) == {3: 2}
+    assert find_idle_loops(program) == {}
+
+
+def test_should_find_backward_jumps() -> None:
+    program = decode_program(assemble("(LOOP)\n@5\nM=0\n@LOOP\n0;JMP"))
+
+    assert find_idle_loops(program) == {3: 0}
+
+
+def test_should_accept_loop_without_net_change() -> None:
+    program = decode_program(
+        assemble("(LOOP)\n@5\nM=M+1\nM=M-1\n@LOOP\n0;JMP")
+    )
+    ram = [0] * 8
+
+    assert reaches_fixed_point(program, 0, 0, 0, ram, {5: True})
+    assert ram == [0] * 8
+
+
+def test_should_reject_loop_that_changes_memory() -> None:
+    program = decode_program(assemble("(LOOP)\n@5\nM=M+1\n@LOOP\n0;JMP"))
+
+    assert not reaches_fixed_point(program, 0, 0, 0, [0] * 8, {5: True})
+
+
+def test_should_reject_loop_that_writes_unwritten_memory() -> None:
+    program = decode_program(assemble("(LOOP)\n@5\nM=0\n@LOOP\n0;JMP"))
+
+    assert not reaches_fixed_point(program, 0, 0, 0, [0] * 8, {})
+
+
+def test_should_reject_loop_that_reads_keyboard() -> None:
+    program = decode_program(assemble("(LOOP)\n@KBD\nD=M\n@LOOP\n0;JMP"))
+
+    assert not reaches_fixed_point(program, 0, 0, 0, [0] * 32768, {})
+
+
+def test_should_halt_on_stack_loop() -> None:
+    simulator = HackSimulator()
+    simulator.load(
+        assemble(
+            "@256\nD=A\n@SP\nM=D\n"
+            "(LOOP)\n@SP\nM=M+1\nA=M-1\nM=-1\n"
+            "@SP\nAM=M-1\nD=M\n@LOOP\nD;JNE"
+        )
+    )
+
+    executed = simulator.run(1000)
+
+    assert simulator.halted_at == executed
+    assert executed < 100
+    assert simulator.pc == 4
+
+
+@pytest.mark.parametrize("jit", [False, True])
+def test_should_keep_writes_made_before_halting(jit: bool) -> None:
+    simulator = HackSimulator.with_jit() if jit else HackSimulator()
+    simulator.load(
+        assemble(
+            "@1\nD=A\n(LOOP)\n@ZERO\nD;JEQ\nD=0\n@LOOP\n0;JMP\n"
+            "(ZERO)\n@100\nM=0\n@LOOP\n0;JMP"
+        )
+    )
+
+    simulator.run(1000)
+
+    assert simulator.halted_at is not None
+    assert simulator.ram_state_payroll() == {100: 0}
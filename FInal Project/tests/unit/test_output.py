@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from n2t.infra.output import OutputFormat
+
+_WRITTEN = {0: 256, 100: -1}
+_RAM = [256, 0, 7, -1] + [0] * 96 + [-1]
+
+
+@pytest.mark.parametrize(
+    "output_format, extension",
+    [
+        (OutputFormat.pretty, "json"),
+        (OutputFormat.compact, "json"),
+        (OutputFormat.ndjson, "ndjson"),
+        (OutputFormat.binary, "bin"),
+        (OutputFormat.none, "json"),
+    ],
+)
+def test_should_name_extension(
+    output_format: OutputFormat, extension: str
+) -> None:
+    assert output_format.extension == extension
+
+
+def test_should_save_pretty_json(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+
+    OutputFormat.pretty.save(str(path), _WRITTEN, _RAM)
+
+    assert path.read_text() == json.dumps({"RAM": _WRITTEN}, indent=2)
+    assert json.loads(path.read_text()) == {"RAM": {"0": 256, "100": -1}}
+
+
+def test_should_save_compact_json(tmp_path: Path) -> None:
+    path = tmp_path / "out.json"
+
+    OutputFormat.compact.save(str(path), _WRITTEN, _RAM)
+
+    assert path.read_text() == '{"RAM":{"0":256,"100":-1}}'
+
+
+def test_should_save_ndjson(tmp_path: Path) -> None:
+    path = tmp_path / "out.ndjson"
+
+    OutputFormat.ndjson.save(str(path), _WRITTEN, _RAM)
+
+    assert path.read_text().splitlines() == [
+        '{"address": 0, "value": 256}',
+        '{"address": 100, "value": -1}',
+    ]
+
+
+def test_should_save_binary_words(tmp_path: Path) -> None:
+    path = tmp_path / "out.bin"
+
+    OutputFormat.binary.save(str(path), _WRITTEN, _RAM, 1, 4)
+
+    assert path.read_bytes() == b"\x00\x00\x07\x00\xff\xff"
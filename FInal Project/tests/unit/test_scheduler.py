@@ -0,0 +1,92 @@
+from typing import List
+
+from n2t.core import HackSimulator
+from n2t.core.assembler import assemble_words
+from n2t.core.scheduler import MachineState, Scheduler, SchedulingPolicy
+
+_COUNTER = "(LOOP)\n@0\nM=M+1\n@LOOP\n0;JMP"
+_HALTING = "@7\nD=A\n@0\nM=D\n(END)\n@END\n0;JMP"
+
+
+def simulator(assembly: str = _COUNTER) -> HackSimulator:
+    simulator = HackSimulator()
+    simulator.load(list(assemble_words(assembly.splitlines())))
+    return simulator
+
+
+def order(scheduler: Scheduler) -> List[str]:
+    return [machine.name for machine in scheduler.run()]
+
+
+def test_should_take_turns_in_round_robin() -> None:
+    scheduler = Scheduler(quantum=4)
+    scheduler.add("a", simulator(), 8)
+    scheduler.add("b", simulator(), 12, priority=5)
+
+    assert order(scheduler) == ["a", "b", "a", "b", "b"]
+    assert scheduler.machines["a"].state is MachineState.finished
+    assert scheduler.machines["b"].quanta == 3
+    assert scheduler.machines["b"].simulator.ram[0] == 3
+    assert scheduler.pending() == []
+
+
+def test_should_run_highest_priority_first() -> None:
+    scheduler = Scheduler(quantum=4, policy=SchedulingPolicy.priority)
+    scheduler.add("low", simulator(), 8, priority=1)
+    scheduler.add("high", simulator(), 8, priority=3)
+    scheduler.add("also_low", simulator(), 4, priority=1)
+
+    assert order(scheduler) == ["high", "high", "low", "also_low", "low"]
+
+
+def test_should_mark_halted_machine() -> None:
+    scheduler = Scheduler(quantum=4)
+    machine = scheduler.add("halting", simulator(_HALTING), 1000)
+
+    assert order(scheduler) == ["halting", "halting"]
+    assert machine.state is MachineState.halted
+    assert machine.simulator.ram[0] == 7
+
+
+def test_should_skip_paused_machine_until_resumed() -> None:
+    scheduler = Scheduler(quantum=4)
+    scheduler.add("a", simulator(), 8)
+    scheduler.add("b", simulator(), 4)
+
+    scheduler.pause("a")
+    scheduler.pause("a")
+
+    assert scheduler.machines["a"].state is MachineState.paused
+    assert order(scheduler) == ["b"]
+    assert [machine.name for machine in scheduler.pending()] == ["a"]
+
+    scheduler.resume("a")
+    scheduler.resume("a")
+
+    assert order(scheduler) == ["a", "a"]
+    assert scheduler.machines["a"].simulator.ram[0] == 2
+
+
+def test_should_not_run_cancelled_machine() -> None:
+    scheduler = Scheduler(quantum=4)
+    scheduler.add("a", simulator(), 8)
+    scheduler.add("b", simulator(), 8)
+
+    scheduler.step()
+    scheduler.cancel("b")
+    scheduler.resume("b")
+
+    assert order(scheduler) == ["a"]
+    assert scheduler.machines["b"].state is MachineState.cancelled
+    assert scheduler.machines["b"].simulator.cycle == 0
+
+
+def test_should_keep_finished_machine_finished() -> None:
+    scheduler = Scheduler(quantum=4)
+    machine = scheduler.add("a", simulator(), 4)
+
+    order(scheduler)
+    scheduler.cancel("a")
+    scheduler.pause("a")
+
+    assert machine.state is MachineState.finished
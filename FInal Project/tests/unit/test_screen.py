@@ -0,0 +1,105 @@
+import struct
+import zlib
+from pathlib import Path
+
+from n2t.core.screen import (
+    HEIGHT,
+    KBD,
+    ROW_BYTES,
+    SCREEN,
+    WIDTH,
+    FrameCapture,
+    FrameFormat,
+    KeyboardScript,
+    screen_bytes,
+)
+
+_FRAME_BYTES = ROW_BYTES * HEIGHT
+
+
+def frame_with_leftmost_pixel() -> bytes:
+    ram = [0] * (KBD + 1)
+    ram[SCREEN] = 1
+    return screen_bytes(ram)
+
+
+def test_should_encode_pbm_frame() -> None:
+    encoded = FrameFormat.pbm.encode(frame_with_leftmost_pixel())
+
+    header = f"P4\n{WIDTH} {HEIGHT}\n".encode()
+    assert encoded.startswith(header)
+    pixels = encoded[len(header):]
+    assert len(pixels) == _FRAME_BYTES
+    assert pixels[0] == 0x80
+    assert pixels[1:] == bytes(_FRAME_BYTES - 1)
+
+
+def test_should_encode_png_frame() -> None:
+    encoded = FrameFormat.png.encode(frame_with_leftmost_pixel())
+
+    assert encoded[:8] == b"\x89PNG\r\n\x1a\n"
+    (length,) = struct.unpack(">I", encoded[8:12])
+    assert encoded[12:16] == b"IHDR"
+    assert struct.unpack(">IIBBBBB", encoded[16:16 + length]) == (
+        WIDTH,
+        HEIGHT,
+        1,
+        0,
+        0,
+        0,
+        0,
+    )
+    start = 16 + length + 4
+    (length,) = struct.unpack(">I", encoded[start:start + 4])
+    assert encoded[start + 4:start + 8] == b"IDAT"
+    rows = zlib.decompress(encoded[start + 8:start + 8 + length])
+    assert len(rows) == (ROW_BYTES + 1) * HEIGHT
+    assert rows[:2] == b"\x00\x7f"
+    assert rows[2:ROW_BYTES + 1] == b"\xff" * (ROW_BYTES - 1)
+    assert encoded.endswith(b"IEND\xaeB`\x82")
+
+
+def test_should_capture_only_changed_frames(tmp_path: Path) -> None:
+    capture = FrameCapture.create(str(tmp_path / "frames"))
+    ram = [0] * (KBD + 1)
+
+    first = capture.capture(ram, 1)
+    ram[SCREEN] = 1
+    second = capture.capture(ram, 2)
+    third = capture.capture(ram, 3)
+
+    assert first is None
+    assert second == tmp_path / "frames" / "frame_000000000002.pbm"
+    assert third is None
+    assert capture.frames == 1
+    assert second.read_bytes() == FrameFormat.pbm.encode(screen_bytes(ram))
+
+
+def test_should_press_keys_from_script() -> None:
+    script = KeyboardScript.from_events([(30, "left"), (10, "a"), (20, 0)])
+    ram = [0] * (KBD + 1)
+
+    assert script.cycles == [10, 20, 30]
+    assert script.keys == [ord("a"), 0, 130]
+    assert [script.key_at(cycle) for cycle in (0, 10, 19, 20, 35)] == [
+        0,
+        ord("a"),
+        ord("a"),
+        0,
+        130,
+    ]
+    assert script.next_event(0) == 10
+    assert script.next_event(10) == 20
+    assert script.next_event(30) is None
+    script.apply(ram, 15)
+    assert ram[KBD] == ord("a")
+
+
+def test_should_load_script_from_file(tmp_path: Path) -> None:
+    path = tmp_path / "keys.json"
+    path.write_text('[[5, "F1"], [1, 75]]')
+
+    script = KeyboardScript.load(str(path))
+
+    assert script.cycles == [1, 5]
+    assert script.keys == [75, 141]
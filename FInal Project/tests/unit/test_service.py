@@ -0,0 +1,227 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List, cast
+
+import pytest
+
+from n2t.core.memory import SIZE
+from n2t.runner.service import (
+    CANCELLED,
+    DONE,
+    HALTED,
+    TIMEOUT,
+    CachedProgram,
+    ProgramCache,
+    ServiceError,
+    SimulationJob,
+    SimulationService,
+    integer_field,
+    ram_field,
+    seconds_field,
+)
+
+_COUNTER = "(LOOP)\n@0\nM=M+1\n@LOOP\n0;JMP"
+_HALTING = "@7\nD=A\n@0\nM=D\n(END)\n@END\n0;JMP"
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        self.lines: List[Dict[str, Any]] = []
+        self.buffer = b""
+
+    def write(self, data: bytes) -> None:
+        self.buffer += data
+        if self.buffer.endswith(b"\n"):
+            self.lines.append(json.loads(self.buffer))
+            self.buffer = b""
+
+    async def drain(self) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def service() -> Iterator[SimulationService]:
+    service = SimulationService.create(
+        workers=1, pending=0, max_cycles=1000, max_seconds=5.0
+    )
+    yield service
+    service.close()
+
+
+def respond(service: SimulationService, line: bytes) -> Dict[str, Any]:
+    writer = RecordingWriter()
+
+    async def send() -> None:
+        await service.respond(
+            line, cast(asyncio.StreamWriter, writer), asyncio.Lock()
+        )
+
+    asyncio.run(send())
+    assert len(writer.lines) == 1
+    return writer.lines[0]
+
+
+@pytest.mark.parametrize("value", [-1, 11, 2.0, True, "3", None])
+def test_should_reject_integer_outside_limits(value: Any) -> None:
+    with pytest.raises(ServiceError, match=r"cycles must be .* \[0, 10\]"):
+        integer_field({"cycles": value}, "cycles", 5, 0, 10)
+
+
+def test_should_accept_integer_within_limits() -> None:
+    assert integer_field({}, "cycles", 5, 0, 10) == 5
+    assert integer_field({"cycles": 10}, "cycles", 5, 0, 10) == 10
+
+
+@pytest.mark.parametrize("value", [0, -1.5, "1", False])
+def test_should_reject_non_positive_seconds(value: Any) -> None:
+    with pytest.raises(ServiceError, match="seconds must be"):
+        seconds_field({"seconds": value}, 1.0)
+
+
+def test_should_accept_positive_seconds() -> None:
+    assert seconds_field({}, 2.5) == 2.5
+    assert seconds_field({"seconds": 3}, 2.5) == 3.0
+
+
+@pytest.mark.parametrize(
+    "ram, message",
+    [
+        ([1], "ram must be an object"),
+        ({"-1": 0}, "RAM address -1 is outside"),
+        ({str(SIZE): 0}, f"RAM address {SIZE} is outside"),
+        ({"5": 32768}, r"RAM\[5\] must be a 16-bit"),
+        ({"5": -32769}, r"RAM\[5\] must be a 16-bit"),
+        ({"5": True}, r"RAM\[5\] must be a 16-bit"),
+    ],
+)
+def test_should_reject_invalid_ram(ram: Any, message: str) -> None:
+    with pytest.raises(ServiceError, match=message):
+        ram_field({"ram": ram})
+
+
+def test_should_accept_ram_words() -> None:
+    assert ram_field({"ram": {"0": -32768, "16": 32767}}) == {
+        0: -32768,
+        16: 32767,
+    }
+
+
+def test_should_evict_least_recently_used_program() -> None:
+    cache = ProgramCache(2)
+    programs = [
+        CachedProgram.build(str(key), _COUNTER, "asm") for key in range(3)
+    ]
+
+    cache.put(programs[0])
+    cache.put(programs[1])
+    cache.get("0")
+    cache.put(programs[2])
+
+    assert list(cache.entries) == ["0", "2"]
+    assert cache.get("1") is None
+    assert cache.stats() == {"size": 2, "capacity": 2, "hits": 1, "misses": 1}
+
+
+def test_should_stop_job_at_cycle_budget() -> None:
+    job = SimulationJob(CachedProgram.build("k", _COUNTER, "asm"), 40, 5.0)
+
+    result = job.run()
+
+    assert result["status"] == DONE
+    assert result["cycles"] == 40
+    assert result["RAM"] == {0: 10}
+
+
+def test_should_report_halted_job() -> None:
+    job = SimulationJob(CachedProgram.build("k", _HALTING, "asm"), 1000, 5.0)
+
+    result = job.run()
+
+    assert result["status"] == HALTED
+    assert result["halted"] == result["cycles"]
+    assert result["RAM"] == {0: 7}
+
+
+def test_should_stop_cancelled_and_timed_out_jobs() -> None:
+    program = CachedProgram.build("k", _COUNTER, "asm")
+    cancelled = SimulationJob(program, 1000, 5.0)
+    cancelled.cancelled.set()
+    timed_out = SimulationJob(program, 1000, 1e-9)
+
+    assert cancelled.run()["status"] == CANCELLED
+    assert timed_out.run()["status"] == TIMEOUT
+    assert timed_out.cancelled.is_set() is False
+
+
+def test_should_seed_ram_and_keep_ram_window_of_job() -> None:
+    program = CachedProgram.build("k", _COUNTER, "asm")
+    inside = SimulationJob(program, 4, 5.0, {0: 5}, ram_start=0, ram_stop=1)
+    outside = SimulationJob(program, 4, 5.0, {0: 5}, ram_start=1)
+
+    assert inside.run()["RAM"] == {0: 6}
+    assert outside.run()["RAM"] == {}
+
+
+def test_should_simulate_request(service: SimulationService) -> None:
+    response = respond(
+        service,
+        json.dumps(
+            {"id": 1, "op": "simulate", "source": _COUNTER, "cycles": 40}
+        ).encode(),
+    )
+
+    assert response["ok"] is True
+    assert response["id"] == 1
+    assert response["status"] == DONE
+    assert response["RAM"] == {"0": 10}
+
+
+@pytest.mark.parametrize(
+    "request_line, error",
+    [
+        (b"{", "Expecting property name"),
+        (b"[]", "Request must be a JSON object"),
+        (b'{"op": "run"}', "Unknown operation run"),
+        (b'{"op": "assemble", "format": "vm"}', "Unknown program format vm"),
+        (b'{"op": "assemble", "key": "x"}', "Program is not cached"),
+        (b'{"op": "assemble", "source": 1}', "source must be a string"),
+        (b'{"op": "simulate", "cycles": 1001}', r"cycles must be"),
+        (
+            b'{"op": "simulate", "cycles": 1, "seconds": -1}',
+            "seconds must be",
+        ),
+        (
+            b'{"op": "simulate", "cycles": 1, "ram_start": 9, "ram_stop": 8}',
+            "ram_stop must be",
+        ),
+    ],
+)
+def test_should_reply_with_error(
+    service: SimulationService, request_line: bytes, error: str
+) -> None:
+    response = respond(service, request_line)
+
+    assert response["ok"] is False
+    assert error in response["error"]
+
+
+def test_should_reject_request_when_busy(service: SimulationService) -> None:
+    async def simulate_while_busy() -> None:
+        async with service.slots:
+            with pytest.raises(ServiceError, match="Service is busy"):
+                await service.simulate({"source": _COUNTER})
+
+    asyncio.run(simulate_while_busy())
+
+
+def test_should_cancel_only_running_jobs(service: SimulationService) -> None:
+    job = SimulationJob(CachedProgram.build("k", _COUNTER, "asm"), 10, 5.0)
+    service.jobs["running"] = job
+
+    try:
+        assert service.cancel({"job": "running"}) == {"cancelled": True}
+        assert service.cancel({"job": "missing"}) == {"cancelled": False}
+    finally:
+        del service.jobs["running"]
+
+    assert job.cancelled.is_set()
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Tuple
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from n2t.core.source_map import SourceLocation, SourceMap
 
 COMMON_SYMBOLS = {
     "R0": 0,
@@ -21,7 +25,7 @@ COMMON_SYMBOLS = {
     "R14": 14,
     "R15": 15,
     "SCREEN": 16384,
-    "KBD": 24567,
+    "KBD": 24576,
     "SP": 0,
     "LCL": 1,
     "ARG": 2,
@@ -39,7 +43,7 @@ COMP_TO_BINARY = {
     "!D": "001101",
     "!A": "110001",
     "!M": "110001",
-    "-D": "0011111",
+    "-D": "001111",
     "-A": "110011",
     "-M": "110011",
     "D+1": "011111",
@@ -50,14 +54,20 @@ COMP_TO_BINARY = {
     "M-1": "110010",
     "D+A": "000010",
     "D+M": "000010",
+    "A+D": "000010",
+    "M+D": "000010",
     "D-A": "010011",
     "D-M": "010011",
     "A-D": "000111",
     "M-D": "000111",
     "D&A": "000000",
     "D&M": "000000",
+    "A&D": "000000",
+    "M&D": "000000",
     "D|A": "010101",
     "D|M": "010101",
+    "A|D": "010101",
+    "M|D": "010101",
 }
 
 DEST_TO_BINARY = {
@@ -81,6 +91,9 @@ JUMP_TO_BINARY = {
 }
 
 VAR_START_INDEX = 16
+FIXUP_END = 0xFFFF
+C_INSTRUCTION_PREFIX = 0b111 << 13
+A_BIT = 1 << 12
 
 
 def clean_comments(assembly: Iterable[str]) -> Iterable[str]:
@@ -97,75 +110,95 @@ def clean_assembly(assembly: Iterable[str]) -> Iterable[str]:
     return assembly
 
 
-def process_labels(assembly: Iterable[str], symbols: Dict[str, Any]) -> Iterable[str]:
-    label_count = 0
-    assembly_without_labels = []
-
-    for idx, command in enumerate(assembly):
-        if command[0] == "(" and command[-1] == ")":
-            label = command[1:-1]
-            symbols[label] = idx - label_count
-            label_count += 1
-        else:
-            assembly_without_labels.append(command)
-
-    return assembly_without_labels
-
-
-def get_symbols(assembly: Iterable[str]) -> Tuple[Iterable[str], Dict[str, Any]]:
-    symbols = COMMON_SYMBOLS.copy()
-    assembly = process_labels(assembly, symbols)
-    return assembly, symbols
-
-
-def process_a_instruction(
-    command: str, var_index: int, symbols: Dict[str, Any]
-) -> Tuple[str, int]:
-    if command in symbols:
-        val = symbols[command]
-    elif command.isdigit():
-        val = int(command)
-    else:
-        val = var_index
-        symbols[command] = val
-        var_index += 1
-
-    return "{0:016b}".format(val), var_index
-
-
-def process_c_instruction(command: str) -> str:
+@lru_cache(maxsize=None)
+def c_instruction_word(command: str) -> int:
     dest_comp, jump = command.split(";") if ";" in command else (command, "")
     dest, comp = dest_comp.split("=") if "=" in dest_comp else ("", dest_comp)
 
-    dest_bits = DEST_TO_BINARY.get(dest, "000")
-    comp_bits = COMP_TO_BINARY.get(comp)
-    jump_bits = JUMP_TO_BINARY.get(jump, "000")
-
-    addr_bit = "1" if "M" in comp else "0"
-
-    binary_instruction = f"111{addr_bit}{comp_bits}{dest_bits}{jump_bits}"
-
-    return binary_instruction
-
-
-def command_to_binary(
-    command: str, var_index: int, symbols: Dict[str, str]
-) -> Tuple[str, int]:
-    if command[0] == "@":
-        return process_a_instruction(command[1:], var_index, symbols)
-    else:
-        return process_c_instruction(command), var_index
+    word = C_INSTRUCTION_PREFIX
+    word |= A_BIT if "M" in comp else 0
+    word |= int(COMP_TO_BINARY[comp], 2) << 6
+    word |= int(DEST_TO_BINARY.get(dest, "000"), 2) << 3
+    word |= int(JUMP_TO_BINARY.get(jump, "000"), 2)
+    return word
 
 
-def convert_to_binary(
-    assembly: Iterable[str], symbols: Dict[str, str]
-) -> Iterable[str]:
-    var_index = VAR_START_INDEX
-    result = []
-    for command in assembly:
-        binary, var_index = command_to_binary(command, var_index, symbols)
-        result.append(binary)
-    return result
+@dataclass
+class StreamingAssembler:
+    symbols: Dict[str, int] = field(default_factory=COMMON_SYMBOLS.copy)
+    labels: Dict[str, int] = field(default_factory=dict)
+    fixups: Dict[str, int] = field(default_factory=dict)
+    words: array[int] = field(default_factory=lambda: array("H"))
+    label: str = ""
+
+    def feed(self, command: str) -> None:
+        address = len(self.words)
+        if command[0] == "(" and command[-1] == ")":
+            label = command[1:-1]
+            self.symbols[label] = address
+            self.labels[label] = address
+            self.label = label
+            return
+
+        if command[0] != "@":
+            self.words.append(c_instruction_word(command))
+            return
+
+        value = command[1:]
+        if value in self.symbols:
+            self.words.append(self.symbols[value])
+        elif value.isdigit():
+            self.words.append(int(value))
+        else:
+            assert address < FIXUP_END, "Program is too large to backpatch"
+            self.words.append(self.fixups.get(value, FIXUP_END))
+            self.fixups[value] = address
+
+    def finish(self) -> array[int]:
+        var_index = VAR_START_INDEX
+        for name in self.fixups:
+            if name not in self.symbols:
+                self.symbols[name] = var_index
+                var_index += 1
+            self.patch(self.fixups[name], self.symbols[name])
+        self.fixups = {}
+        return self.words
+
+    def patch(self, position: int, value: int) -> None:
+        while position != FIXUP_END:
+            following = self.words[position]
+            self.words[position] = value
+            position = following
+
+
+def stream_assembly(
+    assembly: Iterable[str],
+    source_map: Optional[SourceMap] = None,
+    source: str = "",
+) -> StreamingAssembler:
+    assembler = StreamingAssembler()
+    if source_map is None:
+        for command in clean_assembly(assembly):
+            assembler.feed(command)
+        return assembler
+
+    for line, command in enumerate(clean_comments(assembly)):
+        command = command.replace(" ", "")
+        if not command:
+            continue
+        if command[0] != "(":
+            location = SourceLocation(source, line, assembler.label)
+            source_map.mark(len(assembler.words), location)
+        assembler.feed(command)
+    return assembler
+
+
+def assemble_words(assembly: Iterable[str]) -> array[int]:
+    return stream_assembly(assembly).finish()
+
+
+def format_words(words: Iterable[int]) -> Iterable[str]:
+    return (f"{word:016b}" for word in words)
 
 
 @dataclass
@@ -175,9 +208,14 @@ class Assembler:
         return cls()
 
     def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
-        assembly = clean_assembly(assembly)
-        assembly, symbols = get_symbols(assembly)
-        result = convert_to_binary(assembly, symbols)
-        for s in result:
-            print(s)
-        return result
+        return format_words(self.assemble_words(assembly))
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        return assemble_words(assembly)
+
+    def assemble_with_map(
+        self, assembly: Iterable[str], source: str
+    ) -> Tuple[array[int], SourceMap]:
+        source_map = SourceMap()
+        words = stream_assembly(assembly, source_map, source).finish()
+        return words, source_map
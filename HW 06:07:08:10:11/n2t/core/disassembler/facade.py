@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Dict, Iterable
 
 from n2t.core.disassembler.chain import (
     AddressingDisassembler,
@@ -10,7 +10,24 @@ from n2t.core.disassembler.chain import (
     DisassemblerChain,
     LengthValidator,
 )
-from n2t.core.disassembler.entities import Word
+from n2t.core.disassembler.entities import (
+    Address,
+    Computation,
+    Destination,
+    Jump,
+    Word,
+)
+
+COMMAND_PREFIX = 0b111 << 13
+
+
+def by_value(mapping: Dict[str, str]) -> Dict[int, str]:
+    return {int(bits, 2): assembly for bits, assembly in mapping.items()}
+
+
+DESTINATIONS = by_value(Destination.MAP)
+COMPUTATIONS = by_value(Computation.MAP)
+JUMPS = by_value(Jump.MAP)
 
 
 @dataclass
@@ -32,3 +49,19 @@ class Disassembler:
 
     def disassemble_one(self, word: str) -> str:
         return self.chain.disassemble(Word(word))
+
+    def disassemble_words(self, words: Iterable[int]) -> Iterable[str]:
+        for word in words:
+            yield self.disassemble_word(word)
+
+    def disassemble_word(self, word: int) -> str:
+        if 0 <= word < 1 << 15:
+            return f"{Address.SIGN}{word}"
+        if word >> 16 == 0 and word & COMMAND_PREFIX == COMMAND_PREFIX:
+            comp = (word >> 6) & 0b1111111
+            return (
+                DESTINATIONS[(word >> 3) & 0b111]
+                + COMPUTATIONS.get(comp, f"{comp:07b}")
+                + JUMPS[word & 0b111]
+            )
+        return self.disassemble_one(f"{word:016b}")
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Iterable, Iterator, Protocol
+from typing import Iterable, Iterator, Optional, Protocol, Tuple
 
 from n2t.core import Assembler as DefaultAssembler
-from n2t.infra.io import File, FileFormat
+from n2t.core.assembler.facade import format_words
+from n2t.core.source_map import SourceMap, source_map_path
+from n2t.infra.cache import BuildCache
+from n2t.infra.io import File, FileFormat, RomFile
 
 
 @dataclass
@@ -20,9 +25,40 @@ class AsmProgram:
     def __post_init__(self) -> None:
         FileFormat.asm.validate(self.path)
 
-    def assemble(self) -> None:
-        hack_file = File(FileFormat.hack.convert(self.path))
-        hack_file.save(self.assembler.assemble(self))
+    def assemble(
+        self,
+        binary: bool = False,
+        source_map: bool = False,
+        cache: Optional[BuildCache] = None,
+    ) -> bool:
+        if cache is None:
+            self.write(binary, source_map)
+            return False
+
+        output_path = self.output_path(binary)
+        outputs = [output_path]
+        if source_map:
+            outputs.append(source_map_path(output_path))
+        options = {"binary": binary, "source_map": source_map}
+        key = cache.key("assemble", [self.path], options)
+        return cache.build(key, outputs, partial(self.write, binary, source_map))
+
+    def output_path(self, binary: bool) -> Path:
+        output = FileFormat.rom if binary else FileFormat.hack
+        return output.convert(self.path)
+
+    def write(self, binary: bool, source_map: bool) -> None:
+        output_path = self.output_path(binary)
+        if source_map:
+            words, mapping = self.assembler.assemble_with_map(self, self.path.name)
+            mapping.save(source_map_path(output_path))
+        else:
+            words = self.assembler.assemble_words(self)
+
+        if binary:
+            RomFile(output_path).save_words(words)
+        else:
+            File(output_path).save(format_words(words))
 
     def __iter__(self) -> Iterator[str]:
         yield from File(self.path).load()
@@ -31,3 +67,11 @@ class AsmProgram:
 class Assembler(Protocol):  # pragma: no cover
     def assemble(self, assembly: Iterable[str]) -> Iterable[str]:
         pass
+
+    def assemble_words(self, assembly: Iterable[str]) -> array[int]:
+        pass
+
+    def assemble_with_map(
+        self, assembly: Iterable[str], source: str
+    ) -> Tuple[array[int], SourceMap]:
+        pass
@@ -36,47 +36,69 @@ class FunctionFormatter:
         ) + self.PUSH_SPACE_FOR_VARIABLE * int(self.command_args[2])
 
     def __format_call(self) -> str:
-        return (
-            self.PUSH_SPACE_FOR_RETURN.format(
-                function=self.command_args[1], label=self.command_index
-            )
-            + self.PUSH_SPACE_FOR_SEGMENT.format(arg=LOCAL_REG)
-            + self.PUSH_SPACE_FOR_SEGMENT.format(arg=ARGUMENT_REG)
-            + self.PUSH_SPACE_FOR_SEGMENT.format(arg=THIS_REG)
-            + self.PUSH_SPACE_FOR_SEGMENT.format(arg=THAT_REG)
-            + self.MOVE_SP_TO_LCL.format(args_count=self.command_args[2])
-            + self.GO_TO_FUNCTION.format(function=self.command_args[1])
-            + self.RETURN_VALUE_TO_ASM.format(
-                function=self.command_args[1], label=self.command_index
-            )
+        return self.CALL_TO_ASM.format(
+            function=self.command_args[1],
+            args_count=self.command_args[2],
+            label=self.command_index,
         )
 
     def __format_return(self) -> str:
+        return self.RETURN_TO_ASM
+
+    @classmethod
+    def shared_routines(cls) -> str:
         return (
-            self.RESOLVE_RETURN_ADDRESS
-            + self.POP_SPACE_FOR_ARGUMENT
-            + self.RESOLVE_SPACE_FOR_SEGMENT.format(register=THAT_REG)
-            + self.RESOLVE_SPACE_FOR_SEGMENT.format(register=THIS_REG)
-            + self.RESOLVE_SPACE_FOR_SEGMENT.format(register=ARGUMENT_REG)
-            + self.RESOLVE_SPACE_FOR_SEGMENT.format(register=LOCAL_REG)
-            + self.GO_TO_RETURN_ADDRESS
+            cls.CALL_ROUTINE_LABEL
+            + cls.PUSH_RETURN_ADDRESS
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=LOCAL_REG)
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=ARGUMENT_REG)
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=THIS_REG)
+            + cls.PUSH_SPACE_FOR_SEGMENT.format(arg=THAT_REG)
+            + cls.MOVE_SP_TO_LCL
+            + cls.GO_TO_CALLEE
+            + cls.RETURN_ROUTINE_LABEL
+            + cls.RESOLVE_RETURN_ADDRESS
+            + cls.POP_SPACE_FOR_ARGUMENT
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=THAT_REG)
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=THIS_REG)
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=ARGUMENT_REG)
+            + cls.RESOLVE_SPACE_FOR_SEGMENT.format(register=LOCAL_REG)
+            + cls.GO_TO_RETURN_ADDRESS
         )
 
     LABEL_TO_ASM = "({function})\n"
 
-    RETURN_VALUE_TO_ASM = "({function}$ret.{label})\n"
-
     PUSH_SPACE_FOR_VARIABLE = "@SP\n" "M=M+1\n" "A=M-1\n" "M=0\n"
 
-    PUSH_SPACE_FOR_RETURN = (
-        "@{function}$ret.{label}\n" "D=A\n" "@SP\n" "AM=M+1\n" "A=A-1\n" "M=D\n"
+    CALL_ROUTINE_LABEL = "($CALL)\n"
+
+    RETURN_ROUTINE_LABEL = "($RETURN)\n"
+
+    CALL_TO_ASM = (
+        "@{args_count}\n"
+        "D=A\n"
+        "@R13\n"
+        "M=D\n"
+        "@{function}\n"
+        "D=A\n"
+        "@R14\n"
+        "M=D\n"
+        "@{function}$ret.{label}\n"
+        "D=A\n"
+        "@$CALL\n"
+        "0;JMP\n"
+        "({function}$ret.{label})\n"
     )
 
+    RETURN_TO_ASM = "@$RETURN\n" "0;JMP\n"
+
+    PUSH_RETURN_ADDRESS = "@SP\n" "AM=M+1\n" "A=A-1\n" "M=D\n"
+
     PUSH_SPACE_FOR_SEGMENT = "@{arg}\n" "D=M\n" "@SP\n" "AM=M+1\n" "A=A-1\n" "M=D\n"
 
     MOVE_SP_TO_LCL = (
-        "@{args_count}\n"
-        "D=A\n"
+        "@R13\n"
+        "D=M\n"
         "@5\n"
         "D=D+A\n"
         "@SP\n"
@@ -89,7 +111,7 @@ class FunctionFormatter:
         "M=D\n"
     )
 
-    GO_TO_FUNCTION = "@{function}\n" "0;JMP\n"
+    GO_TO_CALLEE = "@R14\n" "A=M\n" "0;JMP\n"
 
     RESOLVE_RETURN_ADDRESS = (
         "@LCL\n"
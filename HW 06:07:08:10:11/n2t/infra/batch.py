@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator, List, Optional
+
+from n2t.infra.asm import AsmProgram
+from n2t.infra.cache import BuildCache
+from n2t.infra.io import FileFormat
+
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class AssembleResult:
+    path: Path
+    seconds: float
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def describe(self) -> str:
+        if self.error is not None:
+            return f"{'FAILED':>11} {self.path}: {self.error}"
+        status = " (cached)" if self.cached else ""
+        return f"{1000 * self.seconds:>8.1f} ms {self.path}{status}"
+
+
+def collect_asm_files(targets: Iterable[str]) -> List[Path]:
+    files = []
+    for target in targets:
+        if os.path.isdir(target):
+            pattern = os.path.join(glob.escape(target), f"*{FileFormat.asm.value}")
+            files.extend(sorted(glob.glob(pattern)))
+        elif glob.has_magic(target):
+            files.extend(
+                name
+                for name in sorted(glob.glob(target))
+                if name.endswith(FileFormat.asm.value)
+            )
+        else:
+            files.append(target)
+    return [Path(name) for name in dict.fromkeys(files)]
+
+
+def assemble_file(
+    path: Path,
+    binary: bool = False,
+    source_map: bool = False,
+    cache: Optional[BuildCache] = None,
+) -> AssembleResult:
+    start = perf_counter()
+    try:
+        cached = AsmProgram(path).assemble(binary, source_map, cache)
+    except Exception as error:
+        return AssembleResult(path, perf_counter() - start, repr(error))
+    return AssembleResult(path, perf_counter() - start, cached=cached)
+
+
+def assemble_files(
+    paths: List[Path],
+    workers: Optional[int] = None,
+    binary: bool = False,
+    source_map: bool = False,
+    cache: Optional[BuildCache] = None,
+) -> Iterator[AssembleResult]:
+    assemble = partial(assemble_file, binary=binary, source_map=source_map, cache=cache)
+    if workers == 1 or len(paths) <= 1:
+        yield from map(assemble, paths)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, len(paths) // (CHUNKS_PER_WORKER * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(assemble, paths, chunksize=chunk_size)
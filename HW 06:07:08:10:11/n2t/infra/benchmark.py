@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from n2t.core import Assembler, Disassembler
+from n2t.core.assembler.facade import COMP_TO_BINARY, DEST_TO_BINARY, JUMP_TO_BINARY
+from n2t.infra.asm_formatter.function_formatter import FunctionFormatter
+from n2t.infra.io import File
+from n2t.infra.jack import analyze_file
+from n2t.infra.jack_compiler.constants import JACK_FILE_EXT, VM_FILE_EXT
+from n2t.infra.vm import BOOTSTRAP_SP, BOOTSTRAP_SYS_INIT, clean_vm_code, parse_vm_file
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.1
+DEFAULT_REPEAT = 3
+SYNTHETIC_SEED = 2023
+SYNTHETIC_LINES = 20000
+
+SYNTHETIC_COMPS = [comp for comp, bits in COMP_TO_BINARY.items() if len(bits) == 6]
+SYNTHETIC_VM_COMMANDS = [
+    "push constant {value}",
+    "push local {index}",
+    "push argument {index}",
+    "pop local {index}",
+    "push static {index}",
+    "pop static {index}",
+    "add",
+    "sub",
+    "neg",
+    "eq",
+    "gt",
+    "lt",
+    "and",
+    "or",
+    "not",
+]
+
+
+@dataclass(frozen=True)
+class Measurement:
+    stage: str
+    workload: str
+    unit: str
+    units: int
+    seconds: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.workload}"
+
+    @property
+    def rate(self) -> float:
+        return self.units / self.seconds if self.seconds else float("inf")
+
+    def to_json(self) -> Dict[str, Any]:
+        return {**asdict(self), "rate": self.rate}
+
+    @classmethod
+    def from_json(cls, entry: Dict[str, Any]) -> Measurement:
+        return cls(
+            entry["stage"],
+            entry["workload"],
+            entry["unit"],
+            entry["units"],
+            entry["seconds"],
+        )
+
+
+def measure(
+    stage: str,
+    workload: str,
+    unit: str,
+    action: Callable[[], int],
+    repeat: int = DEFAULT_REPEAT,
+) -> Measurement:
+    units = 0
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        units = action()
+        best = min(best, time.perf_counter() - start)
+    return Measurement(stage, workload, unit, units, best)
+
+
+def synthetic_assembly(lines: int, seed: int = SYNTHETIC_SEED) -> List[str]:
+    generator = random.Random(seed)
+    labels = [f"LABEL_{index}" for index in range(max(1, lines // 50))]
+    dests = list(DEST_TO_BINARY)
+    jumps = list(JUMP_TO_BINARY)
+
+    assembly = []
+    for index in range(lines):
+        if index % 50 == 0:
+            assembly.append(f"({labels[index // 50]})")
+        choice = generator.random()
+        if choice < 0.2:
+            assembly.append(f"@{generator.choice(labels)}")
+        elif choice < 0.3:
+            assembly.append(f"@var_{generator.randrange(64)}")
+        elif choice < 0.5:
+            assembly.append(f"@{generator.randrange(32768)}")
+        elif choice < 0.9:
+            comp = generator.choice(SYNTHETIC_COMPS)
+            assembly.append(f"{generator.choice(dests)}={comp}")
+        else:
+            comp = generator.choice(SYNTHETIC_COMPS)
+            assembly.append(f"{comp};{generator.choice(jumps)}")
+    return assembly
+
+
+def synthetic_vm(lines: int, seed: int = SYNTHETIC_SEED) -> List[str]:
+    generator = random.Random(seed)
+    vm = ["function Synthetic.main 8"]
+    for index in range(lines):
+        if index % 100 == 99:
+            vm.append(f"label L{index}")
+            vm.append(f"if-goto L{index}")
+            continue
+        command = generator.choice(SYNTHETIC_VM_COMMANDS)
+        vm.append(
+            command.format(
+                value=generator.randrange(32768), index=generator.randrange(8)
+            )
+        )
+    vm.append("return")
+    return vm
+
+
+def compile_jack(sources: List[Path]) -> Tuple[int, List[Path]]:
+    lines = 0
+    for source in sources:
+        lines += len(source.read_text().splitlines())
+        analyze_file(str(source))
+    return lines, [source.with_suffix(VM_FILE_EXT) for source in sources]
+
+
+def translate_vm(programs: Dict[str, List[str]]) -> List[str]:
+    output = io.StringIO()
+    indexes = count()
+    output.write(BOOTSTRAP_SP)
+    parse_vm_file([BOOTSTRAP_SYS_INIT], output, "", indexes)
+    for name, instructions in programs.items():
+        parse_vm_file(clean_vm_code(instructions), output, name, indexes)
+    output.write(FunctionFormatter.shared_routines())
+    return output.getvalue().splitlines()
+
+
+def assemble(assembly: List[str]) -> List[str]:
+    return list(Assembler.create().assemble(assembly))
+
+
+def disassemble(words: List[str]) -> List[str]:
+    return list(Disassembler.create().disassemble(words))
+
+
+def pipeline_benchmarks(
+    jack_directory: Path, repeat: int = DEFAULT_REPEAT
+) -> List[Measurement]:
+    workload = re.sub(r"\W+", "_", jack_directory.name).strip("_").lower()
+    with tempfile.TemporaryDirectory() as directory:
+        sources = []
+        for source in sorted(jack_directory.glob(f"*{JACK_FILE_EXT}")):
+            sources.append(Path(shutil.copy(source, directory)))
+
+        vm_files: List[Path] = []
+
+        def run_compiler() -> int:
+            nonlocal vm_files
+            lines, vm_files = compile_jack(sources)
+            return lines
+
+        results = [measure("compile", workload, "lines", run_compiler, repeat)]
+        programs = {path.stem: path.read_text().split("\n") for path in vm_files}
+
+    return results + chain_benchmarks(workload, programs, repeat)
+
+
+def chain_benchmarks(
+    workload: str, programs: Dict[str, List[str]], repeat: int = DEFAULT_REPEAT
+) -> List[Measurement]:
+    vm_lines = sum(len(clean_vm_code(lines)) for lines in programs.values())
+    assembly = translate_vm(programs)
+    words = assemble(assembly)
+
+    def run_translator() -> int:
+        translate_vm(programs)
+        return vm_lines
+
+    return [
+        measure("translate", workload, "lines", run_translator, repeat),
+        *file_benchmarks(workload, assembly, words, repeat),
+    ]
+
+
+def file_benchmarks(
+    workload: str, assembly: List[str], words: List[str], repeat: int = DEFAULT_REPEAT
+) -> List[Measurement]:
+    return [
+        measure("assemble", workload, "lines", lambda: len(assemble(assembly)), repeat),
+        measure(
+            "disassemble", workload, "lines", lambda: len(disassemble(words)), repeat
+        ),
+    ]
+
+
+def run_benchmarks(
+    jack_directory: Optional[Path] = None,
+    asm_files: Iterable[Path] = (),
+    lines: int = SYNTHETIC_LINES,
+    repeat: int = DEFAULT_REPEAT,
+) -> List[Measurement]:
+    results = []
+    if jack_directory is not None:
+        results += pipeline_benchmarks(jack_directory, repeat)
+
+    for path in asm_files:
+        assembly = list(File(path).load())
+        results += file_benchmarks(path.stem, assembly, assemble(assembly), repeat)
+
+    workload = f"synthetic_{lines}"
+    results += chain_benchmarks(workload, {"Synthetic": synthetic_vm(lines)}, repeat)
+    assembly = synthetic_assembly(lines)
+    results += file_benchmarks(workload + "_asm", assembly, assemble(assembly), repeat)
+    return results
+
+
+def save_baseline(results: List[Measurement], path: Path) -> None:
+    baseline = {
+        "version": BASELINE_VERSION,
+        "results": {result.key: result.to_json() for result in results},
+    }
+    path.write_text(json.dumps(baseline, indent=2))
+
+
+def load_baseline(path: Path) -> Dict[str, Measurement]:
+    baseline = json.loads(path.read_text())
+    assert baseline["version"] == BASELINE_VERSION, "Unsupported baseline version"
+    return {
+        key: Measurement.from_json(entry) for key, entry in baseline["results"].items()
+    }
+
+
+def compare(
+    baseline: Dict[str, Measurement],
+    current: Dict[str, Measurement],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[List[str], List[str]]:
+    report = []
+    regressions = []
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key].rate
+        after = current[key].rate
+        change = after / before - 1 if before else 0.0
+        line = f"{key:<40} {before:>14.0f} -> {after:>14.0f} {current[key].unit}/s"
+        line += f" ({change:+.1%})"
+        if change < -threshold:
+            regressions.append(line)
+            line += "  REGRESSION"
+        report.append(line)
+    return report, regressions
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+import n2t
+
+DEFAULT_CACHE_DIRECTORY = ".n2t-cache"
+
+
+@lru_cache(maxsize=None)
+def toolchain_version() -> str:
+    package = Path(n2t.__file__).parent
+    digest = hashlib.sha256()
+    for source in sorted(package.rglob("*.py")):
+        digest.update(source.relative_to(package).as_posix().encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_summary(hits: int, misses: int) -> str:
+    return f"Cache: {hits} hit(s), {misses} miss(es)"
+
+
+def place(source: Path, destination: Path) -> None:
+    destination.unlink(missing_ok=True)
+    shutil.copyfile(source, destination)
+
+
+@dataclass
+class BuildCache:
+    directory: Path
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def load_from(cls, directory: str = DEFAULT_CACHE_DIRECTORY) -> BuildCache:
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        return cls(path)
+
+    def key(self, stage: str, inputs: Iterable[Path], options: Dict[str, Any]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{stage}\0{toolchain_version()}\0".encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        for path in inputs:
+            digest.update(f"\0{path.name}\0".encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def restore(self, key: str, outputs: List[Path]) -> bool:
+        entry = self.directory.joinpath(key)
+        if not all(entry.joinpath(output.name).exists() for output in outputs):
+            return False
+        for output in outputs:
+            place(entry.joinpath(output.name), output)
+        return True
+
+    def store(self, key: str, outputs: List[Path]) -> None:
+        entry = self.directory.joinpath(key)
+        staging = Path(tempfile.mkdtemp(dir=self.directory))
+        for output in outputs:
+            shutil.copyfile(output, staging.joinpath(output.name))
+        try:
+            staging.rename(entry)
+        except OSError:
+            shutil.rmtree(staging)
+
+    def build(self, key: str, outputs: List[Path], stage: Callable[[], object]) -> bool:
+        if self.restore(key, outputs):
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        for output in outputs:
+            output.unlink(missing_ok=True)
+        stage()
+        self.store(key, outputs)
+        return False
+
+    def summary(self) -> str:
+        return cache_summary(self.hits, self.misses)
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Iterable, Iterator, Protocol
 
 from n2t.core import Disassembler as DefaultDisassembler
-from n2t.infra.io import File, FileFormat
+from n2t.infra.io import File, FileFormat, RomFile
 
 
 @dataclass
@@ -14,7 +14,8 @@ class HackProgram:
     disassembler: Disassembler = field(default_factory=DefaultDisassembler.create)
 
     def __post_init__(self) -> None:
-        FileFormat.hack.validate(self.path)
+        if self.path.suffix != FileFormat.rom.value:
+            FileFormat.hack.validate(self.path)
 
     @classmethod
     def load_from(cls, file_name: str) -> HackProgram:
@@ -22,12 +23,22 @@ class HackProgram:
 
     def disassemble(self) -> None:
         assembly_file = File(FileFormat.asm.convert(self.path))
-        assembly_file.save(self.disassembler.disassemble(self))
+        if self.path.suffix == FileFormat.rom.value:
+            words = RomFile(self.path).load_words()
+            assembly_file.save(self.disassembler.disassemble_words(words))
+        else:
+            assembly_file.save(self.disassembler.disassemble(self))
 
     def __iter__(self) -> Iterator[str]:
-        yield from File(self.path).load()
+        if self.path.suffix == FileFormat.rom.value:
+            yield from RomFile(self.path).load()
+        else:
+            yield from File(self.path).load()
 
 
 class Disassembler(Protocol):  # pragma: no cover
     def disassemble(self, words: Iterable[str]) -> Iterable[str]:
         pass
+
+    def disassemble_words(self, words: Iterable[int]) -> Iterable[str]:
+        pass
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 import glob
+import mmap
 import os
+import struct
+import sys
+from array import array
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Iterable
 
+ROM_MAGIC = b"HROM"
+ROM_VERSION = 1
+ROM_HEADER = struct.Struct("<4sHI")
+
 
 class FileFormat(Enum):
     hack = ".hack"
     asm = ".asm"
+    rom = ".rom"
 
     def validate(self, path: Path) -> None:
-        assert path.suffix == self.value
+        assert path.suffix == self.value, f"Expected a {self.value} file: {path}"
 
     def convert(self, path: Path) -> Path:
         return path.with_suffix(self.value)
@@ -33,6 +42,37 @@ class File:
                 file.write(f"{line}\n")
 
 
+@dataclass(frozen=True)
+class RomFile:
+    path: Path
+
+    def load(self) -> Iterable[str]:
+        yield from (f"{word:016b}" for word in self.load_words())
+
+    def load_words(self) -> array[int]:
+        with self.path.open("rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as rom:
+                magic, version, count = ROM_HEADER.unpack_from(rom)
+                assert magic == ROM_MAGIC, "Not a packed Hack ROM"
+                assert version == ROM_VERSION, f"Unsupported ROM version {version}"
+                rom.seek(ROM_HEADER.size)
+                words = array("H", rom.read(2 * count))
+        if sys.byteorder == "big":
+            words.byteswap()
+        return words
+
+    def save(self, lines: Iterable[str]) -> None:
+        self.save_words(array("H", (int(line, 2) for line in lines)))
+
+    def save_words(self, words: array[int]) -> None:
+        words = array("H", words)
+        if sys.byteorder == "big":
+            words.byteswap()
+        with self.path.open("wb") as file:
+            file.write(ROM_HEADER.pack(ROM_MAGIC, ROM_VERSION, len(words)))
+            file.write(words.tobytes())
+
+
 def remove_files(pattern: str) -> None:
     for file in glob.glob(pattern):
         os.remove(file)
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import partial
 from os.path import isdir, isfile
-from typing import List
+from pathlib import Path
+from typing import List, Optional, Tuple
 
+from n2t.core.source_map import SourceMap, source_map_path
+from n2t.infra.cache import BuildCache
 from n2t.infra.jack_compiler.compilation_engine import CompilationEngine
 from n2t.infra.jack_compiler.constants import (
     JACK_FILE_EXT,
@@ -15,16 +19,41 @@ from n2t.infra.jack_compiler.constants import (
 from n2t.infra.jack_compiler.tokenizer import Tokenizer
 
 
-def analyze_file(file_name: str) -> None:
-    tokenizer_file_name = file_name.rstrip(JACK_FILE_EXT) + TOKENIZER_FILE_EXT
-    parser_file_name = file_name.rstrip(JACK_FILE_EXT) + PARSER_FILE_EXT
-    compiler_file_name = file_name.rstrip(JACK_FILE_EXT) + VM_FILE_EXT
+def output_file_names(file_name: str) -> Tuple[str, str, str]:
+    return (
+        file_name.rstrip(JACK_FILE_EXT) + TOKENIZER_FILE_EXT,
+        file_name.rstrip(JACK_FILE_EXT) + PARSER_FILE_EXT,
+        file_name.rstrip(JACK_FILE_EXT) + VM_FILE_EXT,
+    )
+
+
+def analyze_file(
+    file_name: str, source_map: bool = False, cache: Optional[BuildCache] = None
+) -> bool:
+    if cache is None:
+        compile_file(file_name, source_map)
+        return False
+
+    outputs = [Path(name) for name in output_file_names(file_name)]
+    if source_map:
+        outputs.append(source_map_path(outputs[-1]))
+    key = cache.key("compile", [Path(file_name)], {"source_map": source_map})
+    return cache.build(key, outputs, partial(compile_file, file_name, source_map))
+
+
+def compile_file(file_name: str, source_map: bool = False) -> None:
+    tokenizer_file_name, parser_file_name, compiler_file_name = output_file_names(
+        file_name
+    )
     tokenizer = Tokenizer(file_name, tokenizer_file_name)
     tokenizer.write_in_file()
 
     tokenizer.reset()
-    parser = CompilationEngine(tokenizer, parser_file_name, compiler_file_name)
+    vm_map = SourceMap() if source_map else None
+    parser = CompilationEngine(tokenizer, parser_file_name, compiler_file_name, vm_map)
     parser.write_in_file()
+    if vm_map is not None:
+        vm_map.save(source_map_path(Path(compiler_file_name)))
 
 
 def get_all_files(directory_name: str) -> List[str]:
@@ -44,7 +73,9 @@ class JackProgram:
         cls.file_or_directory_name = file_or_directory_name
         return cls(cls.file_or_directory_name)
 
-    def compile(self) -> None:
+    def compile(
+        self, source_map: bool = False, cache: Optional[BuildCache] = None
+    ) -> None:
         if isfile(self.file_or_directory_name):
             files = [self.file_or_directory_name]
         elif isdir(self.file_or_directory_name):
@@ -52,4 +83,4 @@ class JackProgram:
         else:
             raise FileNotFoundError()
         for file in files:
-            analyze_file(file)
+            analyze_file(file, source_map, cache)
@@ -1,3 +1,7 @@
+from os.path import basename
+from typing import Optional
+
+from n2t.core.source_map import SourceLocation, SourceMap
 from n2t.infra.jack_compiler.constants import (
     ELSE_LABEL_BEGIN,
     IF_ELSE_LABEL_END,
@@ -12,15 +16,31 @@ from n2t.infra.jack_compiler.vm_code_generator import VMCodeGenerator
 
 
 class CompilationEngine:
-    def __init__(self, tokenizer: Tokenizer, xml_file_name: str, vm_file_name: str):
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        xml_file_name: str,
+        vm_file_name: str,
+        source_map: Optional[SourceMap] = None,
+    ):
         self.class_name = ""
+        self.subroutine_name = ""
         self.return_type = ""
         self.tokenizer = tokenizer
         self.out_file_name = xml_file_name
         self.symbols_table = SymbolsTable()
-        self.vm_generator = VMCodeGenerator(vm_file_name)
+        self.vm_generator = VMCodeGenerator(
+            vm_file_name, source_map, self.current_location
+        )
         self.xml_file = open(xml_file_name, "w")
 
+    def current_location(self) -> SourceLocation:
+        return SourceLocation(
+            basename(self.tokenizer.file_name),
+            self.tokenizer.get_current_line(),
+            f"{self.class_name}.{self.subroutine_name}",
+        )
+
     def write_line(self, line: str, tab_count: int) -> None:
         self.xml_file.write(f"{XML_LINE_TAB * tab_count}{line}\n")
 
@@ -109,6 +129,7 @@ class CompilationEngine:
             self.compile_type(tab_count + 1)
 
         function_name = self.tokenizer.get_current_token()
+        self.subroutine_name = function_name
 
         self.write_and_move_next(self.tokenizer.identifier_xml(), tab_count + 1)  # name
         self.write_and_move_next(self.tokenizer.symbol_xml(), tab_count + 1)
@@ -1,6 +1,7 @@
 import re
+from bisect import bisect_left
 from enum import Enum
-from re import findall
+from re import finditer
 from typing import List, TextIO
 
 from n2t.infra.jack_compiler.constants import DOUBLE_QUOTE
@@ -95,6 +96,7 @@ class Tokenizer:
         self.file_str = self.parse_file()
 
         self.quotes = self.get_quote_indexes()
+        self.lines: List[int] = []
         self.tokens = self.generate_tokens()
         self.curr_token_index = 0
 
@@ -105,7 +107,9 @@ class Tokenizer:
         with open(self.file_name, "r") as jack_file:
             file_contents = jack_file.read()
             cleaned_contents = re.sub(
-                r"(/\*([^*]|[\r\n]|(\*+([^*/]|[\r\n])))*\*+/)|(//.*)", "", file_contents
+                r"(/\*([^*]|[\r\n]|(\*+([^*/]|[\r\n])))*\*+/)|(//.*)",
+                lambda comment: "\n" * comment.group(0).count("\n"),
+                file_contents,
             )
             return cleaned_contents
 
@@ -116,10 +120,13 @@ class Tokenizer:
         return res
 
     def generate_tokens(self) -> List[str]:
-        all_tokens = findall(r"\w+|[{}()<>.,;=~|&*/+\-\"\[\]]", self.file_str)
+        all_tokens = finditer(r"\w+|[{}()<>.,;=~|&*/+\-\"\[\]]", self.file_str)
+        newlines = [i for i, ch in enumerate(self.file_str) if ch == "\n"]
 
         res, i = [], -1
-        for token in all_tokens:
+        for match in all_tokens:
+            token = match.group(0)
+            line = bisect_left(newlines, match.start())
             if token == DOUBLE_QUOTE:
                 if i % 2 == 0:
                     res.append(
@@ -127,9 +134,11 @@ class Tokenizer:
                         + self.file_str[self.quotes[i] + 1: self.quotes[i + 1]]
                         + DOUBLE_QUOTE
                     )
+                    self.lines.append(line)
                 i += 1
             elif i % 2 == 1:
                 res.append(token)
+                self.lines.append(line)
 
         return res
 
@@ -337,5 +346,8 @@ class Tokenizer:
     def get_current_token_index(self) -> int:
         return self.curr_token_index
 
+    def get_current_line(self) -> int:
+        return self.lines[min(self.curr_token_index, len(self.lines) - 1)]
+
     def get_tokens(self) -> List[str]:
         return self.tokens
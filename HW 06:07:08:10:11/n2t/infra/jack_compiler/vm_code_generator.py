@@ -1,3 +1,7 @@
+from typing import Callable, Optional
+
+from n2t.core.source_map import SourceLocation, SourceMap
+
 var_types_to_segments = {"field": "this"}
 
 symbol_to_alu_command = {
@@ -18,26 +22,40 @@ symbol_to_alu_command = {
 
 
 class VMCodeGenerator:
-    def __init__(self, out_file_name: str):
+    def __init__(
+        self,
+        out_file_name: str,
+        source_map: Optional[SourceMap] = None,
+        locate: Optional[Callable[[], SourceLocation]] = None,
+    ):
         self.file = open(out_file_name, "w")
+        self.source_map = source_map
+        self.locate = locate
+        self.line_count = 0
 
     def close_file(self) -> None:
         self.file.close()
 
+    def write(self, command: str) -> None:
+        if self.source_map is not None and self.locate is not None:
+            self.source_map.mark(self.line_count, self.locate())
+        self.line_count += 1
+        self.file.write(f"{command}\n")
+
     def generate_push(self, segment: str, index: int) -> None:
-        self.file.write(f"push {var_types_to_segments.get(segment, segment)} {index}\n")
+        self.write(f"push {var_types_to_segments.get(segment, segment)} {index}")
 
     def generate_pop(self, segment: str, index: int) -> None:
-        self.file.write(f"pop {var_types_to_segments.get(segment, segment)} {index}\n")
+        self.write(f"pop {var_types_to_segments.get(segment, segment)} {index}")
 
     def generate_label(self, label: str, index: int) -> None:
-        self.file.write(f"label {label}{index}\n")
+        self.write(f"label {label}{index}")
 
     def generate_goto(self, label: str, index: int) -> None:
-        self.file.write(f"goto {label}{index}\n")
+        self.write(f"goto {label}{index}")
 
     def generate_if_goto(self, label: str, index: int) -> None:
-        self.file.write(f"if-goto {label}{index}\n")
+        self.write(f"if-goto {label}{index}")
 
     def generate_string(self, value: str) -> None:
         self.generate_push("constant", len(value))
@@ -57,18 +75,18 @@ class VMCodeGenerator:
             self.generate_push("pointer", 0)
 
     def generate_alu(self, symbol: str) -> None:
-        self.file.write(f"{symbol_to_alu_command.get(symbol, symbol)}\n")
+        self.write(symbol_to_alu_command.get(symbol, symbol))
 
     def generate_function(
         self, class_name: str, function_name: str, nargs: int
     ) -> None:
-        self.file.write(f"function {class_name}.{function_name} {nargs}\n")
+        self.write(f"function {class_name}.{function_name} {nargs}")
 
     def generate_call(self, name: str, nargs: int) -> None:
-        self.file.write(f"call {name} {nargs}\n")
+        self.write(f"call {name} {nargs}")
 
     def generate_return(self) -> None:
-        self.file.write("return\n")
+        self.write("return")
 
     def generate_method_header(self) -> None:
         self.generate_push("argument", 0)
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, TextIO
+from functools import partial
+from itertools import count
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
 
+from n2t.core.source_map import SourceLocation, SourceMap, source_map_path
 from n2t.infra.asm_formatter.alu_formatter import AluFormatter
 from n2t.infra.asm_formatter.branch_formatter import BranchFormatter
 from n2t.infra.asm_formatter.constants import (
@@ -18,11 +22,14 @@ from n2t.infra.asm_formatter.constants import (
 from n2t.infra.asm_formatter.function_formatter import FunctionFormatter
 from n2t.infra.asm_formatter.pop_formatter import PopFormatter
 from n2t.infra.asm_formatter.push_formatter import PushFormatter
+from n2t.infra.cache import BuildCache
 
 BOOTSTRAP_SP = "@256\n" "D=A\n" "@SP\n" "M=D\n"
 
 BOOTSTRAP_SYS_INIT = "call Sys.init 0"
 
+ROUTINE_COMMANDS = ("call", "return")
+
 
 def get_asm_filename(file_or_directory_name: str) -> str:
     path = os.path.splitext(file_or_directory_name.rstrip("/"))[0]
@@ -42,30 +49,53 @@ def contain_sys(filenames: List[str]) -> bool:
     return False
 
 
-def clean_vm_code(instructions: List[str]) -> List[str]:
-    cleaned_lines = []
-    for line in instructions:
+def number_vm_code(instructions: List[str]) -> List[Tuple[int, str]]:
+    numbered_lines = []
+    for i, line in enumerate(instructions):
         if "//" in line:
             line = line.split("//", 1)[0]
         cleaned_line = line.strip()
         if cleaned_line:
-            cleaned_lines.append(cleaned_line)
+            numbered_lines.append((i, cleaned_line))
+
+    return numbered_lines
+
+
+def clean_vm_code(instructions: List[str]) -> List[str]:
+    return [line for _, line in number_vm_code(instructions)]
+
 
-    return cleaned_lines
+def uses_routines(instructions: List[str]) -> bool:
+    return any(
+        instruction.split(" ")[0] in ROUTINE_COMMANDS for instruction in instructions
+    )
 
 
-def parse_folder(folder_name: str, asm_file: TextIO) -> List[str]:
-    filenames = [
+def get_vm_filenames(folder_name: str) -> List[str]:
+    return [
         os.path.join(folder_name, filename)
         for filename in os.listdir(folder_name)
         if filename.endswith(VM_EXTENSION)
     ]
 
+
+def parse_folder(
+    folder_name: str, asm_file: TextIO, indexes: Iterator[int]
+) -> Tuple[List[str], int]:
+    filenames = get_vm_filenames(folder_name)
+
+    position = 0
     if contain_sys(filenames):
         asm_file.write(BOOTSTRAP_SP)
-        parse_vm_file([BOOTSTRAP_SYS_INIT], asm_file, "")
+        position = parse_vm_file(
+            [BOOTSTRAP_SYS_INIT],
+            asm_file,
+            "",
+            indexes,
+            position=BOOTSTRAP_SP.count("\n"),
+        )
 
-    return filenames
+    return filenames, position
 
 
 def vm_instr_to_asm(args: Dict[str, Any]) -> str:
@@ -82,34 +112,74 @@ def vm_instr_to_asm(args: Dict[str, Any]) -> str:
         return AluFormatter(args).translate_to_asm()
 
 
-def parse_vm_file(vm_instructions: List[str], file: TextIO, filename: str) -> None:
+def parse_vm_file(
+    vm_instructions: List[str],
+    file: TextIO,
+    filename: str,
+    indexes: Iterator[int],
+    source_map: Optional[SourceMap] = None,
+    source_lines: Optional[List[int]] = None,
+    position: int = 0,
+) -> int:
     current_function: str = ""
     for i, vm_instruction in enumerate(vm_instructions):
+        if vm_instruction.startswith("function "):
+            current_function = vm_instruction.split(" ")[1]
         args = {
             INSTRUCTION_KEY: vm_instruction,
             FILENAME_KEY: filename,
             FUNCTION_NAME_KEY: current_function,
-            INSTRUCTION_INDEX_KEY: i,
+            INSTRUCTION_INDEX_KEY: next(indexes),
         }
         asm_command: str = vm_instr_to_asm(args)
+        if source_map is not None:
+            location = None
+            if source_lines is not None:
+                location = SourceLocation(
+                    filename + VM_EXTENSION, source_lines[i], current_function
+                )
+            source_map.mark(position, location)
+        position += asm_command.count("\n")
         file.write(asm_command)
 
+    return position
+
 
-def parse_vm_files(file_or_directory_name: str, asm_filename: str) -> None:
+def parse_vm_files(
+    file_or_directory_name: str, asm_filename: str, source_map: bool = False
+) -> None:
     asm_file = open(asm_filename, "w")
+    asm_map = SourceMap() if source_map else None
     filenames = [file_or_directory_name]
+    indexes = count()
+    position = 0
 
     if not os.path.isfile(file_or_directory_name):
-        filenames = parse_folder(file_or_directory_name, asm_file)
+        filenames, position = parse_folder(file_or_directory_name, asm_file, indexes)
+    routines = position > 0
 
     for filename in filenames:
         with open(filename, "r") as file:
-            instructions = clean_vm_code(file.read().split("\n"))
-            parse_vm_file(
-                instructions, asm_file, os.path.basename(filename).split(".")[0]
+            numbered = number_vm_code(file.read().split("\n"))
+            instructions = [instruction for _, instruction in numbered]
+            routines = routines or uses_routines(instructions)
+            position = parse_vm_file(
+                instructions,
+                asm_file,
+                os.path.basename(filename).split(".")[0],
+                indexes,
+                asm_map,
+                [line for line, _ in numbered],
+                position,
             )
 
+    if routines:
+        if asm_map is not None:
+            asm_map.mark(position, None)
+        asm_file.write(FunctionFormatter.shared_routines())
     asm_file.close()
+    if asm_map is not None:
+        asm_map.save(source_map_path(Path(asm_filename)))
 
 
 @dataclass
@@ -120,6 +190,26 @@ class VmProgram:
     def load_from(cls, file_or_directory_name: str) -> VmProgram:
         return cls(file_or_directory_name)
 
-    def translate(self) -> None:
+    def translate(
+        self, source_map: bool = False, cache: Optional[BuildCache] = None
+    ) -> bool:
         asm_filename = get_asm_filename(self.file_or_directory_name)
-        parse_vm_files(self.file_or_directory_name, asm_filename)
+        translate = partial(
+            parse_vm_files, self.file_or_directory_name, asm_filename, source_map
+        )
+        if cache is None:
+            translate()
+            return False
+
+        filenames = [self.file_or_directory_name]
+        if not os.path.isfile(self.file_or_directory_name):
+            filenames = get_vm_filenames(self.file_or_directory_name)
+        outputs = [Path(asm_filename)]
+        if source_map:
+            outputs.append(source_map_path(outputs[0]))
+        key = cache.key(
+            "translate",
+            [Path(filename) for filename in sorted(filenames)],
+            {"source_map": source_map},
+        )
+        return cache.build(key, outputs, translate)
@@ -1,6 +1,21 @@
-from typer import Typer, echo
+from pathlib import Path
+from typing import List, Optional
 
+from typer import Exit, Option, Typer, echo
+
+from n2t.core.source_map import resolve_chain
 from n2t.infra import AsmProgram, HackProgram, JackProgram, VmProgram
+from n2t.infra.batch import assemble_files, collect_asm_files
+from n2t.infra.benchmark import (
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    SYNTHETIC_LINES,
+    compare,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+from n2t.infra.cache import BuildCache, cache_summary
 
 cli = Typer(
     name="Nand 2 Tetris Software",
@@ -17,21 +32,97 @@ def run_disassembler(hack_file: str) -> None:
 
 
 @cli.command("assemble", no_args_is_help=True)
-def run_assembler(assembly_file: str) -> None:
-    echo(f"Assembling {assembly_file}")
-    AsmProgram.load_from(assembly_file).assemble()
-    echo("Done!")
+def run_assembler(
+    assembly_files: List[str],
+    binary: bool = False,
+    source_map: bool = False,
+    workers: Optional[int] = None,
+    cache: Optional[str] = None,
+) -> None:
+    build_cache = None if cache is None else BuildCache.load_from(cache)
+    paths = collect_asm_files(assembly_files)
+    if len(paths) == 1 and assembly_files == [str(paths[0])]:
+        echo(f"Assembling {paths[0]}")
+        AsmProgram(paths[0]).assemble(binary, source_map, build_cache)
+        report_cache(build_cache)
+        echo("Done!")
+        return
+
+    echo(f"Assembling {len(paths)} files")
+    failures = hits = 0
+    for result in assemble_files(paths, workers, binary, source_map, build_cache):
+        failures += not result.ok
+        hits += result.cached
+        echo(result.describe())
+    if build_cache is not None:
+        echo(cache_summary(hits, len(paths) - failures - hits))
+    echo(f"Done! {len(paths) - failures}/{len(paths)} files assembled.")
+    if failures:
+        raise Exit(code=1)
 
 
 @cli.command("translate_vm", no_args_is_help=True)
-def run_vm_translator(vm_file_or_directory: str) -> None:
+def run_vm_translator(
+    vm_file_or_directory: str, source_map: bool = False, cache: Optional[str] = None
+) -> None:
+    build_cache = None if cache is None else BuildCache.load_from(cache)
     echo(f"Translating {vm_file_or_directory}")
-    VmProgram.load_from(vm_file_or_directory).translate()
+    VmProgram.load_from(vm_file_or_directory).translate(source_map, build_cache)
+    report_cache(build_cache)
     echo("Done!")
 
 
 @cli.command("compile", no_args_is_help=True)
-def run_compiler(jack_file_or_directory: str) -> None:
+def run_compiler(
+    jack_file_or_directory: str, source_map: bool = False, cache: Optional[str] = None
+) -> None:
+    build_cache = None if cache is None else BuildCache.load_from(cache)
     echo(f"Compiling {jack_file_or_directory}")
-    JackProgram.load_from(jack_file_or_directory).compile()
+    JackProgram.load_from(jack_file_or_directory).compile(source_map, build_cache)
+    report_cache(build_cache)
     echo("Done!")
+
+
+def report_cache(build_cache: Optional[BuildCache]) -> None:
+    if build_cache is not None:
+        echo(build_cache.summary())
+
+
+@cli.command("resolve", no_args_is_help=True)
+def run_resolve(program_file: Path, address: int) -> None:
+    chain = resolve_chain(program_file, address)
+    if not chain:
+        echo(f"No source map entry for {program_file.name}:{address}")
+        raise Exit(code=1)
+    for location in chain:
+        echo(location.describe())
+
+
+@cli.command("benchmark")
+def run_benchmark(
+    jack_directory: Optional[Path] = None,
+    asm: List[Path] = Option([]),
+    lines: int = SYNTHETIC_LINES,
+    repeat: int = DEFAULT_REPEAT,
+    output: Optional[Path] = None,
+) -> None:
+    results = run_benchmarks(jack_directory, asm, lines, repeat)
+    for result in results:
+        echo(f"{result.key:<40} {result.rate:>14.0f} {result.unit}/s")
+    if output is not None:
+        save_baseline(results, output)
+
+
+@cli.command("compare", no_args_is_help=True)
+def run_compare(
+    baseline: Path, current: Path, threshold: float = DEFAULT_THRESHOLD
+) -> None:
+    report, regressions = compare(
+        load_baseline(baseline), load_baseline(current), threshold
+    )
+    for line in report:
+        echo(line)
+    if regressions:
+        echo(f"{len(regressions)} stage(s) regressed past {threshold:.0%}.")
+        raise Exit(code=1)
+    echo("No regressions.")
@@ -1,7 +1,9 @@
 import filecmp
+import shutil
 from pathlib import Path
 
 import pytest
+from typer import Exit
 
 from n2t.runner.cli import run_assembler
 
@@ -13,10 +15,43 @@ _TEST_PROGRAMS = ["empty", "addL", "maxL", "rectL", "pongL", "max", "rect", "pon
 def test_should_assemble(program: str, asm_directory: Path) -> None:
     asm_file = str(asm_directory.joinpath(f"{program}.asm"))
 
-    run_assembler(asm_file)
+    run_assembler([asm_file])
 
     assert filecmp.cmp(
         shallow=False,
         f1=str(asm_directory.joinpath(f"{program}.cmp")),
         f2=str(asm_directory.joinpath(f"{program}.hack")),
     )
+
+
+def test_should_assemble_directory_in_parallel(
+    asm_directory: Path, tmp_path: Path
+) -> None:
+    for program in _TEST_PROGRAMS:
+        shutil.copy(asm_directory.joinpath(f"{program}.asm"), tmp_path)
+
+    run_assembler([str(tmp_path)], workers=2)
+
+    for program in _TEST_PROGRAMS:
+        assert filecmp.cmp(
+            shallow=False,
+            f1=str(asm_directory.joinpath(f"{program}.cmp")),
+            f2=str(tmp_path.joinpath(f"{program}.hack")),
+        )
+
+
+def test_should_report_failures_without_aborting_batch(
+    asm_directory: Path, tmp_path: Path
+) -> None:
+    shutil.copy(asm_directory.joinpath("max.asm"), tmp_path)
+    tmp_path.joinpath("broken.asm").write_text("D=Q\n")
+
+    with pytest.raises(Exit):
+        run_assembler([str(tmp_path.joinpath("*.asm"))], workers=2)
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(asm_directory.joinpath("max.cmp")),
+        f2=str(tmp_path.joinpath("max.hack")),
+    )
+    assert not tmp_path.joinpath("broken.hack").exists()
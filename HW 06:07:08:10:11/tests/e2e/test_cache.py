@@ -0,0 +1,70 @@
+import filecmp
+import shutil
+from pathlib import Path
+
+from n2t.infra import AsmProgram
+from n2t.infra.cache import BuildCache
+
+
+def test_should_reuse_cached_assembly(asm_directory: Path, tmp_path: Path) -> None:
+    cache = BuildCache.load_from(str(tmp_path.joinpath("cache")))
+    asm_file = Path(shutil.copy(asm_directory.joinpath("max.asm"), tmp_path))
+    hack_file = tmp_path.joinpath("max.hack")
+
+    assert not AsmProgram(asm_file).assemble(cache=cache)
+    hack_file.unlink()
+    assert AsmProgram(asm_file).assemble(cache=cache)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert filecmp.cmp(
+        shallow=False, f1=str(asm_directory.joinpath("max.cmp")), f2=str(hack_file)
+    )
+
+
+def test_should_miss_when_content_or_options_change(
+    asm_directory: Path, tmp_path: Path
+) -> None:
+    cache = BuildCache.load_from(str(tmp_path.joinpath("cache")))
+    asm_file = Path(shutil.copy(asm_directory.joinpath("max.asm"), tmp_path))
+
+    AsmProgram(asm_file).assemble(cache=cache)
+    AsmProgram(asm_file).assemble(binary=True, cache=cache)
+    asm_file.write_text(asm_file.read_text() + "@0\n")
+    AsmProgram(asm_file).assemble(cache=cache)
+
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_should_not_corrupt_cache_when_rebuilding_linked_output(
+    tmp_path: Path,
+) -> None:
+    cache = BuildCache.load_from(str(tmp_path.joinpath("cache")))
+    output = tmp_path.joinpath("out.txt")
+
+    cache.build("key", [output], lambda: output.write_text("cached"))
+    cache.build("key", [output], lambda: output.write_text("unused"))
+    cache.build("other", [output], lambda: output.write_text("rebuilt"))
+    cache.build("key", [output], lambda: output.write_text("unused"))
+
+    assert output.read_text() == "cached"
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_should_keep_cache_intact_after_uncached_rebuild(
+    asm_directory: Path, tmp_path: Path
+) -> None:
+    cache = BuildCache.load_from(str(tmp_path.joinpath("cache")))
+    asm_file = Path(shutil.copy(asm_directory.joinpath("max.asm"), tmp_path))
+    hack_file = tmp_path.joinpath("max.hack")
+    source = asm_file.read_text()
+
+    AsmProgram(asm_file).assemble(cache=cache)
+    assert AsmProgram(asm_file).assemble(cache=cache)
+    asm_file.write_text("@0\n")
+    AsmProgram(asm_file).assemble()
+    asm_file.write_text(source)
+
+    assert AsmProgram(asm_file).assemble(cache=cache)
+    assert filecmp.cmp(
+        shallow=False, f1=str(asm_directory.joinpath("max.cmp")), f2=str(hack_file)
+    )
@@ -0,0 +1,33 @@
+import filecmp
+from pathlib import Path
+
+import pytest
+
+from n2t.infra.io import File, RomFile
+from n2t.runner.cli import run_assembler, run_disassembler
+
+
+@pytest.mark.parametrize("program", ["empty", "addL", "max", "pong"])
+def test_should_assemble_packed_rom(program: str, asm_directory: Path) -> None:
+    rom_file = asm_directory.joinpath(f"{program}.rom")
+
+    run_assembler([str(asm_directory.joinpath(f"{program}.asm"))], binary=True)
+    words = list(RomFile(rom_file).load())
+    rom_file.unlink()
+
+    assert words == list(File(asm_directory.joinpath(f"{program}.cmp")).load())
+
+
+@pytest.mark.parametrize("program", ["add", "max", "rect", "pong"])
+def test_should_disassemble_packed_rom(program: str, hack_directory: Path) -> None:
+    rom_file = hack_directory.joinpath(f"{program}.rom")
+    RomFile(rom_file).save(File(hack_directory.joinpath(f"{program}.hack")).load())
+
+    run_disassembler(str(rom_file))
+    rom_file.unlink()
+
+    assert filecmp.cmp(
+        shallow=False,
+        f1=str(hack_directory.joinpath(f"{program}.cmp")),
+        f2=str(hack_directory.joinpath(f"{program}.asm")),
+    )
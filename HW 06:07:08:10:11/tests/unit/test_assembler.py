@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from n2t.core.assembler.facade import (
+    StreamingAssembler,
+    assemble_words,
+    stream_assembly,
+)
+
+
+def test_should_backpatch_forward_references() -> None:
+    assembly = ["@END", "0;JMP", "@LOOP", "(LOOP)", "@END", "D;JGT", "(END)"]
+
+    assembler = stream_assembly(assembly)
+    words = assembler.finish()
+
+    assert list(words) == [5, 0b1110101010000111, 3, 5, 0b1110001100000001]
+    assert assembler.labels == {"LOOP": 3, "END": 5}
+    assert assembler.fixups == {}
+
+
+def test_should_allocate_variables_in_order_of_first_use() -> None:
+    assembly = ["@b", "@LABEL", "@a", "@b", "(LABEL)", "@c", "@a"]
+
+    words = list(assemble_words(assembly))
+
+    assert words == [16, 4, 17, 16, 18, 17]
+
+
+def test_should_keep_fixup_table_per_symbol() -> None:
+    assembler = StreamingAssembler()
+
+    for command in ["@x", "@x", "@x", "@y", "@x"]:
+        assembler.feed(command)
+
+    assert assembler.fixups == {"x": 4, "y": 3}
+    assert list(assembler.finish()) == [16, 16, 16, 17, 16]
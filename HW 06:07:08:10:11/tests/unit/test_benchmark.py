@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from n2t.infra.benchmark import (
+    Measurement,
+    assemble,
+    compare,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+    synthetic_assembly,
+)
+
+
+def test_should_assemble_synthetic_programs() -> None:
+    words = assemble(synthetic_assembly(lines=500))
+
+    assert len(words) == 500
+    assert all(len(word) == 16 and set(word) <= {"0", "1"} for word in words)
+
+
+def test_should_round_trip_baseline(tmp_path: Path) -> None:
+    results = run_benchmarks(lines=200, repeat=1)
+    path = tmp_path.joinpath("baseline.json")
+
+    save_baseline(results, path)
+
+    assert load_baseline(path) == {result.key: result for result in results}
+
+
+def test_should_flag_regressions_past_threshold() -> None:
+    baseline = {
+        "assemble/a": Measurement("assemble", "a", "lines", 1000, 1.0),
+        "translate/a": Measurement("translate", "a", "lines", 1000, 1.0),
+    }
+    current = {
+        "assemble/a": Measurement("assemble", "a", "lines", 1000, 1.05),
+        "translate/a": Measurement("translate", "a", "lines", 1000, 2.0),
+    }
+
+    report, regressions = compare(baseline, current, threshold=0.1)
+
+    assert len(report) == 2
+    assert len(regressions) == 1
+    assert regressions[0].startswith("translate/a")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from hypothesis import given
-from hypothesis.strategies import one_of
+from hypothesis.strategies import integers, one_of
 
 from n2t.core.disassembler import Disassembler
 from tests.unit.strategies import (
@@ -47,3 +47,12 @@ def test_should_not_fail_fuzzing(hack_word: str) -> None:
     disassembler = Disassembler.create()
 
     disassembler.disassemble_one(word=hack_word)
+
+
+@given(word=integers(min_value=0, max_value=0xFFFF))
+def test_should_disassemble_integer_words_like_bit_strings(word: int) -> None:
+    disassembler = Disassembler.create()
+
+    assembly = disassembler.disassemble_word(word)
+
+    assert assembly == disassembler.disassemble_one(word=f"{word:016b}")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from n2t.core.assembler.facade import Assembler
+from n2t.core.source_map import (
+    SourceLocation,
+    SourceMap,
+    resolve_chain,
+    source_map_path,
+)
+from n2t.infra.jack import analyze_file
+
+
+def test_should_merge_runs_of_equal_locations() -> None:
+    source_map = SourceMap()
+
+    source_map.mark(0, SourceLocation("Main.vm", 3, "Main.main"))
+    source_map.mark(4, SourceLocation("Main.vm", 3, "Main.main"))
+    source_map.mark(7, None)
+    source_map.mark(9, SourceLocation("Main.vm", 5, "Main.main"))
+
+    assert source_map.starts == [0, 7, 9]
+    assert source_map.resolve(5) == SourceLocation("Main.vm", 3, "Main.main")
+    assert source_map.resolve(8) is None
+    assert source_map.resolve(100) == SourceLocation("Main.vm", 5, "Main.main")
+
+
+def test_should_compose_maps_across_stages() -> None:
+    rom = SourceMap()
+    rom.mark(0, SourceLocation("Prog.asm", 0, "LOOP"))
+    rom.mark(2, SourceLocation("Prog.asm", 10, "LOOP"))
+    asm = SourceMap()
+    asm.mark(0, SourceLocation("Main.vm", 1, "Main.main"))
+    asm.mark(8, SourceLocation("Main.vm", 2, "Main.main"))
+    vm = SourceMap()
+    vm.mark(0, SourceLocation("Main.jack", 4, "Main.main"))
+    vm.mark(2, SourceLocation("Main.jack", 6, "Main.main"))
+
+    composed = rom.compose({"Prog.asm": asm, "Main.vm": vm})
+
+    assert composed.resolve(1) == SourceLocation("Main.jack", 4, "Main.main")
+    assert composed.resolve(3) == SourceLocation("Main.jack", 6, "Main.main")
+    assert SourceMap.from_json(composed.to_json()) == composed
+
+
+def test_should_map_words_to_assembly_lines() -> None:
+    assembly = ["// header", "(LOOP)", "@LOOP", "", "0;JMP"]
+
+    words, source_map = Assembler().assemble_with_map(assembly, "Loop.asm")
+
+    assert list(words) == [0, 0b1110101010000111]
+    assert source_map.resolve(0) == SourceLocation("Loop.asm", 2, "LOOP")
+    assert source_map.resolve(1) == SourceLocation("Loop.asm", 4, "LOOP")
+
+
+def test_should_map_vm_lines_to_jack_lines(tmp_path: Path) -> None:
+    jack_file = tmp_path.joinpath("Main.jack")
+    jack_file.write_text(
+        "class Main {\n"
+        "    /** Returns\n"
+        "        one. */\n"
+        "    function int one() {\n"
+        "        return 1; // done\n"
+        "    }\n"
+        "}\n"
+    )
+
+    analyze_file(str(jack_file), source_map=True)
+
+    assert source_map_path(tmp_path.joinpath("Main.vm")).exists()
+    assert resolve_chain(tmp_path.joinpath("Main.vm"), 1) == [
+        SourceLocation("Main.jack", 4, "Main.one")
+    ]